@@ -1,6 +1,19 @@
 """News & Information Verification Agent - ADK Implementation."""
 
-from .agent import root_agent
+from typing import Any
 
 __version__ = "2.0.0"
-__all__ = ["root_agent"]
+__all__ = ["root_agent", "create_root_agent"]
+
+
+def __getattr__(name: str) -> Any:
+    # Build the agent graph (and import ADK) only when it is first requested.
+    if name == "root_agent":
+        from .agent import get_root_agent
+
+        return get_root_agent()
+    if name == "create_root_agent":
+        from .agent import create_root_agent
+
+        return create_root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
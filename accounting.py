@@ -0,0 +1,120 @@
+"""Per-agent accounting of model calls, tokens and latency for each claim.
+
+Every model call's usage is added to a per-agent record in session state
+(``usage:<agent name>``) by the tier callbacks in ``model_tiers``;
+``ToolWorkerAgent`` records its tool time the same way. Each agent only
+writes its own key, so parallel workers never overwrite each other. A record
+belongs to one invocation (one claim) and starts over on the next.
+
+When a lane or the router finishes, ``usage_report_callback`` aggregates the
+invocation's records per lane into ``STATE_KEYS.USAGE_REPORT``:
+
+    {"lanes": {"news": {"calls": 4, "prompt_tokens": ..., "output_tokens": ...,
+                        "model_ms": ..., "tool_ms": ..., "agents": {...}}, ...},
+     "total": {...}}
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from .config import STATE_KEYS
+from .metrics import METRICS
+
+USAGE_STATE_PREFIX = "usage:"
+
+_COUNTERS = ("calls", "prompt_tokens", "output_tokens", "model_ms", "tool_ms")
+
+# Agent name prefix -> lane; anything else is the router
+_LANE_PREFIXES = (
+    ("News", "news"),
+    ("Fact", "fact"),
+    ("Scam", "scam"),
+    ("FinalReport", "report"),
+)
+
+
+def lane_of(agent_name: str) -> str:
+    """Return the lane an agent belongs to (``news``, ``fact``, ``scam``, ``report`` or ``router``)."""
+    if agent_name.endswith("Router"):  # NewsInfoVerificationRouter is not in the news lane
+        return "router"
+    for prefix, lane in _LANE_PREFIXES:
+        if agent_name.startswith(prefix):
+            return lane
+    return "router"
+
+
+def add_usage(record: Optional[Mapping], invocation_id: str, **usage: float) -> dict:
+    """Return ``record`` with ``usage`` added, restarted if it is from another invocation."""
+    if not record or record.get("invocation_id") != invocation_id:
+        record = {"invocation_id": invocation_id, **{name: 0 for name in _COUNTERS}}
+    updated = dict(record)
+    for name, value in usage.items():
+        updated[name] = round(updated.get(name, 0) + value, 1)
+    return updated
+
+
+def record_model_call(
+    callback_context: Any,
+    model: str,
+    latency_ms: float,
+    prompt_tokens: int,
+    output_tokens: int,
+) -> None:
+    """Add one model call to the calling agent's usage record."""
+    agent = callback_context.agent_name
+    key = USAGE_STATE_PREFIX + agent
+    callback_context.state[key] = add_usage(
+        callback_context.state.get(key),
+        callback_context.invocation_id,
+        calls=1,
+        prompt_tokens=prompt_tokens,
+        output_tokens=output_tokens,
+        model_ms=latency_ms,
+    )
+    METRICS.observe("agent_model_ms", latency_ms, agent=agent, model=model)
+    METRICS.observe("agent_tokens", prompt_tokens, agent=agent, kind="prompt")
+    METRICS.observe("agent_tokens", output_tokens, agent=agent, kind="output")
+
+
+def usage_report(state: Mapping, invocation_id: str) -> dict:
+    """Aggregate the usage records of one invocation per lane.
+
+    Returns:
+        dict with ``lanes`` (lane -> totals plus ``agents``) and ``total``
+    """
+    lanes: dict = {}
+    total = {name: 0 for name in _COUNTERS}
+    for key, record in dict(state).items():
+        if not key.startswith(USAGE_STATE_PREFIX) or not isinstance(record, Mapping):
+            continue
+        if record.get("invocation_id") != invocation_id:
+            continue
+        agent = key[len(USAGE_STATE_PREFIX):]
+        lane = lanes.setdefault(
+            lane_of(agent), {**{name: 0 for name in _COUNTERS}, "agents": {}}
+        )
+        counts = {name: record.get(name, 0) for name in _COUNTERS}
+        lane["agents"][agent] = counts
+        for name, value in counts.items():
+            lane[name] = round(lane[name] + value, 1)
+            total[name] = round(total[name] + value, 1)
+    return {"lanes": lanes, "total": total}
+
+
+def usage_report_callback(callback_context: Any) -> None:
+    """``after_agent_callback`` writing the invocation's usage report to state."""
+    report = usage_report(callback_context.state.to_dict(), callback_context.invocation_id)
+    if report["lanes"]:
+        callback_context.state[STATE_KEYS.USAGE_REPORT] = report
+    return None
+
+
+__all__ = [
+    "USAGE_STATE_PREFIX",
+    "add_usage",
+    "lane_of",
+    "record_model_call",
+    "usage_report",
+    "usage_report_callback",
+]
@@ -1,17 +1,17 @@
 """Root agent orchestrating news, fact, and scam verification lanes."""
 
-from google.adk.agents import LlmAgent
+from __future__ import annotations
 
-from .config import MODEL
-from .lanes import news_lane, fact_lane, scam_lane
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
+from .config import ROUTER_ROLE
 
-# Root agent that routes to verification lanes using transfer_to_agent
-root_agent = LlmAgent(
-    name="NewsInfoVerificationRouter",
-    model=MODEL,
-    description="Intelligent router that triages content for news, fact, and scam verification.",
-    instruction="""You are an AI content verification router with access to three specialized verification agents.
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
+
+
+_ROUTER_INSTRUCTION = """You are an AI content verification router with access to three specialized verification agents.
 
 **YOUR RESOURCES:**
 You have access to these verification agents:
@@ -48,9 +48,44 @@ You have access to these verification agents:
 - ONLY make the function call
 - Transfer happens ONCE - you will not regain control
 - If ambiguous, prioritize: scam > news > fact (highest risk first)
-""",
-    sub_agents=[news_lane, fact_lane, scam_lane],
-)
+"""
+
+
+def create_root_agent() -> LlmAgent:
+    """Build the router agent together with its three verification lanes.
+
+    ADK is imported here rather than at module import so that loading the
+    package (and the tool/service modules) stays fast on cold start.
+    """
+    from google.adk.agents import LlmAgent
+
+    from .accounting import usage_report_callback
+    from .lanes import create_fact_lane, create_news_lane, create_scam_lane
+    from .model_tiers import tier_kwargs
+
+    # Root agent that routes to verification lanes using transfer_to_agent
+    return LlmAgent(
+        name="NewsInfoVerificationRouter",
+        **tier_kwargs(ROUTER_ROLE),
+        description="Intelligent router that triages content for news, fact, and scam verification.",
+        instruction=_ROUTER_INSTRUCTION,
+        sub_agents=[create_news_lane(), create_fact_lane(), create_scam_lane()],
+        after_agent_callback=usage_report_callback,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_root_agent() -> LlmAgent:
+    """Return the process-wide root agent, building it on first use."""
+    return create_root_agent()
+
+
+def __getattr__(name: str) -> Any:
+    # ``root_agent`` is resolved lazily so ADK loaders that look it up by
+    # attribute still work without paying for construction at import time.
+    if name == "root_agent":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ["root_agent"]
+__all__ = ["root_agent", "create_root_agent", "get_root_agent"]
@@ -0,0 +1,87 @@
+"""Shared helpers for the benchmark scripts."""
+
+from __future__ import annotations
+
+import importlib
+import math
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType
+from typing import Optional
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+PACKAGE_NAME = PACKAGE_DIR.name
+
+
+def import_package(submodule: str = "") -> ModuleType:
+    """Import the verification package (or one of its submodules) by path."""
+    parent = str(PACKAGE_DIR.parent)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    name = f"{PACKAGE_NAME}.{submodule}" if submodule else PACKAGE_NAME
+    return importlib.import_module(name)
+
+
+def time_calls(fn, inputs: list, min_seconds: float = 0.2) -> dict:
+    """Call ``fn`` on ``inputs`` (cycling) for at least ``min_seconds``.
+
+    Returns:
+        dict with calls, ops_per_s and us_per_op
+    """
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        for value in inputs:
+            fn(value)
+        calls += len(inputs)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            break
+    return {
+        "calls": calls,
+        "ops_per_s": round(calls / elapsed, 1),
+        "us_per_op": round(elapsed / calls * 1e6, 3),
+    }
+
+
+def scaling_exponent(points: list, param: str) -> Optional[float]:
+    """Least-squares slope of log(us_per_op) against log(``param``).
+
+    About 0 means the cost does not grow with the parameter, 1 linear, 2
+    quadratic.
+    """
+    xs = [math.log(point[param]) for point in points]
+    ys = [math.log(point["us_per_op"]) for point in points]
+    if len(xs) < 2:
+        return None
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread, 3)
+
+
+def run_metadata() -> dict:
+    """Describe where and on what code a benchmark ran."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PACKAGE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
@@ -0,0 +1,372 @@
+"""Micro-benchmarks for the local (no network) hot paths.
+
+Each case times one pure function over a synthetic corpus at several input
+sizes and reports ops/s, µs/op and the scaling exponent: the slope of
+log(µs/op) against log(size), so about 0 means flat, 1 linear and 2
+quadratic. Cases:
+
+- ``sentiment_words``: ``analyze_scam_sentiment`` against message length
+- ``sentiment_phrases``: the same against the size of ``SCAM_PHRASE_TABLES``
+  (padded with synthetic phrases)
+- ``url_extraction``: ``text.urls.extract_urls``, as used by
+  ``scan_urls_with_virustotal``, against message length
+- ``reputation_lookup``: ``ReputationIndex.lookup`` against index size
+  (the blocklist behind ``scan_urls_with_virustotal``)
+- ``gnews_query``: the query preprocessing in ``search_news`` against
+  claim length
+- ``normalize_*``: turning each service client's API response into its
+  result dicts, against the number of items in the response
+
+``--output`` writes the results with the commit, Python version and
+platform; ``--compare`` prints each point's ops/s ratio against such a file.
+
+Usage:
+    python benchmarks/hot_paths.py [--case NAME ...] [--min-time S] [--seed S] [--json]
+    python benchmarks/hot_paths.py --output before.json
+    python benchmarks/hot_paths.py --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+
+from _common import import_package, run_metadata, scaling_exponent, time_calls
+
+_WORDS = (
+    "the minister said on monday that new rules for public transport will apply from next "
+    "month according to officials reports claim thousands of people gathered in the city "
+    "centre while police confirmed the video shows an older event from another country"
+).split()
+_SCAM_PHRASES = [
+    "act now", "urgent", "verify your identity", "gift card", "tax refund", "arrest",
+    "guaranteed", "within 24 hours", "security alert", "wire transfer",
+]
+_DOMAINS = [
+    "paypal-secure-login.com", "amazon.in", "bit.ly", "example.org", "news.bbc.co.uk",
+    "sbi-kyc-update.xyz", "gov.uk", "secure-bank.top", "tinyurl.com", "reuters.com",
+]
+_PATHS = ["", "/login", "/verify/account", "/track?id=42&utm_source=sms", "/news/article-1"]
+
+MESSAGE_WORDS = (16, 64, 256, 1024, 4096)
+PHRASE_TABLE_SCALES = (1, 4, 16, 64)
+INDEX_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+CLAIM_WORDS = (8, 16, 32, 64, 128)
+RESPONSE_ITEMS = (10, 100, 1000)
+# Distinct inputs per point, so caches and branch history see some variety
+VARIANTS = 16
+
+
+def build_message(words: int, rng: random.Random, scam_rate: float = 0.05, url_rate: float = 0.0) -> str:
+    """Return a synthetic message of ``words`` words with scam phrases and URLs mixed in."""
+    out = []
+    for _ in range(words):
+        roll = rng.random()
+        if roll < scam_rate:
+            out.append(rng.choice(_SCAM_PHRASES))
+        elif roll < scam_rate + url_rate:
+            out.append(f"{rng.choice(['https://', 'http://', 'www.', ''])}{rng.choice(_DOMAINS)}"
+                       f"{rng.choice(_PATHS)}")
+        else:
+            out.append(rng.choice(_WORDS))
+    return " ".join(out).capitalize() + "."
+
+
+def build_phrase_tables(base: tuple, scale: int, rng: random.Random) -> tuple:
+    """Pad each tactic of ``base`` with synthetic phrases to ``scale`` times its size."""
+    tables = []
+    for tactic, phrases in base:
+        extra = [
+            f"{rng.choice(_WORDS)}{rng.randrange(1000)} {rng.choice(_WORDS)}"
+            for _ in range(len(phrases) * (scale - 1))
+        ]
+        tables.append((tactic, tuple(phrases) + tuple(extra)))
+    return tuple(tables)
+
+
+def build_gnews_response(items: int, rng: random.Random) -> dict:
+    return {
+        "totalArticles": items,
+        "articles": [
+            {
+                "title": build_message(12, rng, scam_rate=0),
+                "description": build_message(40, rng, scam_rate=0),
+                "content": build_message(120, rng, scam_rate=0),
+                "url": f"https://{rng.choice(_DOMAINS)}/news/{i}",
+                "image": f"https://{rng.choice(_DOMAINS)}/img/{i}.jpg",
+                "publishedAt": f"2024-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T08:00:00Z",
+                "source": {"name": rng.choice(["Reuters", "BBC", "AP"]), "url": "https://example.org"},
+            }
+            for i in range(items)
+        ],
+    }
+
+
+def build_factcheck_claims(items: int, rng: random.Random) -> list:
+    """Return fact-check API claims with ``items`` reviews in total (1-3 per claim)."""
+    claims = []
+    remaining = items
+    while remaining:
+        reviews = min(remaining, rng.randint(1, 3))
+        remaining -= reviews
+        claims.append({
+            "text": build_message(20, rng, scam_rate=0),
+            "claimant": rng.choice(["Social media", "Viral post"]),
+            "claimReview": [
+                {
+                    "publisher": {"name": rng.choice(["PolitiFact", "Snopes"]), "site": "example.org"},
+                    "url": f"https://{rng.choice(_DOMAINS)}/fact/{remaining}-{j}",
+                    "title": build_message(10, rng, scam_rate=0),
+                    "reviewDate": "2024-05-01T00:00:00Z",
+                    "textualRating": rng.choice(["False", "Misleading", "True"]),
+                    "languageCode": "en",
+                }
+                for j in range(reviews)
+            ],
+        })
+    return claims
+
+
+def build_virustotal_analysis(engines: int, rng: random.Random) -> dict:
+    categories = ["harmless", "undetected", "malicious", "suspicious", "timeout"]
+    return {
+        "data": {
+            "attributes": {
+                "status": "completed",
+                "stats": {category: rng.randrange(engines) for category in categories},
+                "results": {
+                    f"engine{i}": {"category": rng.choice(categories), "result": "clean"}
+                    for i in range(engines)
+                },
+            }
+        }
+    }
+
+
+def build_perplexity_completion(citations: int, rng: random.Random) -> dict:
+    return {
+        "model": "sonar",
+        "choices": [{"message": {"role": "assistant", "content": build_message(300, rng, scam_rate=0)}}],
+        "citations": [f"https://{rng.choice(_DOMAINS)}/ref/{i}" for i in range(citations)],
+    }
+
+
+def _curve(param: str, sizes: tuple, make_case, min_seconds: float) -> dict:
+    """Time ``fn`` over ``inputs`` for each size, where ``make_case(size) -> (fn, inputs)``."""
+    points = []
+    for size in sizes:
+        fn, inputs = make_case(size)
+        points.append({param: size, **time_calls(fn, inputs, min_seconds)})
+    return {"param": param, "points": points, "exponent": scaling_exponent(points, param)}
+
+
+def bench_sentiment_words(seed: int, min_seconds: float) -> dict:
+    scam_tools = import_package("tools.scam_tools")
+    rng = random.Random(seed)
+    return _curve(
+        "words",
+        MESSAGE_WORDS,
+        lambda words: (
+            scam_tools.analyze_scam_sentiment,
+            [build_message(words, rng) for _ in range(VARIANTS)],
+        ),
+        min_seconds,
+    )
+
+
+def bench_sentiment_phrases(seed: int, min_seconds: float) -> dict:
+    scam_tools = import_package("tools.scam_tools")
+    rng = random.Random(seed)
+    base = scam_tools.SCAM_PHRASE_TABLES
+    messages = [build_message(256, rng) for _ in range(VARIANTS)]
+    tables = {
+        sum(len(phrases) for _tactic, phrases in padded): padded
+        for padded in (build_phrase_tables(base, scale, rng) for scale in PHRASE_TABLE_SCALES)
+    }
+
+    def make_case(phrases: int):
+        scam_tools.SCAM_PHRASE_TABLES = tables[phrases]
+        return scam_tools.analyze_scam_sentiment, messages
+
+    try:
+        return _curve("phrases", tuple(tables), make_case, min_seconds)
+    finally:
+        scam_tools.SCAM_PHRASE_TABLES = base
+
+
+def bench_url_extraction(seed: int, min_seconds: float) -> dict:
+    urls = import_package("text.urls")
+    rng = random.Random(seed)
+
+    def make_case(words: int):
+        urls.canonicalize_url.cache_clear()
+        return urls.extract_urls, [build_message(words, rng, url_rate=0.05) for _ in range(VARIANTS)]
+
+    return _curve("words", MESSAGE_WORDS, make_case, min_seconds)
+
+
+def bench_reputation_lookup(seed: int, min_seconds: float) -> dict:
+    index = import_package("reputation.index")
+    rng = random.Random(seed)
+    probes = [
+        f"https://{rng.choice(['', 'www.', 'login.'])}site{rng.randrange(2 * max(INDEX_SIZES))}.com"
+        f"{rng.choice(_PATHS)}"
+        for _ in range(VARIANTS * 16)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        def make_case(entries: int):
+            builder = index.ReputationIndexBuilder()
+            for i in range(entries):
+                builder.add(f"host:site{i * 2}.com", index.BLOCK)
+            path = os.path.join(directory, f"{entries}.idx")
+            builder.write(path)
+            return index.ReputationIndex(path).lookup, probes
+
+        return _curve("entries", INDEX_SIZES, make_case, min_seconds)
+
+
+def bench_gnews_query(seed: int, min_seconds: float) -> dict:
+    gnews = import_package("services.gnews_client")
+    rng = random.Random(seed)
+    return _curve(
+        "words",
+        CLAIM_WORDS,
+        lambda words: (
+            gnews._prepare_query,
+            [build_message(words, rng, scam_rate=0) for _ in range(VARIANTS)],
+        ),
+        min_seconds,
+    )
+
+
+def bench_normalize_gnews(seed: int, min_seconds: float) -> dict:
+    gnews = import_package("services.gnews_client")
+    rng = random.Random(seed)
+    return _curve(
+        "items",
+        RESPONSE_ITEMS,
+        lambda items: (gnews._normalize, [build_gnews_response(items, rng)]),
+        min_seconds,
+    )
+
+
+def bench_normalize_factcheck(seed: int, min_seconds: float) -> dict:
+    factcheck = import_package("services.factcheck_client")
+    rng = random.Random(seed)
+    return _curve(
+        "items",
+        RESPONSE_ITEMS,
+        lambda items: (
+            lambda claims: factcheck._normalize(claims, "en"),
+            [build_factcheck_claims(items, rng)],
+        ),
+        min_seconds,
+    )
+
+
+def bench_normalize_virustotal(seed: int, min_seconds: float) -> dict:
+    virustotal = import_package("services.virustotal_client")
+    rng = random.Random(seed)
+    return _curve(
+        "items",
+        RESPONSE_ITEMS,
+        lambda items: (
+            lambda analysis: virustotal._analysis_result("https://example.org/", "u-1", analysis),
+            [build_virustotal_analysis(items, rng)],
+        ),
+        min_seconds,
+    )
+
+
+def bench_normalize_perplexity(seed: int, min_seconds: float) -> dict:
+    perplexity = import_package("services.perplexity_client")
+    rng = random.Random(seed)
+    return _curve(
+        "items",
+        RESPONSE_ITEMS,
+        lambda items: (
+            lambda completion: perplexity._completion_result(completion, "sonar"),
+            [build_perplexity_completion(items, rng)],
+        ),
+        min_seconds,
+    )
+
+
+CASES = {
+    "sentiment_words": bench_sentiment_words,
+    "sentiment_phrases": bench_sentiment_phrases,
+    "url_extraction": bench_url_extraction,
+    "reputation_lookup": bench_reputation_lookup,
+    "gnews_query": bench_gnews_query,
+    "normalize_gnews": bench_normalize_gnews,
+    "normalize_factcheck": bench_normalize_factcheck,
+    "normalize_virustotal": bench_normalize_virustotal,
+    "normalize_perplexity": bench_normalize_perplexity,
+}
+
+
+def run(cases: list, seed: int, min_seconds: float) -> dict:
+    return {
+        "meta": {**run_metadata(), "seed": seed, "min_seconds": min_seconds},
+        "cases": {name: CASES[name](seed, min_seconds) for name in cases},
+    }
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """Return ``(case, param, size, ratio)`` rows: current ops/s over the baseline's."""
+    rows = []
+    for name, case in results["cases"].items():
+        before = baseline.get("cases", {}).get(name)
+        if before is None:
+            continue
+        param = case["param"]
+        before_ops = {point[param]: point["ops_per_s"] for point in before["points"]}
+        for point in case["points"]:
+            if point[param] in before_ops:
+                rows.append((name, param, point[param], point["ops_per_s"] / before_ops[point[param]]))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="Run only these cases")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to time each point")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against results from --output")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON results")
+    args = parser.parse_args()
+
+    results = run(args.case or list(CASES), args.seed, args.min_time)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    meta = results["meta"]
+    print(f"Hot path benchmarks (commit {meta['commit'] or '?'}, Python {meta['python']})")
+    for name, case in results["cases"].items():
+        param = case["param"]
+        print(f"  {name}  (exponent {case['exponent']})")
+        for point in case["points"]:
+            print(
+                f"    {param} {point[param]:>8}  {point['ops_per_s']:>12.1f} ops/s"
+                f"  {point['us_per_op']:>11.3f} us/op"
+            )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        print(f"Compared with {args.compare} (commit {baseline['meta'].get('commit') or '?'})")
+        for name, param, size, ratio in compare(results, baseline):
+            print(f"  {name:<22} {param} {size:>8}  {ratio:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
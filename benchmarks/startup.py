@@ -0,0 +1,114 @@
+"""Cold-start benchmark: package import time and time to first request.
+
+Each sample runs in a fresh interpreter so module caches do not hide import
+cost. Phases are cumulative from interpreter start-up of the measured code:
+
+- ``import``: ``import <package>`` (should not pull in ``google.adk``)
+- ``build_agents``: first access of ``root_agent`` (lazy factories run here)
+- ``runner_ready``: ``Runner`` + session service + session created
+- ``first_event``: first event of a real verification (needs GOOGLE_API_KEY)
+
+Usage:
+    python benchmarks/startup.py [--samples N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from _common import PACKAGE_DIR, PACKAGE_NAME
+
+_PROBE = r"""
+import asyncio, json, os, sys, time
+sys.path.insert(0, {parent!r})
+t0 = time.perf_counter()
+import {package} as pkg
+timings = {{"import": time.perf_counter() - t0}}
+timings["adk_loaded_on_import"] = "google.adk" in sys.modules
+agent = pkg.root_agent
+timings["build_agents"] = time.perf_counter() - t0
+
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+async def first_request():
+    service = InMemorySessionService()
+    runner = Runner(app_name="startup_bench", agent=agent, session_service=service)
+    session = await service.create_session(app_name="startup_bench", user_id="bench")
+    timings["runner_ready"] = time.perf_counter() - t0
+    if not os.getenv("GOOGLE_API_KEY"):
+        return
+    message = types.Content(role="user", parts=[types.Part(text="Is the Earth flat?")])
+    async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        timings["first_event"] = time.perf_counter() - t0
+        break
+
+asyncio.run(first_request())
+print(json.dumps(timings))
+"""
+
+
+def run_sample() -> dict:
+    """Run one cold-start probe in a fresh interpreter."""
+    code = _PROBE.format(parent=str(PACKAGE_DIR.parent), package=PACKAGE_NAME)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=os.environ.copy(),
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list) -> dict:
+    """Reduce raw samples to per-phase median/min/max in milliseconds."""
+    summary = {}
+    for phase in ("import", "build_agents", "runner_ready", "first_event"):
+        values = [s[phase] * 1000 for s in samples if phase in s]
+        if not values:
+            summary[phase] = None
+            continue
+        summary[phase] = {
+            "median_ms": round(statistics.median(values), 2),
+            "min_ms": round(min(values), 2),
+            "max_ms": round(max(values), 2),
+        }
+    summary["adk_loaded_on_import"] = any(s["adk_loaded_on_import"] for s in samples)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON summary")
+    args = parser.parse_args()
+
+    summary = summarize([run_sample() for _ in range(args.samples)])
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"Cold-start benchmark ({args.samples} samples, cumulative times)")
+    for phase, stats in summary.items():
+        if phase == "adk_loaded_on_import":
+            continue
+        if stats is None:
+            note = "skipped (set GOOGLE_API_KEY)" if phase == "first_event" else "n/a"
+            print(f"  {phase:<14} {note}")
+        else:
+            print(
+                f"  {phase:<14} median {stats['median_ms']:>9.2f} ms"
+                f"  (min {stats['min_ms']:.2f}, max {stats['max_ms']:.2f})"
+            )
+    print(f"  google.adk imported by package import: {summary['adk_loaded_on_import']}")
+
+
+if __name__ == "__main__":
+    main()
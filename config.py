@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import os
+import tempfile
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Final
 
 # Default model for all agents
@@ -10,6 +13,9 @@ from typing import Final
 # Reverting to gemini-2.0-flash until ADK is updated
 MODEL: Final[str] = "gemini-2.0-flash"
 
+# Cheaper/faster model used for pass-through roles and load downgrades
+FAST_MODEL: Final[str] = "gemini-2.0-flash-lite"
+
 
 @dataclass(frozen=True)
 class StateKeys:
@@ -35,6 +41,402 @@ class StateKeys:
     # Final output
     FINAL_REPORT: str = "final_report"
 
+    # Per-lane model/tool usage of the last claim (see accounting)
+    USAGE_REPORT: str = "usage_report"
+
 
 # Global instance
 STATE_KEYS: Final[StateKeys] = StateKeys()
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """Model assignment for one agent role.
+
+    When ``fallback_model`` is set, calls are downgraded to it while the
+    primary model's recent p90 latency exceeds ``latency_budget_ms`` or the
+    role's token usage over the last minute exceeds ``token_budget_per_minute``.
+    """
+
+    model: str
+    fallback_model: str | None = None
+    latency_budget_ms: float | None = None
+    token_budget_per_minute: int | None = None
+
+
+@dataclass(frozen=True)
+class BreakerPolicy:
+    """Circuit breaker thresholds for one upstream API.
+
+    The breaker opens after ``failure_threshold`` consecutive failures, where a
+    call slower than ``slow_call_s`` counts as a failure. While open, calls
+    fail fast; after ``reset_timeout_s`` one probe call is let through, and the
+    wait doubles (up to ``max_reset_timeout_s``) each time a probe fails.
+    """
+
+    failure_threshold: int = 5
+    slow_call_s: float = 8.0
+    reset_timeout_s: float = 30.0
+    max_reset_timeout_s: float = 300.0
+
+
+# Upstream request quotas as (max_requests, window_seconds) pairs, enforced
+# across all worker processes by storage.quota; override with e.g.
+# QUOTA_VIRUSTOTAL="4/60,500/86400"
+UPSTREAM_QUOTAS: Final[dict[str, tuple[tuple[int, int], ...]]] = {
+    "gnews": ((100, 86400),),
+    "factcheck": ((10000, 86400),),
+    "virustotal": ((4, 60), (500, 86400)),
+    "perplexity": ((50, 60),),
+}
+
+
+# Circuit breakers per upstream (see services.circuit_breaker); override with
+# BREAKER_<UPSTREAM>_FAILURES, BREAKER_<UPSTREAM>_SLOW_S and BREAKER_<UPSTREAM>_RESET_S
+UPSTREAM_BREAKERS: Final[dict[str, BreakerPolicy]] = {
+    "gnews": BreakerPolicy(slow_call_s=6.0),
+    "factcheck": BreakerPolicy(slow_call_s=6.0),
+    "virustotal": BreakerPolicy(slow_call_s=8.0),
+    "perplexity": BreakerPolicy(failure_threshold=3, slow_call_s=25.0, reset_timeout_s=60.0),
+}
+
+
+# Concurrent agent runs per lane admitted by serving.admission (per server
+# process); override with e.g. ADMISSION_LIMIT_FACT=2
+ADMISSION_LANE_LIMITS: Final[dict[str, int]] = {
+    "scam": 8,
+    "news": 6,
+    "fact": 4,
+}
+
+
+# Agent roles used for model tiering
+ROUTER_ROLE: Final[str] = "router"
+WORKER_ROLE: Final[str] = "worker"
+MERGER_ROLE: Final[str] = "merger"
+FINAL_REPORT_ROLE: Final[str] = "final_report"
+
+# Default tiers; override per role with MODEL_<ROLE>, MODEL_<ROLE>_FALLBACK,
+# MODEL_<ROLE>_LATENCY_BUDGET_MS and MODEL_<ROLE>_TOKEN_BUDGET environment variables
+MODEL_TIERS: Final[dict[str, ModelTier]] = {
+    ROUTER_ROLE: ModelTier(model=MODEL, fallback_model=FAST_MODEL, latency_budget_ms=2500),
+    WORKER_ROLE: ModelTier(model=FAST_MODEL),
+    MERGER_ROLE: ModelTier(model=MODEL, fallback_model=FAST_MODEL, latency_budget_ms=8000),
+    FINAL_REPORT_ROLE: ModelTier(model=MODEL),
+}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Runtime settings resolved once from the environment (and ``.env``)."""
+
+    gnews_api_key: str = ""
+    factcheck_api_key: str = ""
+    virustotal_api_key: str = ""
+    perplexity_api_key: str = ""
+
+    # Session store bounds (see storage.session_store)
+    session_max_count: int = 1000
+    session_max_bytes: int = 256 * 1024 * 1024
+    session_ttl_seconds: int = 3600
+    session_spill_path: str = ""
+
+    # Directory for stores shared by all worker processes on one host
+    data_dir: str = os.path.join(tempfile.gettempdir(), "news_info_verification")
+    evidence_cache_enabled: bool = True
+
+    # Per-request latency budget (see deadline); 0 disables it
+    deadline_seconds: float = 45.0
+    merge_reserve_seconds: float = 12.0
+
+    # Perplexity request hedging (see services.perplexity_client)
+    perplexity_hedge_enabled: bool = False
+    perplexity_hedge_percentile: float = 90.0
+    perplexity_hedge_max_rate: float = 0.1
+    perplexity_hedge_model: str = ""
+    # Stream completions so a call cut short by the deadline still returns the
+    # answer so far (see services.perplexity_client)
+    perplexity_stream: bool = True
+    # One research call per input for all lanes (see services.research)
+    research_unified: bool = True
+
+    # Local URL reputation (see reputation); feeds default to <data_dir>/reputation_feeds
+    reputation_feeds_dir: str = ""
+    reputation_domain_threshold: int = 3
+    public_suffix_list: str = ""
+    # Ranked top-sites list ("rank,domain" CSV); empty uses the built-in list
+    top_sites_file: str = ""
+    top_sites_limit: int = 10000
+    # Word list (one per line) whose words are not distinctive brand labels
+    lookalike_words_file: str = ""
+
+    # Evidence pruning (see text.ranking): keep at most top_k items per source
+    evidence_top_k: int = 5
+    evidence_min_relevance: float = 0.2
+
+    # Multi-language retrieval (see text.language); pages per Fact Check language
+    claim_fallback_language: str = "en"
+    factcheck_max_pages: int = 3
+    factcheck_page_budget_s: float = 2.5
+
+    # Local fact-check mirror (see storage.claim_reviews); dumps default to
+    # <data_dir>/claim_review_dumps. The API is skipped when a relevant local
+    # review is of the same claim (min_overlap of terms both ways) and it or
+    # an API search for the claim was fetched within fresh_s
+    claim_review_dumps_dir: str = ""
+    factcheck_mirror_min_relevance: float = 0.6
+    factcheck_mirror_min_overlap: float = 0.8
+    factcheck_mirror_fresh_s: float = 7 * 86400.0
+
+    # Local news archive (see storage.news_archive): GNews is skipped when the
+    # claim's own searches ran within fresh_s and at least min_hits archived
+    # articles mention min_overlap of the claim's terms
+    news_archive_enabled: bool = True
+    news_archive_min_hits: int = 3
+    news_archive_min_overlap: float = 0.5
+    news_archive_fresh_s: float = 3600.0
+
+    # Admission control for agent runs (see serving.admission): at most
+    # max_running runs per process, up to max_queue waiting at most max_wait_s
+    admission_enabled: bool = True
+    admission_max_running: int = 12
+    admission_max_queue: int = 64
+    admission_max_wait_s: float = 20.0
+    admission_retry_after_s: int = 10
+
+    # Asynchronous verification jobs (see serving.jobs); jobs_concurrency runs
+    # per server process, a running job whose lease expired is picked up again
+    jobs_enabled: bool = True
+    jobs_concurrency: int = 2
+    jobs_poll_s: float = 1.0
+    jobs_lease_s: float = 600.0
+    jobs_max_attempts: int = 3
+
+    # Webhook delivery of finished jobs, batched per URL and retried with
+    # exponential backoff; a set secret signs each batch (HMAC-SHA256).
+    # Webhook hosts must resolve to public addresses only, unless listed in
+    # webhook_allowed_hosts (comma-separated); a set list also admits no others
+    webhook_batch_size: int = 20
+    webhook_interval_s: float = 2.0
+    webhook_timeout_s: float = 10.0
+    webhook_max_attempts: int = 8
+    webhook_backoff_s: float = 5.0
+    webhook_secret: str = ""
+    webhook_allowed_hosts: str = ""
+
+    # Claim watchlist (see services.watch): news and fact-checks re-polled
+    # every watch_interval_s for results newer than the last seen; the news
+    # merger reruns only when a new relevant article or fact-check turns up
+    watchlist_enabled: bool = True
+    watch_interval_s: float = 1800.0
+    watch_min_interval_s: float = 300.0
+    watch_max_articles: int = 30
+
+    # On-demand request profiling (see profiling): mode "sample" or "trace"
+    # for a profile_rate share of runs. Clients may ask for a profile with
+    # the X-Verify-Profile header only when profile_header names the most
+    # intrusive mode they may ask for ("sample", or "trace" for both)
+    profile_mode: str = ""
+    profile_rate: float = 1.0
+    profile_interval_ms: float = 5.0
+    profile_dir: str = ""
+    profile_header: str = ""
+
+    # Memory accounting (see memory): tracemalloc traceback depth (0 = off)
+    # and agent runs between the snapshots that are diffed
+    tracemalloc_frames: int = 0
+    tracemalloc_every: int = 1
+
+    # Startup warm-up (see serving.warmup): open warmup_connections pooled
+    # connections to each configured upstream and the model API before /ready
+    # reports ready, or after warmup_timeout_s; warmup_probe also sends a cheap
+    # authenticated request to each upstream, which counts against its quota.
+    # Each upstream keeps up to http_pool_size idle connections
+    warmup_enabled: bool = True
+    warmup_connections: int = 2
+    warmup_probe: bool = False
+    warmup_timeout_s: float = 20.0
+    http_pool_size: int = 16
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from the current process environment."""
+        return cls(
+            gnews_api_key=os.getenv("GNEWS_API_KEY", ""),
+            factcheck_api_key=os.getenv("FACTCHECK_API_KEY", ""),
+            virustotal_api_key=os.getenv("VT_API_KEY", ""),  # Match .env variable name
+            perplexity_api_key=os.getenv("PERPLEXITY_API_KEY", ""),
+            session_max_count=int(os.getenv("SESSION_MAX_COUNT", cls.session_max_count)),
+            session_max_bytes=int(os.getenv("SESSION_MAX_BYTES", cls.session_max_bytes)),
+            session_ttl_seconds=int(os.getenv("SESSION_TTL_SECONDS", cls.session_ttl_seconds)),
+            session_spill_path=os.getenv("SESSION_SPILL_PATH", ""),
+            data_dir=os.getenv("VERIFY_DATA_DIR", cls.data_dir),
+            evidence_cache_enabled=os.getenv("EVIDENCE_CACHE", "1").lower() not in ("0", "false", "no"),
+            deadline_seconds=float(os.getenv("VERIFY_DEADLINE_SECONDS", cls.deadline_seconds)),
+            merge_reserve_seconds=float(
+                os.getenv("VERIFY_MERGE_RESERVE_SECONDS", cls.merge_reserve_seconds)
+            ),
+            perplexity_hedge_enabled=os.getenv("PERPLEXITY_HEDGE", "0").lower() in ("1", "true", "yes"),
+            perplexity_hedge_percentile=float(
+                os.getenv("PERPLEXITY_HEDGE_PERCENTILE", cls.perplexity_hedge_percentile)
+            ),
+            perplexity_hedge_max_rate=float(
+                os.getenv("PERPLEXITY_HEDGE_MAX_RATE", cls.perplexity_hedge_max_rate)
+            ),
+            perplexity_hedge_model=os.getenv("PERPLEXITY_HEDGE_MODEL", ""),
+            perplexity_stream=os.getenv("PERPLEXITY_STREAM", "1").lower() not in ("0", "false", "no"),
+            research_unified=os.getenv("RESEARCH_UNIFIED", "1").lower() not in ("0", "false", "no"),
+            reputation_feeds_dir=os.getenv("REPUTATION_FEEDS_DIR", ""),
+            reputation_domain_threshold=int(
+                os.getenv("REPUTATION_DOMAIN_THRESHOLD", cls.reputation_domain_threshold)
+            ),
+            public_suffix_list=os.getenv("PUBLIC_SUFFIX_LIST", ""),
+            top_sites_file=os.getenv("TOP_SITES_FILE", ""),
+            top_sites_limit=int(os.getenv("TOP_SITES_LIMIT", cls.top_sites_limit)),
+            lookalike_words_file=os.getenv("LOOKALIKE_WORDS_FILE", ""),
+            evidence_top_k=int(os.getenv("EVIDENCE_TOP_K", cls.evidence_top_k)),
+            evidence_min_relevance=float(
+                os.getenv("EVIDENCE_MIN_RELEVANCE", cls.evidence_min_relevance)
+            ),
+            claim_fallback_language=os.getenv("CLAIM_FALLBACK_LANGUAGE", "en"),
+            factcheck_max_pages=int(os.getenv("FACTCHECK_MAX_PAGES", cls.factcheck_max_pages)),
+            factcheck_page_budget_s=float(
+                os.getenv("FACTCHECK_PAGE_BUDGET_S", cls.factcheck_page_budget_s)
+            ),
+            claim_review_dumps_dir=os.getenv("CLAIM_REVIEW_DUMPS_DIR", ""),
+            factcheck_mirror_min_relevance=float(
+                os.getenv("FACTCHECK_MIRROR_MIN_RELEVANCE", cls.factcheck_mirror_min_relevance)
+            ),
+            factcheck_mirror_min_overlap=float(
+                os.getenv("FACTCHECK_MIRROR_MIN_OVERLAP", cls.factcheck_mirror_min_overlap)
+            ),
+            factcheck_mirror_fresh_s=float(
+                os.getenv("FACTCHECK_MIRROR_FRESH_S", cls.factcheck_mirror_fresh_s)
+            ),
+            news_archive_enabled=os.getenv("NEWS_ARCHIVE", "1").lower() not in ("0", "false", "no"),
+            news_archive_min_hits=int(os.getenv("NEWS_ARCHIVE_MIN_HITS", cls.news_archive_min_hits)),
+            news_archive_min_overlap=float(
+                os.getenv("NEWS_ARCHIVE_MIN_OVERLAP", cls.news_archive_min_overlap)
+            ),
+            news_archive_fresh_s=float(os.getenv("NEWS_ARCHIVE_FRESH_S", cls.news_archive_fresh_s)),
+            admission_enabled=os.getenv("ADMISSION", "1").lower() not in ("0", "false", "no"),
+            admission_max_running=int(os.getenv("ADMISSION_MAX_RUNNING", cls.admission_max_running)),
+            admission_max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", cls.admission_max_queue)),
+            admission_max_wait_s=float(os.getenv("ADMISSION_MAX_WAIT_S", cls.admission_max_wait_s)),
+            admission_retry_after_s=int(
+                os.getenv("ADMISSION_RETRY_AFTER_S", cls.admission_retry_after_s)
+            ),
+            jobs_enabled=os.getenv("JOBS", "1").lower() not in ("0", "false", "no"),
+            jobs_concurrency=int(os.getenv("JOBS_CONCURRENCY", cls.jobs_concurrency)),
+            jobs_poll_s=float(os.getenv("JOBS_POLL_S", cls.jobs_poll_s)),
+            jobs_lease_s=float(os.getenv("JOBS_LEASE_S", cls.jobs_lease_s)),
+            jobs_max_attempts=int(os.getenv("JOBS_MAX_ATTEMPTS", cls.jobs_max_attempts)),
+            webhook_batch_size=int(os.getenv("WEBHOOK_BATCH_SIZE", cls.webhook_batch_size)),
+            webhook_interval_s=float(os.getenv("WEBHOOK_INTERVAL_S", cls.webhook_interval_s)),
+            webhook_timeout_s=float(os.getenv("WEBHOOK_TIMEOUT_S", cls.webhook_timeout_s)),
+            webhook_max_attempts=int(os.getenv("WEBHOOK_MAX_ATTEMPTS", cls.webhook_max_attempts)),
+            webhook_backoff_s=float(os.getenv("WEBHOOK_BACKOFF_S", cls.webhook_backoff_s)),
+            webhook_secret=os.getenv("WEBHOOK_SECRET", ""),
+            webhook_allowed_hosts=os.getenv("WEBHOOK_ALLOWED_HOSTS", cls.webhook_allowed_hosts),
+            watchlist_enabled=os.getenv("WATCHLIST", "1").lower() not in ("0", "false", "no"),
+            watch_interval_s=float(os.getenv("WATCH_INTERVAL_S", cls.watch_interval_s)),
+            watch_min_interval_s=float(os.getenv("WATCH_MIN_INTERVAL_S", cls.watch_min_interval_s)),
+            watch_max_articles=int(os.getenv("WATCH_MAX_ARTICLES", cls.watch_max_articles)),
+            profile_mode=os.getenv("VERIFY_PROFILE", "").lower(),
+            profile_rate=float(os.getenv("VERIFY_PROFILE_RATE", cls.profile_rate)),
+            profile_interval_ms=float(
+                os.getenv("VERIFY_PROFILE_INTERVAL_MS", cls.profile_interval_ms)
+            ),
+            profile_dir=os.getenv("VERIFY_PROFILE_DIR", ""),
+            profile_header=os.getenv("VERIFY_PROFILE_HEADER", "").lower(),
+            tracemalloc_frames=int(os.getenv("VERIFY_TRACEMALLOC", cls.tracemalloc_frames)),
+            tracemalloc_every=int(os.getenv("VERIFY_TRACEMALLOC_EVERY", cls.tracemalloc_every)),
+            warmup_enabled=os.getenv("WARMUP", "1").lower() not in ("0", "false", "no"),
+            warmup_connections=int(os.getenv("WARMUP_CONNECTIONS", cls.warmup_connections)),
+            warmup_probe=os.getenv("WARMUP_PROBE", "0").lower() not in ("0", "false", "no"),
+            warmup_timeout_s=float(os.getenv("WARMUP_TIMEOUT_S", cls.warmup_timeout_s)),
+            http_pool_size=int(os.getenv("HTTP_POOL_SIZE", cls.http_pool_size)),
+        )
+
+
+@lru_cache(maxsize=1)
+def load_environment() -> None:
+    """Load ``.env`` into the process environment exactly once."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading ``.env`` on first call."""
+    load_environment()
+    return Settings.from_env()
+
+
+def _env_float(name: str) -> float | None:
+    value = os.getenv(name, "").strip()
+    return float(value) if value else None
+
+
+@lru_cache(maxsize=None)
+def get_model_tier(role: str) -> ModelTier:
+    """Return the model tier for an agent role, applying environment overrides.
+
+    Raises:
+        KeyError: If ``role`` is not one of the configured roles
+    """
+    load_environment()
+    default = MODEL_TIERS[role]
+    prefix = f"MODEL_{role.upper()}"
+    token_budget = _env_float(f"{prefix}_TOKEN_BUDGET")
+    latency_budget = _env_float(f"{prefix}_LATENCY_BUDGET_MS")
+    return ModelTier(
+        model=os.getenv(prefix) or default.model,
+        fallback_model=os.getenv(f"{prefix}_FALLBACK") or default.fallback_model,
+        latency_budget_ms=latency_budget if latency_budget is not None else default.latency_budget_ms,
+        token_budget_per_minute=(
+            int(token_budget) if token_budget is not None else default.token_budget_per_minute
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_upstream_quota(upstream: str) -> tuple[tuple[int, int], ...]:
+    """Return the (max_requests, window_seconds) limits for an upstream API."""
+    load_environment()
+    override = os.getenv(f"QUOTA_{upstream.upper()}", "").strip()
+    if not override:
+        return UPSTREAM_QUOTAS.get(upstream, ())
+    limits = []
+    for item in override.split(","):
+        count, window = item.strip().split("/")
+        limits.append((int(count), int(window)))
+    return tuple(limits)
+
+
+@lru_cache(maxsize=None)
+def get_admission_lane_limit(lane: str) -> int:
+    """Return the concurrent-run limit for a lane, applying environment overrides."""
+    load_environment()
+    override = _env_float(f"ADMISSION_LIMIT_{lane.upper()}")
+    if override is not None:
+        return int(override)
+    return ADMISSION_LANE_LIMITS.get(lane, get_settings().admission_max_running)
+
+
+@lru_cache(maxsize=None)
+def get_breaker_policy(upstream: str) -> BreakerPolicy:
+    """Return the circuit breaker policy for an upstream API, applying environment overrides."""
+    load_environment()
+    default = UPSTREAM_BREAKERS.get(upstream, BreakerPolicy())
+    prefix = f"BREAKER_{upstream.upper()}"
+    failures = _env_float(f"{prefix}_FAILURES")
+    slow_call_s = _env_float(f"{prefix}_SLOW_S")
+    reset_timeout_s = _env_float(f"{prefix}_RESET_S")
+    return BreakerPolicy(
+        failure_threshold=int(failures) if failures is not None else default.failure_threshold,
+        slow_call_s=slow_call_s if slow_call_s is not None else default.slow_call_s,
+        reset_timeout_s=reset_timeout_s if reset_timeout_s is not None else default.reset_timeout_s,
+        max_reset_timeout_s=default.max_reset_timeout_s,
+    )
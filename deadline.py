@@ -0,0 +1,159 @@
+"""Per-request latency budget propagated from the runner into every tool call.
+
+The serving layer (and ``main.py``) opens a ``deadline_scope`` around each
+runner call. The active ``Deadline`` lives in a context variable; ADK copies
+the caller's context into the tasks and worker threads that run lanes and
+tools, so every service call can size its HTTP timeout from what is left of
+the budget with ``request_timeout()``. Part of the budget is held back for
+the lane mergers and the final report, which still have to run once the
+evidence is in.
+
+When the remaining budget is too small for a call, ``request_timeout`` raises
+``DeadlineExceededError`` and records the step as skipped; the tool returns it
+as an error result and the merger reports it. Outside a scope every call
+keeps its default timeout.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from .config import get_settings
+from .metrics import METRICS
+
+# Shortest timeout worth handing to an upstream call
+MIN_CALL_TIMEOUT_S = 1.0
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a step is skipped because the request budget is exhausted."""
+
+
+class Deadline:
+    """Latency budget for one verification request.
+
+    Args:
+        budget_s: Total seconds allowed for the request
+        reserve_s: Seconds held back for mergers and the final report
+    """
+
+    def __init__(self, budget_s: float, reserve_s: float = 0.0):
+        self.budget_s = budget_s
+        self.reserve_s = min(reserve_s, budget_s)
+        self.started = time.monotonic()
+        self.expires_at = self.started + budget_s
+        self.skipped: list[str] = []
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        """Seconds left for the whole request (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def tool_remaining(self) -> float:
+        """Seconds left for tools and upstream calls, after the reserve."""
+        return max(0.0, self.remaining() - self.reserve_s)
+
+    def timeout(self, default: float, minimum: float = MIN_CALL_TIMEOUT_S, step: str = "") -> float:
+        """Return ``default`` capped to the tool budget.
+
+        Raises:
+            DeadlineExceededError: If less than ``minimum`` seconds are left
+        """
+        available = self.tool_remaining()
+        if available < minimum:
+            raise DeadlineExceededError(self.skip(step or "upstream call"))
+        return min(default, available)
+
+    def skip(self, step: str, reason: str = "latency budget exhausted") -> str:
+        """Record a skipped step and return a human-readable note for it."""
+        note = f"Skipped {step}: {reason}"
+        with self._lock:
+            self.skipped.append(note)
+        METRICS.increment("deadline_skips", step=step)
+        return note
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("verification_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline of the request being served, if any."""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(
+    budget_s: Optional[float] = None, reserve_s: Optional[float] = None
+) -> Iterator[Optional[Deadline]]:
+    """Run the enclosed runner call under a latency budget.
+
+    Args:
+        budget_s: Budget in seconds (default ``VERIFY_DEADLINE_SECONDS``);
+            0 or less disables the deadline
+        reserve_s: Share kept for mergers/report (default ``VERIFY_MERGE_RESERVE_SECONDS``)
+
+    Yields:
+        The active ``Deadline``, or None when disabled.
+    """
+    settings = get_settings()
+    budget_s = settings.deadline_seconds if budget_s is None else budget_s
+    reserve_s = settings.merge_reserve_seconds if reserve_s is None else reserve_s
+    if budget_s <= 0:
+        yield None
+        return
+
+    deadline = Deadline(budget_s, reserve_s)
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+        METRICS.observe("request_latency_ms", deadline.elapsed() * 1000)
+        METRICS.increment(
+            "deadline_requests", outcome="met" if deadline.remaining() > 0 else "missed"
+        )
+
+
+def request_timeout(default: float, minimum: float = MIN_CALL_TIMEOUT_S, step: str = "") -> float:
+    """Timeout for an upstream call: ``default`` capped by the active deadline.
+
+    Raises:
+        DeadlineExceededError: If the active deadline leaves less than ``minimum``
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    return deadline.timeout(default, minimum=minimum, step=step)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left for tools under the active deadline, or None without one."""
+    deadline = _current.get()
+    return deadline.tool_remaining() if deadline is not None else None
+
+
+def note_skipped(step: str, reason: str = "latency budget exhausted") -> str:
+    """Record a skipped step on the active deadline and return its note."""
+    deadline = _current.get()
+    if deadline is None:
+        return f"Skipped {step}: {reason}"
+    return deadline.skip(step, reason)
+
+
+__all__ = [
+    "Deadline",
+    "DeadlineExceededError",
+    "MIN_CALL_TIMEOUT_S",
+    "current_deadline",
+    "deadline_scope",
+    "note_skipped",
+    "remaining_budget",
+    "request_timeout",
+]
@@ -1,11 +1,40 @@
-"""Verification lane agents and factories."""
+"""Verification lane agents and factories.
+
+Each ``create_*_lane()`` factory imports its lane module (and ADK) on first
+call and returns a freshly built agent tree, so importing this package is cheap.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from google.adk.agents import SequentialAgent
+
+
+def create_news_lane() -> SequentialAgent:
+    """Build a new news verification lane."""
+    from .news_lane import create_news_lane as factory
+
+    return factory()
+
+
+def create_fact_lane() -> SequentialAgent:
+    """Build a new fact verification lane."""
+    from .fact_lane import create_fact_lane as factory
+
+    return factory()
+
+
+def create_scam_lane() -> SequentialAgent:
+    """Build a new scam detection lane."""
+    from .scam_lane import create_scam_lane as factory
+
+    return factory()
 
-from .fact_lane import fact_lane
-from .news_lane import news_lane
-from .scam_lane import scam_lane
 
 __all__ = [
-    "news_lane",
-    "fact_lane",
-    "scam_lane",
+    "create_news_lane",
+    "create_fact_lane",
+    "create_scam_lane",
 ]
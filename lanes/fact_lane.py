@@ -2,16 +2,14 @@
 
 from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
 
-from ..config import MODEL, STATE_KEYS
-from ..tools import FACT_CHECK_TOOL, FACT_PERPLEXITY_TOOL
+from ..accounting import usage_report_callback
+from ..config import MERGER_ROLE, STATE_KEYS, WORKER_ROLE
+from ..model_tiers import tier_kwargs
+from ..tools import FACT_CHECK_TOOL, research_fact_with_perplexity
+from .tool_worker import ToolWorkerAgent
 
 
-# Worker 1: Primary fact-check databases
-primary_worker = LlmAgent(
-    name="FactPrimaryWorker",
-    model=MODEL,
-    description="Queries major fact-checking registries",
-    instruction="""You are a fact-check database specialist with access to the lookup_fact_checks tool.
+_PRIMARY_WORKER_INSTRUCTION = """You are a fact-check database specialist with access to the lookup_fact_checks tool.
 
 **YOUR TASK:**
 Search fact-check databases for previous verifications of the user's claim.
@@ -39,64 +37,9 @@ Common situations:
 - Network timeout → status='error'
 
 **STOP CONDITION:**
-Return the tool response and stop. The merger will interpret the results.""",
-    tools=[FACT_CHECK_TOOL],
-    output_key=STATE_KEYS.FACT_PRIMARY,
-)
-
-# Worker 2: Deep research via Perplexity
-perplexity_worker = LlmAgent(
-    name="FactPerplexityWorker",
-    model=MODEL,
-    description="Performs web research to validate factual claims",
-    instruction="""You are a web research specialist with access to the research_fact_with_perplexity tool.
+Return the tool response and stop. The merger will interpret the results."""
 
-**YOUR TASK:**
-Research the user's factual claim across the web for evidence and expert sources.
-
-**CRITICAL: YOU MUST CALL THE TOOL**
-You do NOT have internet access yourself. You MUST call the research_fact_with_perplexity tool to get real web data.
-DO NOT generate or fabricate research results. ONLY return what the tool provides.
-
-**EXECUTION:**
-1. Call research_fact_with_perplexity with the user's exact claim
-2. Wait for the tool to return results
-3. Return the exact JSON response you receive from the tool
-
-**TOOL BEHAVIOR:**
-Uses Perplexity AI to:
-- Search academic sources, expert commentary, scientific studies
-- Synthesize findings with citations
-- Assess claim validity based on evidence
-
-**EXPECTED OUTPUT:**
-The tool returns JSON with:
-- status: 'success' or 'error'
-- data: Research findings with sources and analysis
-- confidence: How strong the evidence is
-
-**ERROR HANDLING:**
-If tool returns status='error', return it exactly. Common errors:
-- API rate limit exceeded
-- Invalid claim format
-- Network connectivity issues
-
-The merger will work with whatever data is available.
-
-**STOP CONDITION:**
-Return the tool response immediately. Do not analyze or reformat the results.
-
-**REMEMBER:** You cannot research the web yourself. You MUST use the tool.""",
-    tools=[FACT_PERPLEXITY_TOOL],
-    output_key=STATE_KEYS.FACT_PERPLEXITY,
-)
-
-# Merger agent
-fact_merger = LlmAgent(
-    name="FactMerger",
-    model=MODEL,
-    description="Synthesizes fact-checking data into structured report",
-    instruction=f"""You are a fact-checking analyst. You have received results from two parallel workers and must synthesize them into a clear, authoritative report.
+_FACT_MERGER_INSTRUCTION = f"""You are a fact-checking analyst. You have received results from two parallel workers and must synthesize them into a clear, authoritative report.
 
 **YOUR DATA SOURCES:**
 The session state contains these two worker outputs:
@@ -174,6 +117,10 @@ Analyze both sources and produce a consolidated fact-check report.
 5. Don't invent evidence - only report what workers provided
 6. If fact-check says FALSE but research is ambiguous, note the conflict explicitly
 7. Claim category should reflect the domain of the claim, not the verdict
+8. An error starting with "Skipped" means that check was dropped to meet the response-time budget - list it in Analysis Notes as "Skipped: [check] (time budget)" and lower confidence accordingly
+9. Fact-check records carry a "relevance" score (0-1) against the claim and are already pruned to the most relevant ("dropped" counts the rest) - weigh high-relevance items most, and if "max_relevance" is below 0.3 treat that source as having found no on-topic coverage
+10. Fact-check results with "source": "local_mirror" come from our local copy of published fact-checks - cite them exactly like Fact Check API results
+11. Research results with "partial": true were cut short by the response-time budget - use what they contain, note "Partial: web research (time budget)" in the analysis notes, and lower confidence accordingly
 
 **ERROR HANDLING:**
 If BOTH workers returned errors:
@@ -193,23 +140,54 @@ Unable to verify due to technical issues. Please try again later.
 
 **STOP CONDITION:**
 After generating the Markdown report, stop immediately. Do not add extra commentary.
-""",
-    output_key=STATE_KEYS.FACT_SUMMARY,
-)
-
-# Parallel execution of both workers
-fact_fanout = ParallelAgent(
-    name="FactWorkerFanout",
-    description="Runs fact-checking workers concurrently",
-    sub_agents=[primary_worker, perplexity_worker],
-)
-
-# Complete fact lane: fanout then merge
-fact_lane = SequentialAgent(
-    name="FactCheckAgent",
-    description="Complete fact verification pipeline",
-    sub_agents=[fact_fanout, fact_merger],
-)
-
-
-__all__ = ["fact_lane"]
+"""
+
+
+def create_fact_lane() -> SequentialAgent:
+    """Build the fact lane: concurrent worker fanout followed by the merger."""
+    # Worker 1: Primary fact-check databases
+    primary_worker = LlmAgent(
+        name="FactPrimaryWorker",
+        **tier_kwargs(WORKER_ROLE),
+        description="Queries major fact-checking registries",
+        instruction=_PRIMARY_WORKER_INSTRUCTION,
+        tools=[FACT_CHECK_TOOL],
+        output_key=STATE_KEYS.FACT_PRIMARY,
+    )
+
+    # Worker 2: Deep research via Perplexity
+    perplexity_worker = ToolWorkerAgent(
+        name="FactPerplexityWorker",
+        description="Performs web research to validate factual claims",
+        tool=research_fact_with_perplexity,
+        output_key=STATE_KEYS.FACT_PERPLEXITY,
+    )
+
+    # Merger agent
+    fact_merger = LlmAgent(
+        name="FactMerger",
+        **tier_kwargs(MERGER_ROLE),
+        description="Synthesizes fact-checking data into structured report",
+        instruction=_FACT_MERGER_INSTRUCTION,
+        output_key=STATE_KEYS.FACT_SUMMARY,
+    )
+
+    # Parallel execution of both workers
+    fact_fanout = ParallelAgent(
+        name="FactWorkerFanout",
+        description="Runs fact-checking workers concurrently",
+        sub_agents=[primary_worker, perplexity_worker],
+    )
+
+    # Complete fact lane: fanout then merge
+    fact_lane = SequentialAgent(
+        name="FactCheckAgent",
+        description="Complete fact verification pipeline",
+        sub_agents=[fact_fanout, fact_merger],
+        after_agent_callback=usage_report_callback,
+    )
+
+    return fact_lane
+
+
+__all__ = ["create_fact_lane"]
@@ -2,50 +2,14 @@
 
 from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
 
-from ..config import MODEL, STATE_KEYS
-from ..tools import NEWS_API_TOOL, FACT_CHECK_TOOL, NEWS_PERPLEXITY_TOOL
+from ..accounting import usage_report_callback
+from ..config import MERGER_ROLE, STATE_KEYS, WORKER_ROLE
+from ..model_tiers import tier_kwargs
+from ..tools import FACT_CHECK_TOOL, fetch_news_evidence, research_news_with_perplexity
+from .tool_worker import ToolWorkerAgent
 
 
-# Worker 1: Query news APIs
-api_worker = LlmAgent(
-    name="NewsApiWorker",
-    model=MODEL,
-    description="Fetches licensed news coverage for verification",
-    instruction="""You are a news API query specialist with access to the fetch_news_evidence tool.
-
-**YOUR TASK:**
-Extract a search query from the user's claim and fetch relevant news articles.
-
-**QUERY EXTRACTION RULES:**
-- Keep it to 10-15 words maximum (API limitation)
-- Focus on: proper nouns (names, places), key events, dates
-- Remove filler words: 'a', 'the', 'said', 'told', 'that', 'has', etc.
-- Keep action words and specific details
-
-**Examples:**
-- "A woman died in cyclone that hit Andhra Pradesh" → "woman died cyclone Andhra Pradesh"
-- "The president announced new policy yesterday" → "president announced new policy"
-
-**EXECUTION:**
-1. Extract the condensed query from the user's claim
-2. Call fetch_news_evidence with the query string
-3. Return the exact JSON response you receive
-
-**ERROR HANDLING:**
-If the tool returns an error status, return that error message exactly as-is. The system will handle it.
-
-**STOP CONDITION:**
-Your job is done after returning the tool's response. Do not analyze or modify the results.""",
-    tools=[NEWS_API_TOOL],
-    output_key=STATE_KEYS.NEWS_API,
-)
-
-# Worker 2: Cross-reference with fact-check databases
-fact_worker = LlmAgent(
-    name="NewsFactWorker",
-    model=MODEL,
-    description="Checks if claim appears in fact-check registries",
-    instruction="""You are a fact-check database specialist with access to the lookup_fact_checks tool.
+_FACT_WORKER_INSTRUCTION = """You are a fact-check database specialist with access to the lookup_fact_checks tool.
 
 **YOUR TASK:**
 Check if the user's claim has been previously fact-checked by major organizations.
@@ -65,56 +29,9 @@ If the tool returns status='error', return that response exactly. Common errors:
 - No fact-checks found (this is NOT an error - it's valid data)
 
 **STOP CONDITION:**
-Your job is done after returning the tool's response. Do not interpret or summarize the results.""",
-    tools=[FACT_CHECK_TOOL],
-    output_key=STATE_KEYS.NEWS_FACT,
-)
-
-# Worker 3: Research via Perplexity
-perplexity_worker = LlmAgent(
-    name="NewsPerplexityWorker",
-    model=MODEL,
-    description="Performs web research to validate news claims",
-    instruction="""You are a web research specialist with access to the research_news_with_perplexity tool.
-
-**YOUR TASK:**
-Research the user's claim across the web to find evidence and context.
-
-**CRITICAL: YOU MUST CALL THE TOOL**
-You do NOT have internet access yourself. You MUST call the research_news_with_perplexity tool to get real web data.
-DO NOT generate or fabricate research results. ONLY return what the tool provides.
-
-**EXECUTION:**
-1. Call research_news_with_perplexity with the user's exact claim
-2. Wait for the tool to return results
-3. Return the exact JSON response you receive from the tool
-
-**TOOL BEHAVIOR:**
-The tool uses Perplexity AI to search the web and synthesize findings.
-Results include analysis, sources, and confidence assessment.
-
-**ERROR HANDLING:**
-If the tool returns status='error', return that response exactly. Common errors:
-- API rate limits
-- Network issues
-- Malformed queries
-
-The merger agent will handle error responses appropriately.
-
-**STOP CONDITION:**
-Your job is done after returning the tool's response. Do not add commentary.
-
-**REMEMBER:** You cannot research the web yourself. You MUST use the tool.""",
-    tools=[NEWS_PERPLEXITY_TOOL],
-    output_key=STATE_KEYS.NEWS_PERPLEXITY,
-)
+Your job is done after returning the tool's response. Do not interpret or summarize the results."""
 
-# Merger agent
-news_merger = LlmAgent(
-    name="NewsMerger",
-    model=MODEL,
-    description="Synthesizes news verification data into structured report",
-    instruction=f"""You are a news verification analyst. You have received results from three parallel workers and must synthesize them into a clear, structured report.
+_NEWS_MERGER_INSTRUCTION = f"""You are a news verification analyst. You have received results from three parallel workers and must synthesize them into a clear, structured report.
 
 **YOUR DATA SOURCES:**
 The session state contains these three worker outputs:
@@ -183,6 +100,11 @@ Analyze all three sources and produce a consolidated Markdown report.
 5. Include outlet names/organizations with every source
 6. Don't invent sources - only list what workers returned
 7. Coverage level based on number of distinct outlets: 3+ = widespread, 1-2 = limited, 0 = none
+8. An error starting with "Skipped" means that check was dropped to meet the response-time budget - list it in Analysis Notes as "Skipped: [check] (time budget)" and lower confidence accordingly
+9. Articles and fact-check records carry a "relevance" score (0-1) against the claim and are already pruned to the most relevant ("dropped" counts the rest) - weigh high-relevance items most, and if "max_relevance" is below 0.3 treat that source as having found no on-topic coverage
+10. News results with "source": "local_archive" are articles GNews returned for earlier requests - cite them exactly like fresh GNews articles
+11. Research results with "partial": true were cut short by the response-time budget - use what they contain, note "Partial: web research (time budget)" in the analysis notes, and lower confidence accordingly
+12. Results with "source": "watchlist" are an update of an earlier verification: "new" lists the articles and fact-checks found since then - mention them first in Key Findings, and say in Analysis Notes what changed since the previous report
 
 **ERROR HANDLING:**
 If ALL workers returned errors, output:
@@ -203,23 +125,67 @@ Unable to verify due to technical issues. Please try again later.
 
 **STOP CONDITION:**
 After generating the Markdown report, your job is complete. Do not add commentary outside the report format.
-""",
-    output_key=STATE_KEYS.NEWS_SUMMARY,
-)
-
-# Parallel execution of all workers
-news_fanout = ParallelAgent(
-    name="NewsWorkerFanout",
-    description="Runs news verification workers concurrently",
-    sub_agents=[api_worker, fact_worker, perplexity_worker],
-)
-
-# Complete news lane: fanout then merge
-news_lane = SequentialAgent(
-    name="NewsCheckAgent",
-    description="Complete news verification pipeline",
-    sub_agents=[news_fanout, news_merger],
-)
-
-
-__all__ = ["news_lane"]
+"""
+
+
+def create_news_merger() -> LlmAgent:
+    """Build the news merger; the watchlist reruns it alone on new evidence."""
+    return LlmAgent(
+        name="NewsMerger",
+        **tier_kwargs(MERGER_ROLE),
+        description="Synthesizes news verification data into structured report",
+        instruction=_NEWS_MERGER_INSTRUCTION,
+        output_key=STATE_KEYS.NEWS_SUMMARY,
+    )
+
+
+def create_news_lane() -> SequentialAgent:
+    """Build the news lane: concurrent worker fanout followed by the merger."""
+    # Worker 1: Query news APIs (query built locally, no model turn)
+    api_worker = ToolWorkerAgent(
+        name="NewsApiWorker",
+        description="Fetches licensed news coverage for verification",
+        tool=fetch_news_evidence,
+        output_key=STATE_KEYS.NEWS_API,
+    )
+
+    # Worker 2: Cross-reference with fact-check databases
+    fact_worker = LlmAgent(
+        name="NewsFactWorker",
+        **tier_kwargs(WORKER_ROLE),
+        description="Checks if claim appears in fact-check registries",
+        instruction=_FACT_WORKER_INSTRUCTION,
+        tools=[FACT_CHECK_TOOL],
+        output_key=STATE_KEYS.NEWS_FACT,
+    )
+
+    # Worker 3: Research via Perplexity
+    perplexity_worker = ToolWorkerAgent(
+        name="NewsPerplexityWorker",
+        description="Performs web research to validate news claims",
+        tool=research_news_with_perplexity,
+        output_key=STATE_KEYS.NEWS_PERPLEXITY,
+    )
+
+    # Merger agent
+    news_merger = create_news_merger()
+
+    # Parallel execution of all workers
+    news_fanout = ParallelAgent(
+        name="NewsWorkerFanout",
+        description="Runs news verification workers concurrently",
+        sub_agents=[api_worker, fact_worker, perplexity_worker],
+    )
+
+    # Complete news lane: fanout then merge
+    news_lane = SequentialAgent(
+        name="NewsCheckAgent",
+        description="Complete news verification pipeline",
+        sub_agents=[news_fanout, news_merger],
+        after_agent_callback=usage_report_callback,
+    )
+
+    return news_lane
+
+
+__all__ = ["create_news_lane", "create_news_merger"]
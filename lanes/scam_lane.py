@@ -2,16 +2,14 @@
 
 from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
 
-from ..config import MODEL, STATE_KEYS
-from ..tools import VIRUSTOTAL_TOOL, SCAM_PERPLEXITY_TOOL, SCAM_SENTIMENT_TOOL
+from ..accounting import usage_report_callback
+from ..config import MERGER_ROLE, STATE_KEYS, WORKER_ROLE
+from ..model_tiers import tier_kwargs
+from ..tools import VIRUSTOTAL_TOOL, SCAM_SENTIMENT_TOOL, research_scam_with_perplexity
+from .tool_worker import ToolWorkerAgent
 
 
-# Worker 1: URL/link security scanning
-link_worker = LlmAgent(
-    name="ScamLinkWorker",
-    model=MODEL,
-    description="Scans URLs for malicious content and phishing",
-    instruction="""You are a URL security specialist with access to the scan_urls_with_virustotal tool.
+_LINK_WORKER_INSTRUCTION = """You are a URL security specialist with access to the scan_urls_with_virustotal tool.
 
 **YOUR TASK:**
 Extract and scan all URLs from the user's input for security threats.
@@ -54,77 +52,9 @@ If tool returns status='error', return it exactly. Common errors:
 - Network issues
 
 **STOP CONDITION:**
-Return the tool response immediately. The merger will interpret threat levels.""",
-    tools=[VIRUSTOTAL_TOOL],
-    output_key=STATE_KEYS.SCAM_LINK,
-)
-
-# Worker 2: Perplexity research on scam patterns
-perplexity_worker = LlmAgent(
-    name="ScamPerplexityWorker",
-    model=MODEL,
-    description="Researches known scam patterns and reports",
-    instruction="""You are a scam research specialist with access to the research_scam_with_perplexity tool.
+Return the tool response immediately. The merger will interpret threat levels."""
 
-**YOUR TASK:**
-Research the user's input to identify known scam patterns, warnings, and similar reports.
-
-**CRITICAL: YOU MUST CALL THE TOOL**
-You do NOT have internet access yourself. You MUST call the research_scam_with_perplexity tool to get real web data.
-DO NOT generate or fabricate research results. ONLY return what the tool provides.
-
-**YOU CANNOT ANSWER FROM MEMORY**
-Even if you think you know about this scam type from your training data, you MUST use the tool to get current, real-time information from the web.
-DO NOT use your training data to generate scam patterns or analysis.
-DO NOT fabricate citations or reference URLs from memory.
-The user requires CURRENT, REAL-TIME research from scam databases and reporting sites.
-
-**EXECUTION:**
-1. Call research_scam_with_perplexity with the user's exact input
-2. Wait for the tool to return results
-3. Return the exact JSON response you receive from the tool
-4. Do NOT add your own analysis or commentary
-
-**TOOL BEHAVIOR:**
-Uses Perplexity AI to search for:
-- Similar scam reports from scam-tracking sites (ScamAlert, BBB, FTC)
-- Known fraud patterns (phishing, advance-fee, romance, tech support scams)
-- Consumer warnings and advisories
-- Typical characteristics of this scam type
-
-**SCAM TYPES IT IDENTIFIES:**
-- Phishing: Fake login pages, credential theft
-- Advance-fee: "Pay upfront to receive money later"
-- Romance: Fake relationships leading to money requests
-- Tech support: Fake virus warnings, remote access scams
-- Prize/lottery: "You've won" messages requiring payment
-- Investment: Cryptocurrency, Ponzi schemes
-
-**ERROR HANDLING:**
-If tool returns status='error', return it exactly. Common errors:
-- API rate limits
-- Network timeout
-- Malformed input
-
-**STOP CONDITION:**
-Return the tool response and stop. Do not add analysis.
-
-**BEFORE YOU RESPOND:**
-1. Did you call research_scam_with_perplexity? If NO, STOP and call it now.
-2. Did the tool return data? If NO, return the error.
-3. Are you about to add your own analysis? If YES, STOP. Return tool data only.
-
-**REMEMBER:** You cannot research the web yourself. You MUST use the tool. You do NOT have knowledge about current scams. You MUST get that from the tool.""",
-    tools=[SCAM_PERPLEXITY_TOOL],
-    output_key=STATE_KEYS.SCAM_PERPLEXITY,
-)
-
-# Worker 3: Sentiment and urgency analysis
-sentiment_worker = LlmAgent(
-    name="ScamSentimentWorker",
-    model=MODEL,
-    description="Analyzes text for scam manipulation tactics",
-    instruction="""You are a text analysis specialist with access to the analyze_scam_sentiment tool.
+_SENTIMENT_WORKER_INSTRUCTION = """You are a text analysis specialist with access to the analyze_scam_sentiment tool.
 
 **YOUR TASK:**
 Analyze the user's input text for psychological manipulation tactics commonly used in scams.
@@ -156,17 +86,9 @@ If tool returns status='error', return it exactly. This tool is local analysis s
 - Text encoding issues
 
 **STOP CONDITION:**
-Return the tool response immediately. The merger will interpret the tactics.""",
-    tools=[SCAM_SENTIMENT_TOOL],
-    output_key=STATE_KEYS.SCAM_SENTIMENT,
-)
-
-# Merger agent
-scam_merger = LlmAgent(
-    name="ScamMerger",
-    model=MODEL,
-    description="Synthesizes scam detection data into structured report",
-    instruction=f"""You are a scam detection analyst. You have received results from three parallel workers and must synthesize them into a clear, actionable security report.
+Return the tool response immediately. The merger will interpret the tactics."""
+
+_SCAM_MERGER_INSTRUCTION = f"""You are a scam detection analyst. You have received results from three parallel workers and must synthesize them into a clear, actionable security report.
 
 **YOUR DATA SOURCES:**
 The session state contains these three worker outputs:
@@ -260,6 +182,10 @@ Analyze all three sources and produce a comprehensive scam assessment report.
 5. Don't downplay threats - err on the side of caution
 6. Be specific about which manipulation tactics were detected with examples from the text
 7. Threat levels combine ALL factors - URL security + pattern matching + manipulation
+8. An error or note starting with "Skipped" (including 'pending' URL scans and "urls_skipped") means that check was dropped to meet the response-time budget - list each skipped check and URL in the report, never treat an unscanned URL as clean, and lower confidence accordingly
+9. Results with source 'local_reputation' come from our blocklists, allowlists and past VirusTotal verdicts (no vendor counts) - report the verdict and the matched entry ("host:" means the whole domain is listed)
+10. Results with source 'top_sites' and status 'low_risk' are links to the home domain of a major well-known site and were not scanned; count them as low risk. Entries in "lookalikes" are possible lookalikes of a well-known site - name the imitated site and weigh it with the VirusTotal and sentiment evidence; it does not override a clean scan on its own. A tld_swap entry is only the brand's name under an unusual suffix and is the weakest of these
+11. Research results with "partial": true were cut short by the response-time budget - use what they contain, note "Partial: web research (time budget)" in the analysis notes, and lower confidence accordingly
 
 **URL FLAGGING INTERPRETATION:**
 - 0/70 = Clean
@@ -298,23 +224,64 @@ If only URL scanner failed but text shows high manipulation:
 
 **STOP CONDITION:**
 After generating the Markdown report, stop immediately. This is your final output.
-""",
-    output_key=STATE_KEYS.SCAM_SUMMARY,
-)
-
-# Parallel execution of all workers
-scam_fanout = ParallelAgent(
-    name="ScamWorkerFanout",
-    description="Runs scam detection workers concurrently",
-    sub_agents=[link_worker, perplexity_worker, sentiment_worker],
-)
-
-# Complete scam lane: fanout then merge
-scam_lane = SequentialAgent(
-    name="ScamCheckAgent",
-    description="Complete scam detection pipeline",
-    sub_agents=[scam_fanout, scam_merger],
-)
-
-
-__all__ = ["scam_lane"]
+"""
+
+
+def create_scam_lane() -> SequentialAgent:
+    """Build the scam lane: concurrent worker fanout followed by the merger."""
+    # Worker 1: URL/link security scanning
+    link_worker = LlmAgent(
+        name="ScamLinkWorker",
+        **tier_kwargs(WORKER_ROLE),
+        description="Scans URLs for malicious content and phishing",
+        instruction=_LINK_WORKER_INSTRUCTION,
+        tools=[VIRUSTOTAL_TOOL],
+        output_key=STATE_KEYS.SCAM_LINK,
+    )
+
+    # Worker 2: Perplexity research on scam patterns
+    perplexity_worker = ToolWorkerAgent(
+        name="ScamPerplexityWorker",
+        description="Researches known scam patterns and reports",
+        tool=research_scam_with_perplexity,
+        output_key=STATE_KEYS.SCAM_PERPLEXITY,
+    )
+
+    # Worker 3: Sentiment and urgency analysis
+    sentiment_worker = LlmAgent(
+        name="ScamSentimentWorker",
+        **tier_kwargs(WORKER_ROLE),
+        description="Analyzes text for scam manipulation tactics",
+        instruction=_SENTIMENT_WORKER_INSTRUCTION,
+        tools=[SCAM_SENTIMENT_TOOL],
+        output_key=STATE_KEYS.SCAM_SENTIMENT,
+    )
+
+    # Merger agent
+    scam_merger = LlmAgent(
+        name="ScamMerger",
+        **tier_kwargs(MERGER_ROLE),
+        description="Synthesizes scam detection data into structured report",
+        instruction=_SCAM_MERGER_INSTRUCTION,
+        output_key=STATE_KEYS.SCAM_SUMMARY,
+    )
+
+    # Parallel execution of all workers
+    scam_fanout = ParallelAgent(
+        name="ScamWorkerFanout",
+        description="Runs scam detection workers concurrently",
+        sub_agents=[link_worker, perplexity_worker, sentiment_worker],
+    )
+
+    # Complete scam lane: fanout then merge
+    scam_lane = SequentialAgent(
+        name="ScamCheckAgent",
+        description="Complete scam detection pipeline",
+        sub_agents=[scam_fanout, scam_merger],
+        after_agent_callback=usage_report_callback,
+    )
+
+    return scam_lane
+
+
+__all__ = ["create_scam_lane"]
@@ -0,0 +1,86 @@
+"""Lane workers that call their tool directly, without a model turn."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import AsyncGenerator, Callable
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from ..accounting import USAGE_STATE_PREFIX, add_usage
+from ..profiling import thread_scope
+from ..progress import progress_scope
+
+# How often progress published by a running tool is forwarded as events
+PROGRESS_POLL_S = 0.25
+
+
+def _call_tool(tool: Callable[[str], dict], request: str) -> dict:
+    # Runs in the worker thread, so a profiled run samples the tool too
+    with thread_scope():
+        return tool(request)
+
+
+def _user_text(ctx: InvocationContext) -> str:
+    content = ctx.user_content
+    if content is None or not content.parts:
+        return ""
+    return "\n".join(part.text for part in content.parts if part.text)
+
+
+class ToolWorkerAgent(BaseAgent):
+    """Runs a ``request: str -> dict`` tool on the user's message.
+
+    Replaces an ``LlmAgent`` worker whose only job is to forward the claim
+    to one tool: the tool's JSON result is stored under ``output_key`` (the
+    same form the merger already reads), and the upstream call starts as
+    soon as the lane does instead of after a model round trip. The tool runs
+    in a worker thread so sibling workers in a ``ParallelAgent`` keep going.
+
+    Progress the tool publishes (see ``progress``) is forwarded while it
+    runs as partial events, which stream to SSE clients but are not stored
+    in the session. The tool's wall time is added to the worker's usage
+    record (see ``accounting``).
+    """
+
+    tool: Callable[[str], dict]
+    output_key: str
+
+    def _event(self, ctx: InvocationContext, text: str, **kwargs) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            **kwargs,
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        started = time.perf_counter()
+        with progress_scope() as channel:
+            call = asyncio.ensure_future(asyncio.to_thread(_call_tool, self.tool, _user_text(ctx)))
+        while not call.done():
+            await asyncio.wait([call], timeout=PROGRESS_POLL_S)
+            updates = channel.drain()
+            if updates and not call.done():
+                yield self._event(ctx, json.dumps(updates[-1], ensure_ascii=False), partial=True)
+        text = json.dumps(call.result(), ensure_ascii=False)
+        usage_key = USAGE_STATE_PREFIX + self.name
+        usage = add_usage(
+            ctx.session.state.get(usage_key),
+            ctx.invocation_id,
+            tool_ms=(time.perf_counter() - started) * 1000,
+        )
+        yield self._event(
+            ctx,
+            text,
+            actions=EventActions(state_delta={self.output_key: text, usage_key: usage}),
+        )
+
+
+__all__ = ["ToolWorkerAgent"]
@@ -4,14 +4,15 @@ from __future__ import annotations
 
 import os
 import uuid
-from dotenv import load_dotenv
 
 from google.genai import types
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 
-# Import the root agent
-from news_info_verification_v2 import root_agent
+from news_info_verification_v2.agent import get_root_agent
+from news_info_verification_v2.config import load_environment
+from news_info_verification_v2.deadline import deadline_scope
+from news_info_verification_v2.profiling import profile_scope
+from news_info_verification_v2.storage.session_store import create_session_service
 
 
 # Constants
@@ -23,7 +24,7 @@ def main():
     """Run the news verification agent with example queries."""
     
     # Load environment variables
-    load_dotenv()
+    load_environment()
     
     # Verify API keys are set
     required_keys = ["GOOGLE_API_KEY"]
@@ -55,7 +56,7 @@ def main():
     print("🤖 Initializing News Verification Agent v2...\n")
     
     # Create session service
-    session_service = InMemorySessionService()
+    session_service = create_session_service()
     
     # Generate a unique session ID
     session_id = str(uuid.uuid4())
@@ -64,7 +65,7 @@ def main():
     # Create runner (will auto-create session on first use)
     runner = Runner(
         app_name=APP_NAME,
-        agent=root_agent,
+        agent=get_root_agent(),
         session_service=session_service
     )
     
@@ -108,17 +109,24 @@ def main():
             parts=[types.Part(text=query)]
         )
         
-        # Run agent and collect response
+        # Run agent under the per-request latency budget and collect response
         final_response = None
-        for event in runner.run(
-            user_id=USER_ID,
-            session_id=session_id,
-            new_message=new_message
-        ):
-            if event.is_final_response():
-                if event.content and event.content.parts:
-                    final_response = event.content.parts[0].text
-                    break
+        with deadline_scope() as deadline, profile_scope(session_id, all_threads=True):
+            for event in runner.run(
+                user_id=USER_ID,
+                session_id=session_id,
+                new_message=new_message
+            ):
+                if event.is_final_response():
+                    if event.content and event.content.parts:
+                        final_response = event.content.parts[0].text
+                        break
+        
+        if deadline is not None and deadline.skipped:
+            print("⏱️  Skipped to stay within the latency budget:")
+            for note in deadline.skipped:
+                print(f"   - {note}")
+            print()
         
         if final_response:
             print("=" * 80)
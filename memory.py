@@ -0,0 +1,357 @@
+"""Memory accounting for sessions, state keys, caches and indexes.
+
+``memory_report()`` measures what a long-running server holds on to:
+
+- ``sessions``: measured bytes of every resident session of the bounded
+  session services, next to the serialized-size estimate their
+  ``SESSION_MAX_BYTES`` limit is enforced on, with the largest sessions
+  listed
+- ``state_keys``: bytes per session state key (``STATE_KEYS`` entries and
+  any other key a callback wrote), summed over resident sessions
+- ``caches``: bytes and entries of the in-process caches and indexes that
+  have been loaded (nothing is loaded just to be measured), including the
+  agent graph
+- ``tracemalloc``: with ``VERIFY_TRACEMALLOC`` set to a frame depth, the
+  allocation sites that grew the most between the last two snapshots. A
+  snapshot is taken after every ``VERIFY_TRACEMALLOC_EVERY`` agent runs.
+
+Sizes are deep ``sys.getsizeof`` sums: shared objects are counted once per
+measured item, and modules, classes and functions are not counted at all.
+
+The report is served at ``GET /admin/memory`` and printed by the CLI, for
+this process (caches only, or with ``--load``) or for a running server:
+
+Usage:
+    python -m news_info_verification_v2.memory [--load] [--sessions N]
+    python -m news_info_verification_v2.memory --url http://localhost:8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+from collections import deque
+from dataclasses import fields
+from functools import lru_cache
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Optional
+
+from .config import STATE_KEYS, get_settings
+from .metrics import METRICS
+
+# Stop walking an object graph after this many objects
+MAX_OBJECTS = 2_000_000
+
+_NOT_OWNED = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+_LEAVES = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+
+def deep_sizeof(value: Any, seen: Optional[set] = None, limit: int = MAX_OBJECTS) -> int:
+    """Return the size of ``value`` and everything it references, in bytes.
+
+    Args:
+        value: Object to measure
+        seen: IDs of objects already counted (shared between calls to count
+            common objects once)
+        limit: Maximum number of objects to visit
+    """
+    seen = set() if seen is None else seen
+    stack = [value]
+    total = 0
+    visited = 0
+    while stack and visited < limit:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _NOT_OWNED):
+            continue
+        seen.add(id(obj))
+        visited += 1
+        total += sys.getsizeof(obj, 0)
+        if isinstance(obj, _LEAVES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            attributes = getattr(obj, "__dict__", None)
+            if attributes is not None:
+                stack.append(attributes)
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+
+def _process() -> dict:
+    rss = None
+    try:
+        with open("/proc/self/statm") as handle:
+            rss = int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "rss_bytes": rss,
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        "peak_rss_bytes": peak if sys.platform == "darwin" else peak * 1024,
+        "gc_objects": len(gc.get_objects()),
+        "threads": threading.active_count(),
+    }
+
+
+def session_memory(services: list, top: int = 10) -> dict:
+    """Measure the resident sessions of ``services``.
+
+    Returns:
+        dict with ``services`` (per service: sessions, measured and estimated
+        bytes, event bytes, the ``top`` largest sessions) and ``state_keys``
+        (per key: bytes, sessions holding it, largest value)
+    """
+    known = {getattr(STATE_KEYS, field.name): field.name for field in fields(STATE_KEYS)}
+    state_keys: dict = {}
+    reports = []
+    for service in services:
+        with service._lock:
+            sessions = [
+                (app_name, user_id, session_id, session)
+                for app_name, users in service.sessions.items()
+                for user_id, by_id in users.items()
+                for session_id, session in by_id.items()
+            ]
+            estimates = {key: entry.size for key, entry in service._lru.items()}
+        measured = []
+        for app_name, user_id, session_id, session in sessions:
+            size = deep_sizeof(session)
+            events = deep_sizeof(session.events)
+            measured.append({
+                "app_name": app_name,
+                "user_id": user_id,
+                "session_id": session_id,
+                "bytes": size,
+                "estimated_bytes": estimates.get((app_name, user_id, session_id)),
+                "events": len(session.events),
+                "event_bytes": events,
+            })
+            for key, value in session.state.items():
+                size = deep_sizeof(value)
+                entry = state_keys.setdefault(
+                    key, {"state_key": known.get(key), "bytes": 0, "sessions": 0, "max_bytes": 0}
+                )
+                entry["bytes"] += size
+                entry["sessions"] += 1
+                entry["max_bytes"] = max(entry["max_bytes"], size)
+        measured.sort(key=lambda item: -item["bytes"])
+        total = sum(item["bytes"] for item in measured)
+        reports.append({
+            **service.stats(),
+            "measured_bytes": total,
+            "event_bytes": sum(item["event_bytes"] for item in measured),
+            "app_state_bytes": deep_sizeof(service.app_state),
+            "user_state_bytes": deep_sizeof(service.user_state),
+            "top": measured[:top],
+        })
+        METRICS.set_gauge("session_measured_bytes", total)
+    return {
+        "services": reports,
+        "state_keys": dict(sorted(state_keys.items(), key=lambda item: -item[1]["bytes"])),
+    }
+
+
+def _lru_cache(function) -> dict:
+    # The C lru_cache exposes its entries to the garbage collector
+    contents = [ref for ref in gc.get_referents(function) if not isinstance(ref, _NOT_OWNED)]
+    info = function.cache_info()
+    return {
+        "entries": info.currsize,
+        "max_entries": info.maxsize,
+        "bytes": deep_sizeof(contents) - sys.getsizeof(contents, 0),
+    }
+
+
+def _loaded(module: str) -> Optional[ModuleType]:
+    return sys.modules.get(f"{__package__}.{module}")
+
+
+def _cached(module: Optional[ModuleType], getter: str) -> Any:
+    """Return the value of an ``lru_cache(maxsize=1)`` getter if it was built."""
+    function = getattr(module, getter, None) if module is not None else None
+    if function is None or not function.cache_info().currsize:
+        return None
+    return function()
+
+
+def _agent_graph(root) -> dict:
+    agents = []
+    pending = [root]
+    while pending:
+        agent = pending.pop()
+        agents.append(agent)
+        pending.extend(getattr(agent, "sub_agents", None) or ())
+    return {"entries": len(agents), "bytes": deep_sizeof(root)}
+
+
+def cache_memory() -> dict:
+    """Measure the process-wide caches and indexes that have been loaded."""
+    from .text.urls import canonicalize_url
+
+    caches: dict = {"canonical_urls": _lru_cache(canonicalize_url)}
+    index_module = _loaded("reputation.index")
+    index = getattr(index_module, "_index", None)
+    if index is not None:
+        caches["reputation_index"] = {
+            "entries": len(index),
+            # File-backed and shared with the other workers through the page cache
+            "mapped_bytes": len(index._mmap) if index._mmap is not None else 0,
+            "bytes": deep_sizeof(index),
+        }
+    for name, module, getter in (
+        ("top_sites", "reputation.allowlist", "get_top_sites"),
+        ("public_suffixes", "reputation.suffix", "get_public_suffixes"),
+        ("admission", "serving.admission", "get_admission_controller"),
+    ):
+        value = _cached(_loaded(module), getter)
+        if value is not None:
+            caches[name] = {"bytes": deep_sizeof(value)}
+    breakers = getattr(_loaded("services.circuit_breaker"), "_breakers", None)
+    if breakers:
+        caches["circuit_breakers"] = {"entries": len(breakers), "bytes": deep_sizeof(breakers)}
+    caches["metrics"] = {
+        "entries": len(METRICS._samples) + len(METRICS._counters) + len(METRICS._gauges),
+        "bytes": deep_sizeof((METRICS._samples, METRICS._counters, METRICS._gauges)),
+    }
+    root = _cached(_loaded("agent"), "get_root_agent")
+    if root is not None:
+        caches["agent_graph"] = _agent_graph(root)
+    return caches
+
+
+class MemoryTracker:
+    """Diffs ``tracemalloc`` snapshots taken every ``every`` agent runs.
+
+    Args:
+        frames: Traceback depth recorded per allocation
+        every: Runs between snapshots
+        top: Allocation sites kept from each diff
+    """
+
+    def __init__(self, frames: int, every: int = 1, top: int = 25):
+        self.frames = frames
+        self.every = max(1, every)
+        self.top = top
+        self.runs = 0
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._diff: list = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def after_run(self) -> None:
+        """Count a finished run; on every ``every``-th, snapshot and diff."""
+        with self._lock:
+            self.runs += 1
+            if self.runs % self.every:
+                return
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        with self._lock:
+            previous, self._previous = self._previous, snapshot
+        if previous is None:
+            return
+        diff = [
+            {
+                "site": str(stat.traceback),
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+            }
+            for stat in snapshot.compare_to(previous, "lineno")[: self.top]
+        ]
+        with self._lock:
+            self._diff = diff
+
+    def stats(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        with self._lock:
+            return {
+                "tracing": tracemalloc.is_tracing(),
+                "runs": self.runs,
+                "every": self.every,
+                "traced_bytes": current,
+                "traced_peak_bytes": peak,
+                "growth": list(self._diff),
+            }
+
+
+@lru_cache(maxsize=1)
+def get_memory_tracker() -> Optional[MemoryTracker]:
+    """Return the process-wide tracker, or None when ``VERIFY_TRACEMALLOC`` is off."""
+    settings = get_settings()
+    if settings.tracemalloc_frames <= 0:
+        return None
+    return MemoryTracker(settings.tracemalloc_frames, settings.tracemalloc_every)
+
+
+def memory_report(session_services: Optional[list] = None, top: int = 10) -> dict:
+    """Return the full memory report (see the module docstring)."""
+    tracker = get_memory_tracker()
+    report = {"process": _process(), **session_memory(session_services or [], top)}
+    report["caches"] = cache_memory()
+    report["tracemalloc"] = tracker.stats() if tracker is not None else None
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report memory held by sessions, state and caches")
+    parser.add_argument("--url", help="Base URL of a running server (reads /admin/memory)")
+    parser.add_argument("--sessions", type=int, default=10, help="Largest sessions to list")
+    parser.add_argument(
+        "--load", action="store_true", help="Load the indexes and agent graph before measuring"
+    )
+    args = parser.parse_args()
+
+    if args.url:
+        import requests
+
+        response = requests.get(
+            f"{args.url.rstrip('/')}/admin/memory", params={"sessions": args.sessions}, timeout=60
+        )
+        response.raise_for_status()
+        report = response.json()
+    else:
+        if args.load:
+            from .agent import get_root_agent
+            from .reputation import get_reputation_index
+            from .reputation.allowlist import get_top_sites
+
+            get_root_agent()
+            get_reputation_index()
+            get_top_sites()
+        report = memory_report(top=args.sessions)
+    print(json.dumps(report, indent=2))
+
+
+__all__ = [
+    "MemoryTracker",
+    "cache_memory",
+    "deep_sizeof",
+    "get_memory_tracker",
+    "memory_report",
+    "session_memory",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Lightweight in-process metrics: counters, gauges and time-windowed samples.
+
+Kept dependency-free so tools, services and agent callbacks can record
+measurements without importing ADK. Every series is keyed by a metric name
+plus optional string labels, e.g. ``METRICS.observe("model_latency_ms", 812,
+role="worker", model="gemini-2.0-flash-lite")``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Final
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _series_name(name: str, key: LabelKey) -> str:
+    if not key:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in key) + "}"
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and rolling sample windows."""
+
+    def __init__(self, max_samples: int = 1024):
+        self._lock = threading.Lock()
+        self._max_samples = max_samples
+        self._counters: dict[tuple[str, LabelKey], float] = defaultdict(float)
+        self._gauges: dict[tuple[str, LabelKey], float] = {}
+        self._samples: dict[tuple[str, LabelKey], deque] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels) -> None:
+        """Add ``value`` to a monotonically increasing counter."""
+        with self._lock:
+            self._counters[(name, _label_key(labels))] += value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Record the current value of a gauge."""
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record one timestamped sample (latency, size, tokens, ...)."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            window = self._samples.get(key)
+            if window is None:
+                window = self._samples[key] = deque(maxlen=self._max_samples)
+            window.append((time.monotonic(), value))
+            self._counters[(name + "_count", key[1])] += 1
+
+    def samples(self, name: str, window_s: float | None = None, **labels) -> list:
+        """Return sample values, optionally restricted to the last ``window_s`` seconds."""
+        with self._lock:
+            window = self._samples.get((name, _label_key(labels)))
+            entries = list(window) if window else []
+        if window_s is not None:
+            cutoff = time.monotonic() - window_s
+            entries = [entry for entry in entries if entry[0] >= cutoff]
+        return [value for _, value in entries]
+
+    def percentile(
+        self, name: str, pct: float, window_s: float | None = None, **labels
+    ) -> float | None:
+        """Return the ``pct`` percentile of recent samples, or None without data."""
+        values = self.samples(name, window_s=window_s, **labels)
+        return _percentile(values, pct) if values else None
+
+    def total(self, name: str, window_s: float | None = None, **labels) -> float:
+        """Return the sum of recent samples."""
+        return float(sum(self.samples(name, window_s=window_s, **labels)))
+
+    def counter(self, name: str, **labels) -> float:
+        """Return the current value of a counter."""
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0.0)
+
+    def snapshot(self) -> dict:
+        """Return all series as plain JSON-serializable dicts."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            samples = {key: [v for _, v in window] for key, window in self._samples.items()}
+        return {
+            "counters": {_series_name(n, k): v for (n, k), v in counters.items()},
+            "gauges": {_series_name(n, k): v for (n, k), v in gauges.items()},
+            "samples": {
+                _series_name(n, k): {
+                    "count": len(values),
+                    "mean": round(sum(values) / len(values), 3),
+                    "p50": _percentile(values, 50),
+                    "p90": _percentile(values, 90),
+                    "p99": _percentile(values, 99),
+                }
+                for (n, k), values in samples.items()
+                if values
+            },
+        }
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._samples.clear()
+
+
+# Global instance
+METRICS: Final[MetricsRegistry] = MetricsRegistry()
+
+
+__all__ = ["MetricsRegistry", "METRICS"]
@@ -0,0 +1,227 @@
+"""Per-role model tiering with load-based downgrades and tier feedback.
+
+Every LLM agent is assigned a role (router, worker, merger, final report).
+``tier_kwargs(role)`` returns the ``model`` and model callbacks for that role:
+the before-callback picks the primary or fallback model for each call based on
+the role's budgets, and the after-callback records latency, token usage and a
+cheap quality signal per (role, model) in ``METRICS`` so tiers can be tuned
+from real traffic via ``tier_report()``. The same call is also added to the
+agent's usage record in session state (see ``accounting``).
+
+Agents of the same tier share one model instance (``get_model``), and with it
+one API client and connection pool, which the startup warm-up opens once for
+all of them (see ``serving.warmup``).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Optional
+
+from .config import (
+    FINAL_REPORT_ROLE,
+    MERGER_ROLE,
+    MODEL_TIERS,
+    ROUTER_ROLE,
+    WORKER_ROLE,
+    get_model_tier,
+)
+from .accounting import record_model_call
+from .metrics import METRICS
+
+# Rolling window used for latency percentiles and token budgets
+BUDGET_WINDOW_S = 60.0
+
+# Start times of in-flight model calls keyed by (invocation_id, agent_name)
+_call_started: dict[tuple[str, str], tuple[float, str]] = {}
+_call_lock = threading.Lock()
+
+
+def select_model(role: str) -> str:
+    """Return the model to use for the next call made by ``role``.
+
+    Falls back to the tier's ``fallback_model`` while the primary model's p90
+    latency or the role's per-minute token usage is over budget. Samples age
+    out of the window, so the primary model is retried once load subsides.
+    """
+    tier = get_model_tier(role)
+    if not tier.fallback_model:
+        return tier.model
+
+    if tier.latency_budget_ms is not None:
+        p90 = METRICS.percentile(
+            "model_latency_ms", 90, window_s=BUDGET_WINDOW_S, role=role, model=tier.model
+        )
+        if p90 is not None and p90 > tier.latency_budget_ms:
+            METRICS.increment("model_downgrades", role=role, reason="latency")
+            return tier.fallback_model
+
+    if tier.token_budget_per_minute is not None:
+        used = METRICS.total("model_tokens", window_s=BUDGET_WINDOW_S, role=role)
+        if used > tier.token_budget_per_minute:
+            METRICS.increment("model_downgrades", role=role, reason="tokens")
+            return tier.fallback_model
+
+    return tier.model
+
+
+def _response_text(llm_response: Any) -> str:
+    content = getattr(llm_response, "content", None)
+    parts = getattr(content, "parts", None) or []
+    return "".join(getattr(part, "text", None) or "" for part in parts)
+
+
+def _has_function_call(llm_response: Any, name: str | None = None) -> bool:
+    content = getattr(llm_response, "content", None)
+    for part in getattr(content, "parts", None) or []:
+        call = getattr(part, "function_call", None)
+        if call is not None and (name is None or call.name == name):
+            return True
+    return False
+
+
+def _is_json_payload(text: str) -> bool:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("{"):] if "{" in text else text
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return '"status"' in text
+
+
+def quality_ok(role: str, llm_response: Any) -> bool:
+    """Cheap per-role check that a model response did what the role needs.
+
+    - router: issued a ``transfer_to_agent`` call
+    - worker: called its tool, or relayed a JSON tool result
+    - merger / final report: produced the expected report header
+    """
+    if getattr(llm_response, "error_code", None):
+        return False
+    text = _response_text(llm_response)
+    if role == ROUTER_ROLE:
+        return _has_function_call(llm_response, "transfer_to_agent")
+    if role == WORKER_ROLE:
+        return _has_function_call(llm_response) or _is_json_payload(text)
+    if role == MERGER_ROLE:
+        return "**Verdict:**" in text
+    if role == FINAL_REPORT_ROLE:
+        return "# Verification Report" in text
+    return bool(text)
+
+
+def _usage_tokens(llm_response: Any) -> tuple[int, int]:
+    usage = getattr(llm_response, "usage_metadata", None)
+    if usage is None:
+        return 0, 0
+    return (usage.prompt_token_count or 0, usage.candidates_token_count or 0)
+
+
+def create_tier_callbacks(role: str) -> tuple:
+    """Build the (before_model, after_model) callback pair for ``role``."""
+
+    def before_model(callback_context: Any, llm_request: Any) -> Optional[Any]:
+        model = select_model(role)
+        llm_request.model = model
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        with _call_lock:
+            _call_started[key] = (time.perf_counter(), model)
+        return None
+
+    def after_model(callback_context: Any, llm_response: Any) -> Optional[Any]:
+        if getattr(llm_response, "partial", False):
+            return None
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        with _call_lock:
+            started = _call_started.pop(key, None)
+        if started is None:
+            return None
+        start, model = started
+        latency_ms = (time.perf_counter() - start) * 1000
+        prompt_tokens, output_tokens = _usage_tokens(llm_response)
+
+        METRICS.observe("model_latency_ms", latency_ms, role=role, model=model)
+        METRICS.observe("model_tokens", prompt_tokens + output_tokens, role=role)
+        record_model_call(callback_context, model, latency_ms, prompt_tokens, output_tokens)
+        METRICS.increment(
+            "model_calls",
+            role=role,
+            model=model,
+            quality="ok" if quality_ok(role, llm_response) else "poor",
+        )
+        return None
+
+    return before_model, after_model
+
+
+@lru_cache(maxsize=None)
+def get_model(name: str) -> Any:
+    """Return the process-wide model instance for ``name``, shared by agents."""
+    from google.adk.models import LLMRegistry
+
+    return LLMRegistry.new_llm(name)
+
+
+def tier_kwargs(role: str) -> dict:
+    """Return ``LlmAgent`` keyword arguments (model + callbacks) for ``role``."""
+    before_model, after_model = create_tier_callbacks(role)
+    return {
+        "model": get_model(get_model_tier(role).model),
+        "before_model_callback": before_model,
+        "after_model_callback": after_model,
+    }
+
+
+def tier_report() -> dict:
+    """Summarize measured latency and quality per role and model.
+
+    Returns:
+        dict keyed by role with the configured tier and, per model used,
+        call counts, ok rate and latency percentiles (ms).
+    """
+    report = {}
+    for role in MODEL_TIERS:
+        tier = get_model_tier(role)
+        models = {}
+        for model in filter(None, {tier.model, tier.fallback_model}):
+            ok = METRICS.counter("model_calls", role=role, model=model, quality="ok")
+            poor = METRICS.counter("model_calls", role=role, model=model, quality="poor")
+            calls = ok + poor
+            if not calls:
+                continue
+            p50 = METRICS.percentile("model_latency_ms", 50, role=role, model=model)
+            p90 = METRICS.percentile("model_latency_ms", 90, role=role, model=model)
+            models[model] = {
+                "calls": int(calls),
+                "ok_rate": round(ok / calls, 3),
+                "latency_p50_ms": round(p50, 1) if p50 is not None else None,
+                "latency_p90_ms": round(p90, 1) if p90 is not None else None,
+            }
+        report[role] = {
+            "model": tier.model,
+            "fallback_model": tier.fallback_model,
+            "latency_budget_ms": tier.latency_budget_ms,
+            "token_budget_per_minute": tier.token_budget_per_minute,
+            "downgrades": {
+                reason: int(METRICS.counter("model_downgrades", role=role, reason=reason))
+                for reason in ("latency", "tokens")
+            },
+            "models": models,
+        }
+    return report
+
+
+__all__ = [
+    "select_model",
+    "quality_ok",
+    "create_tier_callbacks",
+    "get_model",
+    "tier_kwargs",
+    "tier_report",
+]
@@ -0,0 +1,343 @@
+"""On-demand profiling of single verification requests.
+
+A run is profiled when it asks for it (the ``X-Verify-Profile`` header on
+``/run`` and ``/run_sse``, if ``VERIFY_PROFILE_HEADER`` allows the mode) or
+when ``VERIFY_PROFILE`` selects a mode for a ``VERIFY_PROFILE_RATE`` share of
+runs. The serving layer (and ``main.py``) opens a ``profile_scope`` around the
+runner call; the active profile lives in a context variable, like the request
+deadline, so it follows the run into the tasks that run lanes and the worker
+threads that call tools and upstreams (``thread_scope``: tool workers,
+``services.fanout`` and ``services.hedging``). Two modes:
+
+- ``sample``: a background thread records the stack of every thread working
+  for the run each ``VERIFY_PROFILE_INTERVAL_MS``. Event-loop samples are
+  attributed through the asyncio task running at that moment, so
+  concurrent runs do not show up in each other's profiles.
+- ``trace``: deterministic ``cProfile`` on the event-loop thread and the
+  run's fan-out threads, with sampling alongside for the flame graph.
+  Everything else the event loop runs meanwhile is traced too, so use it on
+  a quiet instance or from the CLI.
+
+When the scope ends, ``<session_id>-<time>-<mode>.pstats`` (for
+``python -m pstats`` or snakeviz) and ``.collapsed`` (``frame;frame;... count``
+lines for ``flamegraph.pl`` or speedscope) are written to
+``VERIFY_PROFILE_DIR`` (default ``<data_dir>/profiles``).
+
+With profiling off, a run pays one settings lookup; a fan-out call and, once
+a profile has run, each task creation pay a context-variable lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import logging
+import marshal
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from .config import get_settings
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sample", "trace")
+
+# (filename, first line, qualified name) for each frame, outermost first
+Stack = tuple
+
+
+class RequestProfile:
+    """Samples and tracers collected for one profiled run."""
+
+    def __init__(self, session_id: str, mode: str, interval_s: float, all_threads: bool = False):
+        self.session_id = session_id
+        self.mode = mode
+        self.interval_s = interval_s
+        self.all_threads = all_threads
+        self.started = time.time()
+        self.stacks: Counter = Counter()
+        self.seconds: Counter = Counter()
+        self._tracers: list = []
+        self._lock = threading.Lock()
+
+    def add_sample(self, stack: Stack, seconds: float) -> None:
+        """Count one sample of ``stack`` standing for ``seconds`` of wall time."""
+        with self._lock:
+            self.stacks[stack] += 1
+            self.seconds[stack] += seconds
+
+    def start_tracer(self) -> cProfile.Profile:
+        """Trace the calling thread; the tracer is merged into the pstats file."""
+        tracer = cProfile.Profile()
+        tracer.enable()
+        with self._lock:
+            self._tracers.append(tracer)
+        return tracer
+
+    def write(self, directory: str) -> dict:
+        """Write the ``.pstats`` and ``.collapsed`` files; return their paths."""
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", self.session_id)[:100]
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(self.started))
+        base = os.path.join(directory, f"{name}-{stamp}-{self.mode}")
+        with self._lock:
+            stacks = dict(self.stacks)
+            seconds = dict(self.seconds)
+            tracers = list(self._tracers)
+
+        if tracers:
+            pstats.Stats(*tracers).dump_stats(f"{base}.pstats")
+        else:
+            with open(f"{base}.pstats", "wb") as handle:
+                marshal.dump(_sampled_stats(stacks, seconds), handle)
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as handle:
+            for stack, count in sorted(stacks.items(), key=lambda item: -item[1]):
+                handle.write(";".join(_frame_label(frame) for frame in stack) + f" {count}\n")
+        METRICS.increment("profiles_written", mode=self.mode)
+        return {"pstats": f"{base}.pstats", "collapsed": f"{base}.collapsed", "samples": sum(stacks.values())}
+
+
+def _frame_label(frame: tuple) -> str:
+    filename, line, name = frame
+    short = os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))
+    return f"{name} ({short}:{line})"
+
+
+def _sampled_stats(stacks: dict, seconds_by_stack: dict) -> dict:
+    """Build ``pstats`` data from stack samples: each sample counts as one call.
+
+    ``tottime`` is the time a function was on top of the sampled stacks and
+    ``cumtime`` the time it was anywhere on them.
+    """
+    stats: dict = {}
+    for stack, count in stacks.items():
+        seconds = seconds_by_stack[stack]
+        seen = set()
+        for depth, frame in enumerate(stack):
+            leaf = depth == len(stack) - 1
+            entry = stats.setdefault(frame, [0, 0, 0.0, 0.0, {}])
+            entry[1] += count
+            if leaf:
+                entry[2] += seconds
+            if frame not in seen:
+                seen.add(frame)
+                entry[0] += count
+                entry[3] += seconds
+            if depth:
+                caller = stack[depth - 1]
+                nc, cc, tt, ct = entry[4].get(caller, (0, 0, 0.0, 0.0))
+                entry[4][caller] = (nc + count, cc + count, tt + (seconds if leaf else 0.0), ct + seconds)
+    return {frame: tuple(entry) for frame, entry in stats.items()}
+
+
+def _stack(frame) -> Stack:
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append((code.co_filename, code.co_firstlineno, code.co_qualname))
+        frame = frame.f_back
+    frames.reverse()
+    return tuple(frames)
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+_lock = threading.Lock()
+_active: list = []
+# Event loops running profiled tasks, by thread, and the profile of each task
+_loop_threads: dict = {}
+_task_profiles: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_tracked_loops: weakref.WeakSet = weakref.WeakSet()
+# Threads working for a profile (fan-out calls), and those being traced
+_thread_profiles: dict = {}
+_traced_threads: set = set()
+_sampler: Optional[threading.Thread] = None
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Return the profile of the run being served, if it is profiled."""
+    return _current.get()
+
+
+def _sample_loop() -> None:
+    global _sampler
+
+    own = threading.get_ident()
+    last = time.perf_counter()
+    while True:
+        with _lock:
+            if not _active:
+                _sampler = None
+                return
+            interval_s = _active[0].interval_s
+            everywhere = [profile for profile in _active if profile.all_threads]
+        # A sample stands for the time since the previous one, which is
+        # longer than the interval when busy threads hold the GIL
+        now = time.perf_counter()
+        elapsed, last = now - last, now
+        frames = sys._current_frames()
+        for ident, frame in frames.items():
+            if ident == own:
+                continue
+            profile = _thread_profiles.get(ident)
+            loop = _loop_threads.get(ident)
+            if profile is None and loop is not None:
+                task = asyncio.current_task(loop)
+                profile = _task_profiles.get(task) if task is not None else None
+            targets = [profile] if profile is not None else []
+            targets.extend(other for other in everywhere if other is not profile)
+            if targets:
+                stack = _stack(frame)
+                for target in targets:
+                    target.add_sample(stack, elapsed)
+        frames = frame = None  # do not keep other threads' frames alive while asleep
+        time.sleep(interval_s)
+
+
+def _track_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    """Install a task factory recording the profile of tasks created under a scope."""
+    if loop in _tracked_loops:
+        return
+    previous = loop.get_task_factory()
+
+    def factory(loop, coro, **kwargs):
+        if previous is None:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        else:
+            task = previous(loop, coro, **kwargs)
+        context = kwargs.get("context")
+        profile = context.get(_current) if context is not None else _current.get()
+        if profile is not None:
+            _task_profiles[task] = profile
+        return task
+
+    loop.set_task_factory(factory)
+    _tracked_loops.add(loop)
+
+
+def _trace_new_threads(profile: RequestProfile):
+    """Profile hook that starts a tracer in each thread it is installed in."""
+
+    def bootstrap(frame, event, arg):
+        sys.setprofile(None)
+        profile.start_tracer()
+
+    return bootstrap
+
+
+@contextmanager
+def profile_scope(
+    session_id: Optional[str] = None,
+    mode: Optional[str] = None,
+    all_threads: bool = False,
+) -> Iterator[Optional[RequestProfile]]:
+    """Profile the enclosed runner call and write its files when it ends.
+
+    Args:
+        session_id: Names the output files (default: a random ID)
+        mode: ``sample``, ``trace`` or ``off`` (default: ``VERIFY_PROFILE``
+            for a ``VERIFY_PROFILE_RATE`` share of calls)
+        all_threads: Attribute every thread's samples to this run and trace
+            threads it starts; for processes serving one run (the CLI)
+
+    Yields:
+        The active ``RequestProfile``, or None when not profiling.
+    """
+    global _sampler
+
+    settings = get_settings()
+    if mode is None:
+        mode = settings.profile_mode if random.random() < settings.profile_rate else "off"
+    if mode not in PROFILE_MODES or _current.get() is not None:
+        yield _current.get()
+        return
+
+    ident = threading.get_ident()
+    with _lock:
+        if mode == "trace" and ident in _traced_threads:
+            mode = "sample"  # one tracer per thread: the running trace keeps it
+        if mode == "trace":
+            _traced_threads.add(ident)
+    profile = RequestProfile(
+        session_id or uuid.uuid4().hex, mode, settings.profile_interval_ms / 1000, all_threads
+    )
+    token = _current.set(profile)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is not None:
+        _track_tasks(loop)
+        _task_profiles[asyncio.current_task(loop)] = profile
+    with _lock:
+        _active.append(profile)
+        if loop is not None:
+            _loop_threads[ident] = loop
+        if _sampler is None:
+            _sampler = threading.Thread(target=_sample_loop, name="request-profiler", daemon=True)
+            _sampler.start()
+    tracer = profile.start_tracer() if mode == "trace" else None
+    if tracer is not None and all_threads:
+        threading.setprofile(_trace_new_threads(profile))
+    try:
+        yield profile
+    finally:
+        if tracer is not None:
+            tracer.disable()
+            if all_threads:
+                threading.setprofile(None)
+        _current.reset(token)
+        with _lock:
+            _active.remove(profile)
+            _traced_threads.discard(ident)
+            if not _active:
+                _loop_threads.clear()
+        try:
+            paths = profile.write(settings.profile_dir or os.path.join(settings.data_dir, "profiles"))
+            logger.info("Profile of session %s: %s", profile.session_id, paths)
+        except OSError:
+            logger.exception("Could not write the profile of session %s", profile.session_id)
+
+
+@contextmanager
+def thread_scope() -> Iterator[None]:
+    """Attribute the calling worker thread to the current run's profile.
+
+    Entered by tool workers, ``services.fanout`` and ``services.hedging`` in
+    their threads, inside the copied context of the run. Nested scopes in
+    one thread are no-ops.
+    """
+    profile = _current.get()
+    ident = threading.get_ident()
+    if profile is None or _thread_profiles.get(ident) is profile:
+        yield
+        return
+    _thread_profiles[ident] = profile
+    tracer = profile.start_tracer() if profile.mode == "trace" else None
+    try:
+        yield
+    finally:
+        if tracer is not None:
+            tracer.disable()
+        _thread_profiles.pop(ident, None)
+
+
+__all__ = [
+    "PROFILE_MODES",
+    "RequestProfile",
+    "current_profile",
+    "profile_scope",
+    "thread_scope",
+]
@@ -0,0 +1,64 @@
+"""Progress updates from long-running tool calls.
+
+A lane worker that runs a tool opens a ``progress_scope`` around the call.
+The channel lives in a context variable, so it follows the call into worker
+threads the same way the request deadline does. Services deep inside the
+call (e.g. the streaming Perplexity client) publish updates with
+``report_progress``; the worker drains them while the tool is still running
+and forwards them as partial events. Outside a scope ``report_progress`` is
+a no-op.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class ProgressChannel:
+    """Thread-safe buffer of progress updates for one tool call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._updates: list[dict] = []
+
+    def publish(self, update: dict) -> None:
+        with self._lock:
+            self._updates.append(update)
+
+    def drain(self) -> list[dict]:
+        """Return and clear the updates published since the last drain."""
+        with self._lock:
+            updates, self._updates = self._updates, []
+        return updates
+
+
+_current: ContextVar[Optional[ProgressChannel]] = ContextVar("progress_channel", default=None)
+
+
+@contextmanager
+def progress_scope() -> Iterator[ProgressChannel]:
+    """Collect progress published by calls started inside the scope.
+
+    Tasks and threads started in the scope keep the channel after it exits,
+    so the scope only needs to cover starting the call.
+    """
+    channel = ProgressChannel()
+    token = _current.set(channel)
+    try:
+        yield channel
+    finally:
+        _current.reset(token)
+
+
+def report_progress(step: str, **data) -> None:
+    """Publish a progress update for ``step`` to the active channel, if any."""
+    channel = _current.get()
+    if channel is not None:
+        channel.publish({"step": step, "at": time.time(), **data})
+
+
+__all__ = ["ProgressChannel", "progress_scope", "report_progress"]
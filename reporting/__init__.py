@@ -1,5 +1,5 @@
 """Reporting module initialization."""
 
-from .final_report import final_report_agent
+from .final_report import create_final_report_agent, get_final_report_agent, parse_verdict
 
-__all__ = ["final_report_agent"]
+__all__ = ["create_final_report_agent", "get_final_report_agent", "parse_verdict"]
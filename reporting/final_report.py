@@ -1,16 +1,18 @@
 """Final report generation agent - synthesizes all verification results."""
 
-from google.adk.agents import LlmAgent
+from __future__ import annotations
 
-from ..config import MODEL, STATE_KEYS
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
+from ..config import FINAL_REPORT_ROLE, STATE_KEYS
 
-# Final report agent
-final_report_agent = LlmAgent(
-    name="FinalReportAgent",
-    model=MODEL,
-    description="Synthesizes all verification results into comprehensive report",
-    instruction="""You are generating the final verification report.
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
+
+
+_FINAL_REPORT_INSTRUCTION = """You are generating the final verification report.
 
 Review the session context for available verification results from these lanes:
 - News verification (news_summary)
@@ -82,9 +84,76 @@ This report was generated using lanes that were executed:
 6. Cross-reference findings (e.g., if news says false and fact-check agrees)
 7. Provide actionable recommendations based on risk level
 8. Only include sections for lanes that actually ran - don't reference missing data
-""",
-    output_key=STATE_KEYS.FINAL_REPORT,
-)
-
-
-__all__ = ["final_report_agent"]
+9. If a lane lists checks skipped for the time budget, list them under "For Further Investigation" as skipped checks so the reader knows the verdict is based on partial evidence
+"""
+
+# Summary lines parsed into the structured verdict: the final report's
+# Executive Summary labels first, then the lane mergers' labels (jobs store
+# whichever report the run ended with)
+_VERDICT_FIELDS = {
+    "assessment": ("Overall Assessment", "Verdict"),
+    "confidence": ("Confidence Level", "Confidence"),
+    "risk": ("Risk Level",),
+}
+_VERDICT_RES = {
+    key: re.compile(
+        rf"^\W*(?:{'|'.join(labels)})\W*:?\**\s*\[?([A-Za-z][\w ]*\w|\d+(?:\.\d+)?)",
+        re.IGNORECASE | re.MULTILINE,
+    )
+    for key, labels in _VERDICT_FIELDS.items()
+}
+
+
+def parse_verdict(report: str) -> dict:
+    """Return ``{assessment, confidence, risk}`` from a final or lane report.
+
+    Reads the final report's Executive Summary (``Overall Assessment``,
+    ``Confidence Level``, ``Risk Level``) or a lane merger's header
+    (``Verdict``, ``Confidence``, ``Risk Level``). Values are upper-cased
+    (``"SCAM DETECTED"``, ``"PARTLY_TRUE"``) and a numeric confidence is a
+    float; fields the report does not state are None.
+    """
+    verdict = {}
+    for key, pattern in _VERDICT_RES.items():
+        match = pattern.search(report or "")
+        value = match.group(1) if match else None
+        if value is not None and value[0].isdigit():
+            verdict[key] = float(value)
+        else:
+            verdict[key] = value.upper() if value else None
+    return verdict
+
+
+def create_final_report_agent() -> LlmAgent:
+    """Build the agent that synthesizes all lane summaries into one report."""
+    from google.adk.agents import LlmAgent
+
+    from ..model_tiers import tier_kwargs
+
+    return LlmAgent(
+        name="FinalReportAgent",
+        **tier_kwargs(FINAL_REPORT_ROLE),
+        description="Synthesizes all verification results into comprehensive report",
+        instruction=_FINAL_REPORT_INSTRUCTION,
+        output_key=STATE_KEYS.FINAL_REPORT,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_final_report_agent() -> LlmAgent:
+    """Return the process-wide final report agent, building it on first use."""
+    return create_final_report_agent()
+
+
+def __getattr__(name: str) -> Any:
+    if name == "final_report_agent":
+        return get_final_report_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "final_report_agent",
+    "create_final_report_agent",
+    "get_final_report_agent",
+    "parse_verdict",
+]
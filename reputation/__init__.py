@@ -0,0 +1,18 @@
+"""Local URL/domain reputation: blocklist feeds, past VirusTotal verdicts, top sites."""
+
+from .allowlist import LookalikeMatch, TopSiteMatch, get_top_sites
+from .index import ReputationHit, ReputationIndex, build_index, get_reputation_index
+from .suffix import registered_domain
+from .verdicts import get_verdict_log
+
+__all__ = [
+    "LookalikeMatch",
+    "ReputationHit",
+    "ReputationIndex",
+    "TopSiteMatch",
+    "build_index",
+    "get_reputation_index",
+    "get_top_sites",
+    "get_verdict_log",
+    "registered_domain",
+]
@@ -0,0 +1,51 @@
+"""Build or query the reputation index: ``python -m news_info_verification_v2.reputation``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from .index import ReputationIndex, build_index, default_feeds_dir, default_index_path
+from .verdicts import get_verdict_log
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the local URL reputation index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Rebuild the index from feeds and VT verdicts")
+    build.add_argument("--feeds", default=None, help=f"Feed directory (default {default_feeds_dir()})")
+    build.add_argument("--output", default=None, help=f"Index file (default {default_index_path()})")
+    build.add_argument("--no-verdicts", action="store_true", help="Ignore past VirusTotal verdicts")
+
+    lookup = commands.add_parser("lookup", help="Look up URLs or domains")
+    lookup.add_argument("urls", nargs="+")
+    lookup.add_argument("--index", default=None)
+
+    stats = commands.add_parser("stats", help="Show index and verdict log sizes")
+    stats.add_argument("--index", default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        summary = build_index(args.output, args.feeds, include_verdicts=not args.no_verdicts)
+        print(json.dumps(summary, indent=2))
+    elif args.command == "lookup":
+        index = ReputationIndex(args.index or default_index_path())
+        for url in args.urls:
+            hit = index.lookup(url)
+            print(f"{url}\t{hit.verdict + ' (' + hit.matched + ')' if hit else 'unknown'}")
+    else:
+        path = args.index or default_index_path()
+        log = get_verdict_log()
+        print(json.dumps({
+            "index": path,
+            "keys": len(ReputationIndex(path)),
+            "verdicts": log.count(),
+            "malicious": log.count("malicious"),
+            "suspicious": log.count("suspicious"),
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
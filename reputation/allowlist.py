@@ -0,0 +1,328 @@
+"""Ranked top-sites allowlist with lookalike detection.
+
+Links to major, well-known sites (news outlets, government portals, large
+platforms) are overwhelmingly benign, so the scam lane answers them locally
+instead of spending a VirusTotal submission and its polling on them. A host
+matches when it is a top site's registered domain or its ``www.`` host,
+looked up in a sorted tuple of top sites (binary search, with a parallel
+rank array): ``www.bbc.co.uk`` matches ``bbc.co.uk``. Other subdomains
+(``forms.office.com``, ``sites.google.com``) can serve anyone's content and
+do not match, nor do shared-content and redirect paths on a matching host
+(``dropbox.com/s/...``, ``google.com/url?...``, any ``medium.com`` post).
+
+Anything that is *almost* a top site is the opposite signal. Domains that do
+not match exactly are checked for:
+
+- ``homoglyph``: same skeleton after confusable folding (``paypa1.com``,
+  ``xn--pypal-4ve.com``, ``rnicrosoft.com``)
+- ``typo``: one letter dropped, added or swapped with its neighbour in a
+  top-site label of six or more letters (``amazn.in``, ``gooogle.com``,
+  ``googel.com``); found with a precomputed deletion index instead of
+  pairwise comparisons. One-letter substitutions are left to the homoglyph
+  check: most of them are ordinary words (``cooking.com``, ``tomato.com``)
+- ``combo``: a distinctive top-site label used as a token
+  (``paypal-secure-login.com``, ``paypal.com.verify-account.xyz``)
+- ``tld_swap``: a top-site label under a suffix its owner is unlikely to
+  hold (``paypal.co``, ``paypal.xyz``). The ``com``/``org``/``net`` and
+  country-code variants (``google.co.uk``, ``ndtv.in``, ``apple.org``) are
+  usually the brand's own and are not flagged
+
+Top-site labels that are ordinary words (``live``, ``office``, ``zoom``,
+``booking``) are not distinctive: they are never typo or combo targets, and
+a label that is itself a word is never a typo. The words are a built-in list
+plus, with ``LOOKALIKE_WORDS_FILE`` set, a word list such as
+``/usr/share/dict/words`` (lower-case entries only, so brand names listed as
+proper nouns stay distinctive).
+
+Lookalikes are still scanned; the match is reported alongside the results.
+
+Set ``TOP_SITES_FILE`` to a ranked list (``rank,domain`` CSV such as Tranco,
+or one domain per line) to replace the built-in list; ``TOP_SITES_LIMIT``
+caps how many entries are loaded.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional
+
+from ..config import get_settings
+from .suffix import get_public_suffixes
+
+# Rank order, most popular first. URL shorteners and shared user-content
+# platforms are deliberately absent: their links can point anywhere.
+_BUILTIN_TOP_SITES = """
+google.com youtube.com facebook.com wikipedia.org instagram.com whatsapp.com
+amazon.com x.com twitter.com linkedin.com microsoft.com apple.com yahoo.com
+reddit.com netflix.com bing.com office.com live.com outlook.com zoom.us
+google.co.in amazon.in flipkart.com paytm.com phonepe.com hdfcbank.com
+icicibank.com onlinesbi.sbi sbi.co.in axisbank.com kotak.com npci.org.in
+irctc.co.in gov.in india.gov.in uidai.gov.in incometax.gov.in mygov.in
+rbi.org.in sebi.gov.in digilocker.gov.in pib.gov.in nic.in epfindia.gov.in
+indiapost.gov.in passportindia.gov.in
+bbc.com bbc.co.uk cnn.com nytimes.com theguardian.com reuters.com apnews.com
+washingtonpost.com bloomberg.com aljazeera.com ndtv.com thehindu.com
+indianexpress.com hindustantimes.com timesofindia.indiatimes.com indiatimes.com
+news18.com indiatoday.in livemint.com economictimes.com aajtak.in
+thewire.in scroll.in theprint.in altnews.in boomlive.in factcheck.org
+snopes.com politifact.com fullfact.org afp.com
+paypal.com ebay.com walmart.com aliexpress.com alibaba.com myntra.com
+swiggy.com zomato.com ola.com uber.com booking.com airbnb.com
+github.com stackoverflow.com gitlab.com mozilla.org python.org
+adobe.com dropbox.com salesforce.com cloudflare.com openai.com
+telegram.org discord.com tiktok.com pinterest.com quora.com medium.com
+spotify.com twitch.tv imdb.com espn.com cricbuzz.com espncricinfo.com
+who.int un.org worldbank.org imf.org usa.gov gov.uk cdc.gov nih.gov
+irs.gov ssa.gov europa.eu canada.ca gov.au
+visa.com mastercard.com americanexpress.com chase.com bankofamerica.com
+wellsfargo.com citi.com hsbc.com barclays.co.uk
+dhl.com fedex.com ups.com usps.com bluedart.com delhivery.com
+samsung.com whatsapp.net fb.com messenger.com icloud.com
+"""
+
+# Path prefixes on top-site domains that serve user-created content or
+# redirect anywhere; never fast-pathed ("/" covers the whole site)
+_USER_CONTENT_PATHS = {
+    "google.com": ("/url", "/amp/"),
+    "google.co.in": ("/url", "/amp/"),
+    "youtube.com": ("/redirect", "/attribution_link"),
+    "facebook.com": ("/l.php",),
+    "linkedin.com": ("/redir", "/slink"),
+    "bing.com": ("/ck/",),
+    "dropbox.com": ("/s/", "/scl/", "/sh/", "/t/"),
+    "github.com": ("/user-attachments/",),
+    "medium.com": ("/",),
+}
+
+# Ordinary words among the top-site labels and common host tokens; with
+# LOOKALIKE_WORDS_FILE set, its words are added
+_BUILTIN_WORDS = frozenset("""
+live office outlook zoom bing apple booking chase visa medium twitch discord
+telegram python scroll messenger canada adobe uber mint wire print times
+express news mail bank shop store online secure login account cloud home
+world india today support service help update verify free offer
+""".split())
+
+# Labels shorter than this are too collision-prone for typo/combo matching
+MIN_TYPO_LABEL = 6
+MIN_BRAND_LABEL = 4
+
+# Suffixes brands commonly hold alongside their main domain: the legacy
+# generic TLDs, and any country code (directly or at the second level).
+# Cheap ccTLDs favoured by squatters and the one-letter typos of "com"
+# are the exception.
+_BRAND_GENERIC_TLDS = frozenset({"com", "org", "net"})
+_SQUATTED_TLDS = frozenset({"co", "cm", "om", "tk", "ml", "ga", "cf", "gq"})
+
+# Cyrillic/Greek letters that render like Latin ones, plus digit swaps
+_CONFUSABLES = str.maketrans({
+    # Cyrillic a e o p c y x i j s d
+    "\u0430": "a", "\u0435": "e", "\u043e": "o", "\u0440": "p", "\u0441": "c", "\u0443": "y",
+    "\u0445": "x", "\u0456": "i", "\u0458": "j", "\u0455": "s", "\u0501": "d",
+    # Latin script g, dotless i; Armenian n; Greek o a v p
+    "\u0261": "g", "\u0131": "i", "\u057c": "n", "\u03bf": "o", "\u03b1": "a", "\u03bd": "v",
+    "\u03c1": "p",
+    "0": "o", "1": "l", "i": "l", "|": "l", "3": "e", "4": "a", "5": "s", "7": "t",
+    "8": "b", "@": "a", "$": "s",
+})
+
+
+class TopSiteMatch(NamedTuple):
+    """A host on an allowlisted registered domain."""
+
+    domain: str
+    rank: int
+
+
+class LookalikeMatch(NamedTuple):
+    """A domain imitating a top site."""
+
+    domain: str
+    target: str
+    kind: str
+
+
+def _skeleton(label: str) -> str:
+    """Fold a label to the form a reader would see (confusables, ``rn``/``vv``)."""
+    if label.startswith("xn--"):
+        try:
+            label = label.encode("ascii").decode("idna")
+        except UnicodeError:
+            return label
+    decomposed = unicodedata.normalize("NFKD", label)
+    label = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return label.lower().translate(_CONFUSABLES).replace("rn", "m").replace("vv", "w")
+
+
+def _deletes(label: str) -> set:
+    return {label[:i] + label[i + 1:] for i in range(len(label))}
+
+
+def _transposes(label: str) -> set:
+    swapped = {label[:i] + label[i + 1] + label[i] + label[i + 2:] for i in range(len(label) - 1)}
+    return swapped - {label}
+
+
+class TopSites:
+    """Sorted top-sites table with lookalike indexes."""
+
+    def __init__(self, ranked_domains: Iterable[str], words: Iterable[str] = ()):
+        self._words = _BUILTIN_WORDS | frozenset(words)
+        ranks: dict = {}
+        for domain in ranked_domains:
+            domain = domain.strip().lower().rstrip(".")
+            if domain and domain not in ranks:
+                ranks[domain] = len(ranks) + 1
+        self._domains = tuple(sorted(ranks))
+        self._ranks = array("I", (ranks[domain] for domain in self._domains))
+
+        # Lookalike indexes, keyed by the label left of the public suffix and
+        # filled in rank order so collisions keep the more popular site
+        self._labels: dict = {}
+        self._skeletons: dict = {}
+        # Distinctive labels (not words) that typo and combo matches may target
+        self._brands: dict = {}
+        self._typo_index: dict = {}
+        for domain in sorted(ranks, key=ranks.get):
+            label = self._label(domain)
+            if not label:
+                continue
+            self._labels.setdefault(label, domain)
+            self._skeletons.setdefault(_skeleton(label), domain)
+            if label in self._words or len(label) < MIN_BRAND_LABEL:
+                continue
+            self._brands.setdefault(label, domain)
+            if len(label) >= MIN_TYPO_LABEL:
+                for variant in _deletes(label):
+                    self._typo_index.setdefault(variant, domain)
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+    def __contains__(self, domain: str) -> bool:
+        return self.rank(domain) is not None
+
+    @staticmethod
+    def _label(domain: str) -> str:
+        suffix = get_public_suffixes().public_suffix(domain)
+        if len(domain) <= len(suffix):
+            return ""
+        return domain[: -len(suffix) - 1].rsplit(".", 1)[-1]
+
+    def rank(self, domain: str) -> Optional[int]:
+        """Popularity rank of a registered domain (1 = most popular), or None."""
+        position = bisect_left(self._domains, domain)
+        if position < len(self._domains) and self._domains[position] == domain:
+            return self._ranks[position]
+        return None
+
+    def match(self, host: str, path: str = "") -> Optional[TopSiteMatch]:
+        """Return the top site ``host`` is, or None.
+
+        Args:
+            host: Canonical host; only a registered domain and its ``www.``
+                host can match
+            path: URL path; user-content and redirect paths never match
+        """
+        suffixes = get_public_suffixes()
+        domain = suffixes.registered_domain(host) or host
+        if host not in (domain, "www." + domain):
+            return None
+        if path.lower().startswith(_USER_CONTENT_PATHS.get(domain, ())):
+            return None
+        rank = self.rank(domain)
+        if rank is None:
+            # Suffix entries (gov.in, gov.uk) vouch for their whole zone
+            domain = suffixes.public_suffix(host)
+            rank = self.rank(domain)
+        return TopSiteMatch(domain, rank) if rank is not None else None
+
+    def lookalike(self, host: str) -> Optional[LookalikeMatch]:
+        """Return the top site ``host`` appears to imitate, or None."""
+        domain = get_public_suffixes().registered_domain(host)
+        if domain is None or domain in self:
+            return None
+        label = self._label(domain)
+        if not label:
+            return None
+
+        target = self._labels.get(label)
+        # The brand's own label under another of its suffixes: only the
+        # subdomain combo check below applies
+        own_label = target is not None and _brand_suffix(domain[len(label) + 1 :])
+        if target is not None and not own_label and len(label) >= MIN_BRAND_LABEL:
+            return LookalikeMatch(domain, target, "tld_swap")
+
+        target = None if own_label else self._skeletons.get(_skeleton(label))
+        if target is not None and len(label) >= MIN_BRAND_LABEL:
+            return LookalikeMatch(domain, target, "homoglyph")
+
+        if not own_label and len(label) >= MIN_TYPO_LABEL - 1 and label not in self._words:
+            target = self._typo(label)
+            if target is not None:
+                return LookalikeMatch(domain, target, "typo")
+
+        # Brand used as a token anywhere in the host, including subdomains
+        # ("paypal.com.verify-account.xyz")
+        for part in host[: -len(domain)].split(".") + [label]:
+            for token in part.split("-"):
+                target = self._brands.get(token)
+                if target is not None and token != label:
+                    return LookalikeMatch(domain, target, "combo")
+        return None
+
+    def _typo(self, label: str) -> Optional[str]:
+        """The most popular site whose label ``label`` misspells by one letter."""
+        # A letter dropped from a brand ("amazn"), or added to or swapped
+        # within one ("gooogle", "googel")
+        targets = [self._typo_index.get(label)]
+        targets += [
+            self._brands.get(variant)
+            for variant in _deletes(label) | _transposes(label)
+            if len(variant) >= MIN_TYPO_LABEL
+        ]
+        targets = [target for target in targets if target is not None]
+        return min(targets, key=self.rank) if targets else None
+
+
+def _brand_suffix(suffix: str) -> bool:
+    """Whether a brand plausibly owns its name under ``suffix`` as well."""
+    tld = suffix.rsplit(".", 1)[-1]
+    if suffix in _SQUATTED_TLDS:
+        return False
+    return tld in _BRAND_GENERIC_TLDS or (len(tld) == 2 and tld.isascii())
+
+
+def _read_words(path: str) -> list:
+    """Lower-case entries of a word list; capitalized ones are proper nouns."""
+    with open(path, encoding="utf-8") as handle:
+        return [word for word in (line.strip() for line in handle) if word.islower()]
+
+
+def _read_ranked(path: str, limit: int) -> list:
+    domains = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            domains.append(line.rsplit(",", 1)[-1])
+            if len(domains) >= limit:
+                break
+    return domains
+
+
+@lru_cache(maxsize=1)
+def get_top_sites() -> TopSites:
+    """Return the process-wide top-sites table (``TOP_SITES_FILE`` or built-in)."""
+    settings = get_settings()
+    words = _read_words(settings.lookalike_words_file) if settings.lookalike_words_file else ()
+    if settings.top_sites_file:
+        return TopSites(_read_ranked(settings.top_sites_file, settings.top_sites_limit), words)
+    return TopSites(_BUILTIN_TOP_SITES.split()[: settings.top_sites_limit], words)
+
+
+__all__ = ["LookalikeMatch", "TopSiteMatch", "TopSites", "get_top_sites"]
@@ -0,0 +1,293 @@
+"""Memory-mapped URL/domain reputation index.
+
+The index is a flat file of sorted 64-bit key hashes followed by one verdict
+byte per key::
+
+    b"RPIDX001" | count (u64) | hashes (count x u64, sorted) | verdicts (count x u8)
+
+Keys are ``url:<canonical url>`` or ``host:<host>``. A host entry covers the
+host and all of its subdomains; lookups walk from the full host up to its
+registered domain, so ``host:evil.com`` matches ``login.evil.com`` but
+``host:com`` is never consulted. The file is opened with ``mmap`` so every
+worker process shares one copy in the page cache, and a lookup is a binary
+search over the hash array (no parsing, no per-process load cost).
+
+``ReputationIndexBuilder`` merges blocklist/allowlist feed files with past
+VirusTotal verdicts; when keys conflict the stronger verdict wins
+(block > suspicious > allow). Rebuilding replaces the file atomically and
+running processes pick it up on their next reload check.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from ..metrics import METRICS
+from ..storage.sqlite import data_path
+from ..text.urls import canonicalize_url, url_host
+from .suffix import get_public_suffixes
+
+MAGIC = b"RPIDX001"
+_HEADER = struct.Struct("<8sQ")
+
+ALLOW = 1
+SUSPICIOUS = 2
+BLOCK = 3
+VERDICT_NAMES = {ALLOW: "allow", SUSPICIOUS: "suspicious", BLOCK: "block"}
+
+# How often a process checks whether the index file was rebuilt
+RELOAD_CHECK_S = 30.0
+
+# Feed files are selected by name: *.block / *.allow / *.suspicious (optionally .txt)
+FEED_VERDICTS = {"block": BLOCK, "allow": ALLOW, "suspicious": SUSPICIOUS}
+
+_HOSTS_FILE_ADDRESSES = frozenset({"0.0.0.0", "127.0.0.1", "::", "::1"})
+
+
+def key_hash(key: str) -> int:
+    """64-bit hash of an index key."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ReputationHit(NamedTuple):
+    """A lookup match: verdict name and the key that matched."""
+
+    verdict: str
+    matched: str
+
+
+def _candidate_keys(url: str) -> list:
+    """Keys to try for a URL, most specific first."""
+    canonical = canonicalize_url(url)
+    host = url_host(canonical)
+    keys = [f"url:{canonical}"]
+    domain = get_public_suffixes().registered_domain(host)
+    labels = host.split(".")
+    for start in range(len(labels)):
+        candidate = ".".join(labels[start:])
+        keys.append(f"host:{candidate}")
+        if domain is None or candidate == domain:
+            break
+    return keys
+
+
+class ReputationIndex:
+    """Read-only view of an index file (empty when the file does not exist)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.mtime: Optional[float] = None
+        self._mmap = None
+        self._hashes: object = ()
+        self._verdicts: object = b""
+        if path and os.path.exists(path):
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        with open(path, "rb") as handle:
+            self.mtime = os.fstat(handle.fileno()).st_mtime
+            if os.fstat(handle.fileno()).st_size < _HEADER.size:
+                return
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a reputation index")
+        view = memoryview(self._mmap)
+        start = _HEADER.size
+        self._hashes = view[start:start + 8 * count].cast("Q")
+        self._verdicts = view[start + 8 * count:start + 9 * count]
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _find(self, key: str) -> Optional[int]:
+        hashed = key_hash(key)
+        position = bisect_left(self._hashes, hashed)
+        if position < len(self._hashes) and self._hashes[position] == hashed:
+            return self._verdicts[position]
+        return None
+
+    def lookup(self, url: str) -> Optional[ReputationHit]:
+        """Return the most specific verdict for ``url``, or None if unknown.
+
+        Raises:
+            ValueError: If ``url`` has no host
+        """
+        if len(self):
+            for key in _candidate_keys(url):
+                verdict = self._find(key)
+                if verdict is not None:
+                    name = VERDICT_NAMES[verdict]
+                    METRICS.increment("reputation_lookups", result=name)
+                    return ReputationHit(name, key)
+        METRICS.increment("reputation_lookups", result="miss")
+        return None
+
+
+def _feed_entry_key(line: str) -> Optional[str]:
+    """Parse one feed line (domain, URL, hosts-file or ``||domain^``) into a key."""
+    line = line.split("#", 1)[0].strip()
+    if not line or line.startswith("!"):
+        return None
+    tokens = line.split()
+    if len(tokens) > 1 and tokens[0] in _HOSTS_FILE_ADDRESSES:
+        tokens = tokens[1:]
+    entry = tokens[0]
+    if entry.startswith("||"):
+        entry = entry[2:].rstrip("^")
+    entry = entry.removeprefix("*.")
+    try:
+        canonical = canonicalize_url(entry)
+    except ValueError:
+        return None
+    host = url_host(canonical)
+    if "://" in entry and canonical != f"{canonical.split('://', 1)[0]}://{host}/":
+        return f"url:{canonical}"
+    return f"host:{host}"
+
+
+class ReputationIndexBuilder:
+    """Collects keyed verdicts and writes an index file."""
+
+    def __init__(self):
+        self._entries: dict[int, int] = {}
+        self._allowed_hosts: set = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, verdict: int) -> None:
+        hashed = key_hash(key)
+        if verdict > self._entries.get(hashed, 0):
+            self._entries[hashed] = verdict
+        if verdict == ALLOW and key.startswith("host:"):
+            self._allowed_hosts.add(key)
+
+    def add_feed(self, path: str, verdict: int) -> int:
+        """Add every entry of a feed file; return how many were read."""
+        added = 0
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                key = _feed_entry_key(line)
+                if key is not None:
+                    self.add(key, verdict)
+                    added += 1
+        return added
+
+    def add_feeds_dir(self, directory: str) -> dict:
+        """Add all ``*.block``/``*.allow``/``*.suspicious`` files in a directory."""
+        counts = {}
+        if not os.path.isdir(directory):
+            return counts
+        for path in sorted(Path(directory).iterdir()):
+            name = path.name.removesuffix(".txt")
+            verdict = FEED_VERDICTS.get(name.rsplit(".", 1)[-1])
+            if verdict is not None and path.is_file():
+                counts[path.name] = self.add_feed(str(path), verdict)
+        return counts
+
+    def add_verdict_log(self, log, domain_threshold: int) -> dict:
+        """Add flagged URLs and repeatedly flagged domains from a ``VerdictLog``.
+
+        Domains on an allowlist are never blocked wholesale (their bad URLs
+        are still blocked individually).
+        """
+        urls = 0
+        for url, status in log.flagged_urls():
+            self.add(f"url:{url}", BLOCK if status == "malicious" else SUSPICIOUS)
+            urls += 1
+        domains = 0
+        for domain, _count in log.flagged_domains(domain_threshold):
+            if f"host:{domain}" not in self._allowed_hosts:
+                self.add(f"host:{domain}", BLOCK)
+                domains += 1
+        return {"urls": urls, "domains": domains}
+
+    def write(self, path: str) -> int:
+        """Write the index atomically; return the number of keys."""
+        ordered = sorted(self._entries)
+        hashes = array("Q", ordered)
+        verdicts = bytes(self._entries[hashed] for hashed in ordered)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, len(ordered)))
+            handle.write(hashes.tobytes())
+            handle.write(verdicts)
+        os.replace(tmp_path, path)
+        return len(ordered)
+
+
+def default_index_path() -> str:
+    return data_path("reputation.idx")
+
+
+def default_feeds_dir() -> str:
+    from ..config import get_settings
+
+    return get_settings().reputation_feeds_dir or data_path("reputation_feeds")
+
+
+def build_index(
+    output: Optional[str] = None,
+    feeds_dir: Optional[str] = None,
+    include_verdicts: bool = True,
+) -> dict:
+    """Build the index from feed files and the VirusTotal verdict log.
+
+    Returns:
+        dict with per-source counts and the total number of keys written.
+    """
+    from ..config import get_settings
+    from .verdicts import get_verdict_log
+
+    builder = ReputationIndexBuilder()
+    feeds = builder.add_feeds_dir(feeds_dir or default_feeds_dir())
+    verdicts = (
+        builder.add_verdict_log(get_verdict_log(), get_settings().reputation_domain_threshold)
+        if include_verdicts
+        else {}
+    )
+    output = output or default_index_path()
+    return {"feeds": feeds, "verdicts": verdicts, "keys": builder.write(output), "path": output}
+
+
+_index: Optional[ReputationIndex] = None
+_index_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_reputation_index() -> ReputationIndex:
+    """Return the process-wide index, reopening it when the file is rebuilt."""
+    global _index, _index_checked_at
+    now = time.monotonic()
+    if _index is not None and now - _index_checked_at < RELOAD_CHECK_S:
+        return _index
+    with _index_lock:
+        path = default_index_path()
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        if _index is None or mtime != _index.mtime:
+            _index = ReputationIndex(path)
+        _index_checked_at = now
+        return _index
+
+
+__all__ = [
+    "ALLOW",
+    "BLOCK",
+    "SUSPICIOUS",
+    "ReputationHit",
+    "ReputationIndex",
+    "ReputationIndexBuilder",
+    "build_index",
+    "get_reputation_index",
+    "key_hash",
+]
@@ -0,0 +1,143 @@
+"""Registered-domain extraction with a public-suffix trie.
+
+Rules use the publicsuffix.org format (``co.uk``, ``*.ck``, ``!www.ck``) and
+are stored as a trie of reversed labels, so finding the registered domain of
+a host is one walk over its labels. A compact built-in rule set covers the
+multi-label suffixes and shared-hosting domains common in our traffic; set
+``PUBLIC_SUFFIX_LIST`` to a downloaded ``public_suffix_list.dat`` for the
+full list. Hosts matching no rule fall back to the implicit ``*`` rule (the
+TLD is the suffix).
+"""
+
+from __future__ import annotations
+
+import ipaddress
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from ..config import get_settings
+
+_END = ""  # trie key marking the end of a rule: True, or "!" for exceptions
+
+_BUILTIN_RULES = """
+co.uk org.uk me.uk ltd.uk plc.uk net.uk ac.uk gov.uk nhs.uk police.uk sch.uk
+com.au net.au org.au edu.au gov.au asn.au id.au
+co.in net.in org.in firm.in gen.in ind.in ac.in edu.in res.in gov.in mil.in nic.in
+co.jp ne.jp or.jp ac.jp go.jp gr.jp
+com.br net.br org.br gov.br
+com.cn net.cn org.cn gov.cn edu.cn
+com.mx org.mx gob.mx
+co.za org.za gov.za
+co.nz org.nz govt.nz
+com.sg gov.sg edu.sg
+com.my gov.my
+com.pk gov.pk
+com.bd gov.bd
+com.np gov.np
+lk gov.lk
+com.ng gov.ng
+co.ke go.ke
+com.tr gov.tr
+com.ar gob.ar
+co.id go.id
+com.ph gov.ph
+com.vn gov.vn
+co.kr go.kr
+com.hk gov.hk
+com.tw gov.tw
+*.ck !www.ck
+github.io gitlab.io blogspot.com wordpress.com herokuapp.com appspot.com web.app
+firebaseapp.com netlify.app vercel.app pages.dev workers.dev azurewebsites.net
+cloudfront.net s3.amazonaws.com glitch.me repl.co onrender.com fly.dev ngrok.io
+ngrok-free.app trycloudflare.com 000webhostapp.com weebly.com wixsite.com
+"""
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
+
+
+class PublicSuffixTrie:
+    """Trie of public-suffix rules keyed by reversed host labels."""
+
+    def __init__(self, rules: Iterable[str] = ()):
+        self._root: dict = {}
+        self.rule_count = 0
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule: str) -> None:
+        """Add one rule (comments and blank lines are ignored)."""
+        rule = rule.strip().lower()
+        if not rule or rule.startswith("//"):
+            return
+        exception = rule.startswith("!")
+        node = self._root
+        for label in reversed(rule.lstrip("!").split(".")):
+            node = node.setdefault(label, {})
+        node[_END] = "!" if exception else True
+        self.rule_count += 1
+
+    def suffix_length(self, labels: list) -> int:
+        """Number of trailing labels forming the public suffix of ``labels``."""
+        node = self._root
+        length = 1  # implicit "*" rule
+        for depth, label in enumerate(reversed(labels)):
+            child = node.get(label)
+            if child is None:
+                child = node.get("*")
+                if child is None:
+                    break
+            end = child.get(_END)
+            if end == "!":
+                return depth
+            if end:
+                length = depth + 1
+            node = child
+        return length
+
+    def public_suffix(self, host: str) -> str:
+        labels = host.lower().rstrip(".").split(".")
+        return ".".join(labels[-self.suffix_length(labels):])
+
+    def registered_domain(self, host: str) -> Optional[str]:
+        """Return the registrable domain (eTLD+1) of ``host``.
+
+        IP addresses are returned unchanged; a host that is itself a public
+        suffix has no registered domain (None).
+        """
+        host = host.lower().rstrip(".")
+        if not host:
+            return None
+        if _is_ip(host):
+            return host
+        labels = host.split(".")
+        length = self.suffix_length(labels)
+        if len(labels) <= length:
+            return None
+        return ".".join(labels[-(length + 1):])
+
+
+def _read_rules(path: str) -> list:
+    with open(path, encoding="utf-8") as handle:
+        # The list puts one rule per line; anything after whitespace is a comment
+        return [line.split()[0] for line in handle if line.strip()]
+
+
+@lru_cache(maxsize=1)
+def get_public_suffixes() -> PublicSuffixTrie:
+    """Return the process-wide suffix trie (``PUBLIC_SUFFIX_LIST`` or built-in rules)."""
+    path = get_settings().public_suffix_list
+    return PublicSuffixTrie(_read_rules(path) if path else _BUILTIN_RULES.split())
+
+
+def registered_domain(host: str) -> Optional[str]:
+    """Registrable domain of ``host`` using the process-wide suffix trie."""
+    return get_public_suffixes().registered_domain(host)
+
+
+__all__ = ["PublicSuffixTrie", "get_public_suffixes", "registered_domain"]
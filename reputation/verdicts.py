@@ -0,0 +1,67 @@
+"""Log of completed VirusTotal verdicts, used to grow the reputation index.
+
+Every completed scan is recorded by canonical URL together with its host and
+registered domain. ``python -m news_info_verification_v2.reputation build`` turns malicious
+and suspicious URLs into URL entries, and blocks a whole registered domain
+once it has ``REPUTATION_DOMAIN_THRESHOLD`` malicious URLs.
+"""
+
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from typing import Optional
+
+from ..storage.sqlite import SqliteStore, data_path
+from .suffix import registered_domain
+
+
+class VerdictLog(SqliteStore):
+    """SQLite table of the latest VirusTotal verdict per canonical URL."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vt_verdicts (
+            url TEXT PRIMARY KEY,
+            host TEXT NOT NULL,
+            domain TEXT,
+            status TEXT NOT NULL,
+            malicious_count INTEGER NOT NULL,
+            scanned_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS vt_verdicts_domain ON vt_verdicts (domain, status);
+    """
+
+    def record(self, url: str, host: str, status: str, malicious_count: int = 0) -> None:
+        """Store the verdict for a canonical URL (replacing an older one)."""
+        self.execute(
+            "INSERT OR REPLACE INTO vt_verdicts VALUES (?, ?, ?, ?, ?, ?)",
+            (url, host, registered_domain(host), status, malicious_count, time.time()),
+        )
+
+    def flagged_urls(self) -> list:
+        """Return (url, status) for every malicious or suspicious URL."""
+        return self.execute(
+            "SELECT url, status FROM vt_verdicts WHERE status IN ('malicious', 'suspicious')"
+        )
+
+    def flagged_domains(self, threshold: int) -> list:
+        """Return (domain, count) for domains with at least ``threshold`` malicious URLs."""
+        return self.execute(
+            "SELECT domain, COUNT(*) FROM vt_verdicts WHERE status='malicious' "
+            "AND domain IS NOT NULL GROUP BY domain HAVING COUNT(*) >= ?",
+            (threshold,),
+        )
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return self.execute("SELECT COUNT(*) FROM vt_verdicts")[0][0]
+        return self.execute("SELECT COUNT(*) FROM vt_verdicts WHERE status=?", (status,))[0][0]
+
+
+@lru_cache(maxsize=1)
+def get_verdict_log() -> VerdictLog:
+    """Return the process-wide verdict log (``<data_dir>/vt_verdicts.db``)."""
+    return VerdictLog(data_path("vt_verdicts.db"))
+
+
+__all__ = ["VerdictLog", "get_verdict_log"]
@@ -0,0 +1,234 @@
+"""Per-upstream circuit breakers with fast-fail and health reporting.
+
+Each client wraps its HTTP calls in ``get_breaker(<upstream>).guard()``. After
+``failure_threshold`` consecutive failures (timeouts, connection errors, 5xx
+and 429 responses, or calls slower than ``slow_call_s``) the breaker opens and
+further calls raise ``CircuitOpenError`` immediately instead of waiting out
+their timeouts. A timeout only counts when the call had the upstream's full
+timeout: one cut short by the request's latency budget says nothing about
+the upstream and is recorded as ``cut``, leaving the breaker as it was. The tools report that as an ordinary ``status: error``
+result. After ``reset_timeout_s`` a single probe call is let through: success
+closes the breaker, failure reopens it with a doubled wait.
+
+Breakers are per process; ``get_upstream_health()`` reports their state for
+the ``/admin/upstreams`` endpoint.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import requests
+
+from ..config import UPSTREAM_BREAKERS, BreakerPolicy, get_breaker_policy
+from ..metrics import METRICS
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Window for the latency percentiles reported by health()
+HEALTH_WINDOW_S = 300.0
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Whether an exception indicates the upstream itself is unhealthy.
+
+    Client errors (bad key, bad request) do not count; clients that re-raise
+    ``HTTPError`` with a richer message keep the original as ``__cause__``.
+    """
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(exc, requests.HTTPError):
+        response = exc.response if exc.response is not None else getattr(exc.__cause__, "response", None)
+        if response is None:
+            return True
+        return response.status_code >= 500 or response.status_code == 429
+    return False
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream.
+
+    Args:
+        name: Upstream name used in errors and metric labels
+        policy: Thresholds and reset timing
+    """
+
+    def __init__(self, name: str, policy: Optional[BreakerPolicy] = None):
+        self.name = name
+        self.policy = policy or BreakerPolicy()
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._reset_timeout_s = self.policy.reset_timeout_s
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self._reset_timeout_s:
+            return HALF_OPEN
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        METRICS.increment("circuit_transitions", upstream=self.name, state=state)
+        METRICS.set_gauge("circuit_open", 1 if state == OPEN else 0, upstream=self.name)
+
+    def before_call(self) -> bool:
+        """Admit a call, or raise if the circuit is open.
+
+        Returns:
+            True if the admitted call is the half-open recovery probe.
+
+        Raises:
+            CircuitOpenError: If the circuit is open (or a probe is already running)
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return False
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            retry_in = max(0, int(self._opened_at + self._reset_timeout_s - time.monotonic()) + 1)
+            failures = self._failures
+        METRICS.increment("upstream_calls", upstream=self.name, outcome="rejected")
+        raise CircuitOpenError(
+            f"{self.name} temporarily unavailable (circuit open after {failures} "
+            f"consecutive failures); retry in {retry_in}s"
+        )
+
+    def record(
+        self,
+        elapsed_s: float,
+        error: Optional[BaseException],
+        probe: bool = False,
+        shortened: bool = False,
+    ) -> None:
+        """Record the outcome of an admitted call.
+
+        Args:
+            elapsed_s: Duration of the call
+            error: What the call raised, or None
+            probe: Whether the call was the half-open recovery probe
+            shortened: Whether the call's timeout was cut below the upstream's default
+        """
+        if shortened and isinstance(error, requests.Timeout):
+            outcome = "cut"
+        elif error is not None and not is_upstream_failure(error):
+            outcome = "error"
+        elif error is not None:
+            outcome = "failure"
+        elif elapsed_s > self.policy.slow_call_s:
+            outcome = "slow"
+        else:
+            outcome = "ok"
+        METRICS.increment("upstream_calls", upstream=self.name, outcome=outcome)
+        if outcome not in ("error", "cut"):
+            METRICS.observe("upstream_latency_ms", elapsed_s * 1000, upstream=self.name)
+
+        with self._lock:
+            if probe:
+                self._probe_in_flight = False
+            if outcome in ("error", "cut"):
+                # Not the upstream's fault; leaves the breaker where it was
+                return
+            if outcome == "ok":
+                self._failures = 0
+                if self._state != CLOSED:
+                    self._reset_timeout_s = self.policy.reset_timeout_s
+                    self._transition(CLOSED)
+                return
+            self._failures += 1
+            if probe:
+                self._reset_timeout_s = min(self._reset_timeout_s * 2, self.policy.max_reset_timeout_s)
+                self._transition(OPEN)
+            elif self._state == CLOSED and self._failures >= self.policy.failure_threshold:
+                self._transition(OPEN)
+
+    @contextmanager
+    def guard(self, shortened: bool = False) -> Iterator[None]:
+        """Run the enclosed upstream call under this breaker.
+
+        Args:
+            shortened: The call runs with less than the upstream's default
+                timeout (see ``deadline.request_timeout``); its timeouts are
+                then not held against the upstream
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        probe = self.before_call()
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.record(time.perf_counter() - started, e, probe=probe, shortened=shortened)
+            raise
+        self.record(time.perf_counter() - started, None, probe=probe, shortened=shortened)
+
+    def health(self) -> dict:
+        """Return state, failure counts and recent latency for dashboards."""
+        with self._lock:
+            state = self._current_state()
+            failures = self._failures
+            retry_in = (
+                max(0.0, self._opened_at + self._reset_timeout_s - time.monotonic())
+                if state == OPEN
+                else 0.0
+            )
+        p50 = METRICS.percentile("upstream_latency_ms", 50, window_s=HEALTH_WINDOW_S, upstream=self.name)
+        p90 = METRICS.percentile("upstream_latency_ms", 90, window_s=HEALTH_WINDOW_S, upstream=self.name)
+        return {
+            "state": state,
+            "consecutive_failures": failures,
+            "retry_in_s": round(retry_in, 1),
+            "calls": {
+                outcome: int(METRICS.counter("upstream_calls", upstream=self.name, outcome=outcome))
+                for outcome in ("ok", "slow", "failure", "error", "cut", "rejected")
+            },
+            "latency_p50_ms": round(p50, 1) if p50 is not None else None,
+            "latency_p90_ms": round(p90, 1) if p90 is not None else None,
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    """Return the process-wide breaker for an upstream, creating it on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(upstream)
+        if breaker is None:
+            breaker = _breakers[upstream] = CircuitBreaker(upstream, get_breaker_policy(upstream))
+        return breaker
+
+
+def get_upstream_health() -> dict:
+    """Return ``health()`` for every configured upstream."""
+    return {upstream: get_breaker(upstream).health() for upstream in UPSTREAM_BREAKERS}
+
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "get_breaker",
+    "get_upstream_health",
+    "is_upstream_failure",
+]
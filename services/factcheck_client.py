@@ -1,69 +1,175 @@
 """Google Fact Check Tools API client."""
 
-import os
+import time
+from functools import partial
+from typing import Optional
 
-import requests
-from dotenv import load_dotenv
+from ..config import get_settings
+from ..deadline import request_timeout
+from ..metrics import METRICS
+from ..storage.claim_reviews import get_claim_review_mirror
+from ..storage.evidence_cache import cache_key, get_evidence_cache
+from ..storage.quota import get_quota_governor
+from ..text.language import detect_language
+from .circuit_breaker import get_breaker
+from .fanout import run_concurrently
+from .http_session import get_session
 
 
-load_dotenv()
-FACTCHECK_API_KEY = os.getenv("FACTCHECK_API_KEY", "")
 FACTCHECK_BASE_URL = "https://factchecktools.googleapis.com/v1alpha1"
+FACTCHECK_TIMEOUT_S = 10.0
 
+# Largest page the API returns
+PAGE_SIZE = 10
 
-def search_fact_checks(query: str, max_results: int = 10) -> list:
+
+def _fetch_language(
+    api_key: str,
+    query: str,
+    language: Optional[str],
+    max_results: int,
+    max_age_days: Optional[int] = None,
+) -> list:
+    """Fetch reviews for one language, following ``nextPageToken`` within the page budget."""
+    settings = get_settings()
+    started = time.monotonic()
+    params = {"query": query, "key": api_key, "pageSize": PAGE_SIZE}
+    if language:
+        params["languageCode"] = language
+    if max_age_days:
+        params["maxAgeDays"] = max_age_days
+    results = []
+    for page in range(settings.factcheck_max_pages):
+        # Fetch another page only if, at the pace so far, it still finishes
+        # within the time allowance for one lookup
+        if page:
+            elapsed = time.monotonic() - started
+            if elapsed + elapsed / page > settings.factcheck_page_budget_s:
+                METRICS.increment("factcheck_pages_skipped")
+                break
+        timeout = request_timeout(FACTCHECK_TIMEOUT_S, step="Fact Check lookup")
+        with get_breaker("factcheck").guard(shortened=timeout < FACTCHECK_TIMEOUT_S):
+            get_quota_governor().acquire("factcheck")
+            response = get_session("factcheck").get(
+                f"{FACTCHECK_BASE_URL}/claims:search",
+                params=params,
+                timeout=timeout,
+            )
+            response.raise_for_status()
+        data = response.json()
+        results.extend(_normalize(data.get("claims", []), language))
+        token = data.get("nextPageToken")
+        if not token or len(results) >= max_results:
+            break
+        params["pageToken"] = token
+    return results
+
+
+def _normalize(claims: list, language: Optional[str]) -> list:
+    results = []
+    for claim_item in claims:
+        claim_text = claim_item.get("text", "")
+        claimant = claim_item.get("claimant", "Unknown")
+        
+        # Each claim can have multiple reviews
+        for review in claim_item.get("claimReview", []):
+            results.append({
+                "claim": claim_text,
+                "claimant": claimant,
+                "rating": review.get("textualRating", "Unknown"),
+                "url": review.get("url", ""),
+                "source": review.get("publisher", {}).get("name", "Unknown"),
+                "title": review.get("title", ""),
+                "language": review.get("languageCode") or language or "",
+                "review_date": review.get("reviewDate", ""),
+            })
+    return results
+
+
+def fact_check_languages(query: str) -> list:
+    """Languages to search for a claim: the detected one, then the fallback.
+
+    A regional-language claim is also searched without a language filter so
+    reviews published in another language can still match.
+    """
+    detected = detect_language(query)
+    fallback = get_settings().claim_fallback_language
+    if detected == fallback:
+        return [detected]
+    return [detected, None]
+
+
+def search_fact_checks(
+    query: str,
+    max_results: int = 30,
+    languages: Optional[list] = None,
+    max_age_days: Optional[int] = None,
+) -> list:
     """
     Search for fact-checks using Google Fact Check Tools API.
     
+    The claim is searched in each language concurrently (by default the
+    detected language plus an unrestricted search), following result pages
+    while they fit ``FACTCHECK_PAGE_BUDGET_S``. Reviews are merged and
+    deduplicated by review URL.
+    
     Args:
         query: Claim to search for
-        max_results: Maximum number of results (default 10)
+        max_results: Maximum number of results after merging (default 30)
+        languages: Language codes to search (None entry = any language);
+            defaults to ``fact_check_languages(query)``
+        max_age_days: Only reviews published in the last N days
         
     Returns:
-        List of fact-check dicts with keys: claim, claimant, rating, url, source
+        List of fact-check dicts with keys: claim, claimant, rating, url, source, title,
+        language, review_date
         
     Raises:
         ValueError: If API key is not configured
+        QuotaExceededError: If the shared Fact Check quota is exhausted
+        CircuitOpenError: If Fact Check is failing and its circuit breaker is open
+        DeadlineExceededError: If the request's latency budget is exhausted
         requests.HTTPError: If API request fails
+        
+        Errors are raised only when every language search fails.
     """
-    if not FACTCHECK_API_KEY:
+    api_key = get_settings().factcheck_api_key
+    if not api_key:
         raise ValueError("FACTCHECK_API_KEY environment variable not set")
     
-    params = {
-        "query": query,
-        "key": FACTCHECK_API_KEY,
-        "pageSize": min(max_results, 10),
-        "languageCode": "en",
-    }
+    languages = languages or fact_check_languages(query)
+    cache = get_evidence_cache()
+    key = cache_key(query, max_results, languages, max_age_days)
+    cached = cache.get("factcheck", key)
+    if cached is not None:
+        return cached
     
-    response = requests.get(
-        f"{FACTCHECK_BASE_URL}/claims:search",
-        params=params,
-        timeout=10,
-    )
-    response.raise_for_status()
+    outcomes = run_concurrently({
+        language: partial(_fetch_language, api_key, query, language, max_results, max_age_days)
+        for language in languages
+    })
+    errors = [outcome for outcome in outcomes.values() if isinstance(outcome, Exception)]
+    if len(errors) == len(outcomes):
+        raise errors[0]
     
-    data = response.json()
-    claims = data.get("claims", [])
-    
-    # Normalize response format
     results = []
-    for claim_item in claims:
-        claim_text = claim_item.get("text", "")
-        claimant = claim_item.get("claimant", "Unknown")
-        
-        # Each claim can have multiple reviews
-        for review in claim_item.get("claimReview", []):
-            results.append({
-                "claim": claim_text,
-                "claimant": claimant,
-                "rating": review.get("textualRating", "Unknown"),
-                "url": review.get("url", ""),
-                "source": review.get("publisher", {}).get("name", "Unknown"),
-                "title": review.get("title", ""),
-            })
+    seen = set()
+    for outcome in outcomes.values():
+        if isinstance(outcome, Exception):
+            continue
+        for review in outcome:
+            url = review["url"]
+            if url and url in seen:
+                continue
+            seen.add(url)
+            results.append(review)
     
-    return results[:max_results]
+    # Every review seen feeds the local mirror queried before the API
+    get_claim_review_mirror().upsert(results)
+    results = results[:max_results]
+    if not errors:
+        cache.set("factcheck", key, results)
+    return results
 
 
-__all__ = ["search_fact_checks"]
+__all__ = ["fact_check_languages", "search_fact_checks"]
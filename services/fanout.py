@@ -0,0 +1,51 @@
+"""Concurrent fan-out of independent upstream calls.
+
+Used where one tool call needs several requests that do not depend on each
+other (the same claim in several languages). Every call runs on a shared
+thread pool in a copy of the caller's context, so the request deadline and
+its skipped-step notes apply to each call as if it ran inline, and a
+profiled request's profile covers the pool threads (see ``profiling``). Wall
+time is the slowest call, not the sum.
+"""
+
+from __future__ import annotations
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from ..profiling import thread_scope
+
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="fanout")
+
+
+def run_concurrently(calls: dict) -> dict:
+    """Run ``{name: zero-argument callable}`` concurrently.
+
+    Returns:
+        ``{name: result}`` in the order of ``calls``; a call that raised maps
+        to its exception instead of a result.
+    """
+    if len(calls) == 1:
+        ((name, call),) = calls.items()
+        return {name: _capture(call)}
+    futures = {
+        name: _executor.submit(contextvars.copy_context().run, _capture_in_pool, call)
+        for name, call in calls.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _capture_in_pool(call: Callable):
+    with thread_scope():
+        return _capture(call)
+
+
+def _capture(call: Callable):
+    try:
+        return call()
+    except Exception as e:
+        return e
+
+
+__all__ = ["run_concurrently"]
@@ -1,89 +1,154 @@
 """GNews API client for fetching licensed news articles."""
 
-import os
+from typing import Optional
 
 import requests
-from dotenv import load_dotenv
+
+from ..config import get_settings
+from ..deadline import request_timeout
+from ..storage.evidence_cache import cache_key, get_evidence_cache
+from ..storage.quota import get_quota_governor
+from ..text.language import detect_language, latin_text
+from ..text.query_builder import MAX_QUERY_CHARS, build_news_query, sanitize_query
+from .circuit_breaker import get_breaker
+from .http_session import get_session
 
 
-load_dotenv()
-GNEWS_API_KEY = os.getenv("GNEWS_API_KEY", "")
 GNEWS_BASE_URL = "https://gnews.io/api/v4"
+GNEWS_TIMEOUT_S = 10.0
+
+# Languages GNews can filter on
+GNEWS_LANGUAGES = frozenset(
+    "ar de el en es fr he hi it ja ml mr nl no pt ro ru sv ta te uk zh".split()
+)
+
+
+def news_languages(claim: str) -> list:
+    """Languages to search for a claim: the detected one, then the fallback.
+
+    A language GNews cannot filter on is searched unrestricted (None).
+    """
+    detected = detect_language(claim)
+    fallback = get_settings().claim_fallback_language
+    if detected == fallback:
+        return [detected]
+    return [detected if detected in GNEWS_LANGUAGES else None, fallback]
+
+
+def news_queries(claim: str, query: Optional[str] = None) -> dict:
+    """Return ``{language: query}`` for the searches a claim needs.
+
+    The first language gets ``query`` (default: built from the claim); a
+    fallback language is searched with the claim's Latin-script words
+    (names, places) if there are at least two of them.
+    """
+    languages = news_languages(claim)
+    queries = {languages[0]: query or build_news_query(claim).query or claim}
+    for lang in languages[1:]:
+        fallback_query = build_news_query(latin_text(claim)).query
+        if sum(word.isalpha() for word in fallback_query.split()) >= 2:
+            queries[lang] = fallback_query
+    return queries
+
+
+def _prepare_query(query: str) -> str:
+    # GNews rejects special characters, operators and queries over 200 chars
+    if len(query) > MAX_QUERY_CHARS or len(query.split()) > 15:
+        return build_news_query(query).query
+    return sanitize_query(query)
+
+
+def _normalize(data: dict) -> list:
+    return [
+        {
+            "title": article.get("title", ""),
+            "url": article.get("url", ""),
+            "source": article.get("source", {}).get("name", "Unknown"),
+            "published_date": article.get("publishedAt", ""),
+            "description": article.get("description", ""),
+        }
+        for article in data.get("articles", [])
+    ]
 
 
-def search_news(query: str, max_results: int = 10) -> list:
+def search_news(
+    query: str,
+    max_results: int = 10,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    lang: Optional[str] = "en",
+) -> list:
     """
     Search for news articles using GNews API.
     
     Args:
-        query: Search query string
+        query: Search query string; long or free-text queries are reduced
+            with ``text.query_builder``
         max_results: Maximum number of articles to return (default 10)
+        from_date: Only articles published after this ISO-8601 time
+        to_date: Only articles published before this ISO-8601 time
+        lang: Article language (one of ``GNEWS_LANGUAGES``; None = any)
         
     Returns:
         List of article dicts with keys: title, url, source, published_date, description
         
     Raises:
-        ValueError: If API key is not configured
+        ValueError: If API key is not configured or the query has no searchable terms
+        QuotaExceededError: If the shared GNews quota is exhausted
+        CircuitOpenError: If GNews is failing and its circuit breaker is open
+        DeadlineExceededError: If the request's latency budget is exhausted
         requests.HTTPError: If API request fails
     """
-    if not GNEWS_API_KEY:
+    api_key = get_settings().gnews_api_key
+    if not api_key:
         raise ValueError("GNEWS_API_KEY environment variable not set")
     
-    # GNews query preprocessing:
-    # 1. Remove commas and special chars (causes syntax errors)
-    # 2. Limit to 200 chars max
-    # 3. Filter out short/filler words
-    
-    # Clean special characters that break GNews syntax
-    query = query.replace(',', ' ').replace(';', ' ').replace(':', ' ')
-    query = ' '.join(query.split())  # Normalize whitespace
+    query = _prepare_query(query)
+    if not query:
+        raise ValueError("Query has no searchable terms")
     
-    # Truncate if needed
-    if len(query) > 200:
-        words = query[:150].split()
-        filtered = [w for w in words if len(w) > 3 and w.lower() not in 
-                   {'that', 'this', 'with', 'from', 'have', 'been', 'were', 'said', 'told'}]
-        query = ' '.join(filtered[:15])
+    cache = get_evidence_cache()
+    key = cache_key(query, max_results, from_date, to_date, lang)
+    cached = cache.get("gnews", key)
+    if cached is not None:
+        return cached
+    timeout = request_timeout(GNEWS_TIMEOUT_S, step="GNews search")
     
     params = {
         "q": query,
-        "token": GNEWS_API_KEY,
-        "lang": "en",
+        "token": api_key,
         "max": min(max_results, 10),  # API limit
         "sortby": "relevance",
     }
+    if lang:
+        params["lang"] = lang
+    if from_date:
+        params["from"] = from_date
+    if to_date:
+        params["to"] = to_date
     
-    try:
-        response = requests.get(
-            f"{GNEWS_BASE_URL}/search",
-            params=params,
-            timeout=10,
-        )
-        response.raise_for_status()
-    except requests.HTTPError as e:
-        # Include response body for debugging
-        error_msg = str(e)
+    with get_breaker("gnews").guard(shortened=timeout < GNEWS_TIMEOUT_S):
+        get_quota_governor().acquire("gnews")
         try:
-            error_detail = response.json()
-            error_msg = f"{e}. API Response: {error_detail}"
-        except:
-            pass
-        raise requests.HTTPError(error_msg) from e
+            response = get_session("gnews").get(
+                f"{GNEWS_BASE_URL}/search",
+                params=params,
+                timeout=timeout,
+            )
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            # Include response body for debugging
+            error_msg = str(e)
+            try:
+                error_detail = response.json()
+                error_msg = f"{e}. API Response: {error_detail}"
+            except:
+                pass
+            raise requests.HTTPError(error_msg) from e
     
-    data = response.json()
-    articles = data.get("articles", [])
-    
-    # Normalize response format
-    return [
-        {
-            "title": article.get("title", ""),
-            "url": article.get("url", ""),
-            "source": article.get("source", {}).get("name", "Unknown"),
-            "published_date": article.get("publishedAt", ""),
-            "description": article.get("description", ""),
-        }
-        for article in articles
-    ]
+    results = _normalize(response.json())
+    cache.set("gnews", key, results)
+    return results
 
 
-__all__ = ["search_news"]
+__all__ = ["GNEWS_LANGUAGES", "news_languages", "news_queries", "search_news"]
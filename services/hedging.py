@@ -0,0 +1,203 @@
+"""Request hedging for slow, tail-heavy upstream calls.
+
+``hedged_call`` runs an upstream request on a worker thread. If it has not
+returned after an adaptive delay (a percentile of recent attempt latencies),
+a second attempt is sent and whichever succeeds first wins. Attempts use
+the upstream's pooled session (``services.http_session``), so they reuse the
+warmed-up connections. The loser is cancelled by shutting down its socket,
+so it stops consuming a connection (and, for streamed generations, upstream
+work). A token-bucket ``HedgeBudget`` caps extra requests at a fraction of
+primary calls.
+
+Recorded in ``METRICS`` per upstream:
+
+- ``upstream_attempt_ms``: latency of every attempt, including failed ones
+  and cancelled losers (a lower bound for those); drives the delay
+- ``hedge_calls{hedged=yes|no}``: calls with and without a hedge
+- ``hedge_wins{winner=primary|hedge}``: which attempt answered
+- ``hedge_saved_ms``: estimated latency saved when the hedge won
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, TypeVar
+
+import requests
+
+from ..metrics import METRICS
+from ..profiling import thread_scope
+from .http_session import ConnectionTracker, get_session
+
+T = TypeVar("T")
+
+# Latency window used for the hedge delay and savings estimate
+HEDGE_WINDOW_S = 900.0
+# Completed attempts needed before hedging starts
+HEDGE_MIN_SAMPLES = 20
+
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+
+
+class HedgeBudget:
+    """Token bucket limiting hedges to ``max_rate`` extra requests per call.
+
+    Every primary call deposits ``max_rate`` tokens (up to ``burst``); a hedge
+    spends one.
+    """
+
+    def __init__(self, max_rate: float, burst: float = 5.0):
+        self.max_rate = max_rate
+        self.burst = burst
+        self._tokens = burst
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.max_rate)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+def hedge_delay(upstream: str, percentile: float) -> Optional[float]:
+    """Seconds to wait before hedging ``upstream``, or None until enough samples exist."""
+    samples = METRICS.samples("upstream_attempt_ms", window_s=HEDGE_WINDOW_S, upstream=upstream)
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return METRICS.percentile(
+        "upstream_attempt_ms", percentile, window_s=HEDGE_WINDOW_S, upstream=upstream
+    ) / 1000
+
+
+def _estimate_saved_ms(upstream: str, elapsed_ms: float) -> Optional[float]:
+    # Expected primary latency given it was still running at elapsed_ms
+    tail = [
+        value
+        for value in METRICS.samples("upstream_attempt_ms", window_s=HEDGE_WINDOW_S, upstream=upstream)
+        if value > elapsed_ms
+    ]
+    return sum(tail) / len(tail) - elapsed_ms if tail else None
+
+
+class _Attempt:
+    """One upstream attempt running on the hedge executor."""
+
+    def __init__(self, upstream: str, call: Callable[[requests.Session], T]):
+        self.upstream = upstream
+        self.connections = ConnectionTracker()
+        self.started = time.perf_counter()
+        # Run in the caller's context so the deadline and progress channel apply
+        self.future: Future = _executor.submit(contextvars.copy_context().run, self._run, call)
+
+    def _run(self, call: Callable[[requests.Session], T]) -> T:
+        try:
+            with thread_scope(), self.connections.track():
+                return call(get_session(self.upstream))
+        finally:
+            # Failed and aborted attempts count too, or the delay would only
+            # learn from the fast survivors and drift down
+            METRICS.observe("upstream_attempt_ms", self.elapsed_ms(), upstream=self.upstream)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def cancel(self) -> None:
+        if not self.future.cancel():
+            self.connections.abort()
+
+
+def hedged_call(
+    upstream: str,
+    primary: Callable[[requests.Session], T],
+    hedge: Callable[[requests.Session], T],
+    *,
+    delay_s: Optional[float],
+    budget: HedgeBudget,
+    before_hedge: Optional[Callable[[], None]] = None,
+) -> T:
+    """Run ``primary``, hedging with ``hedge`` if it is slower than ``delay_s``.
+
+    Args:
+        upstream: Name used for metric labels
+        primary: Makes the request using the given session and returns its result
+        hedge: Same for the hedge (may target a cheaper model)
+        delay_s: Seconds before hedging; None runs ``primary`` alone
+        budget: Shared cap on the hedge rate
+        before_hedge: Called before sending the hedge (e.g. quota accounting);
+            an exception from it cancels the hedge, not the call
+
+    Returns:
+        Result of the first attempt that succeeds.
+
+    Raises:
+        Exception: The primary attempt's error if every attempt failed
+    """
+    budget.deposit()
+    first = _Attempt(upstream, primary)
+    if delay_s is None:
+        METRICS.increment("hedge_calls", upstream=upstream, hedged="no")
+        return first.future.result()
+
+    done, _ = wait([first.future], timeout=delay_s)
+    if done or not budget.try_spend():
+        METRICS.increment("hedge_calls", upstream=upstream, hedged="no")
+        return first.future.result()
+    if before_hedge is not None:
+        try:
+            before_hedge()
+        except Exception:
+            METRICS.increment("hedge_calls", upstream=upstream, hedged="no")
+            return first.future.result()
+
+    METRICS.increment("hedge_calls", upstream=upstream, hedged="yes")
+    second = _Attempt(upstream, hedge)
+    pending = {first.future: first, second.future: second}
+    while pending:
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            attempt = pending.pop(future)
+            if future.exception() is not None:
+                continue
+            for loser in pending.values():
+                loser.cancel()
+            winner = "primary" if attempt is first else "hedge"
+            METRICS.increment("hedge_wins", upstream=upstream, winner=winner)
+            if attempt is second:
+                saved = _estimate_saved_ms(upstream, first.elapsed_ms())
+                if saved is not None:
+                    METRICS.observe("hedge_saved_ms", saved, upstream=upstream)
+            return future.result()
+    return first.future.result()
+
+
+def hedge_stats(upstream: str) -> dict:
+    """Summarize hedge rate, win split and estimated savings for ``upstream``."""
+    hedged = METRICS.counter("hedge_calls", upstream=upstream, hedged="yes")
+    calls = hedged + METRICS.counter("hedge_calls", upstream=upstream, hedged="no")
+    saved = METRICS.samples("hedge_saved_ms", upstream=upstream)
+    return {
+        "calls": int(calls),
+        "hedged": int(hedged),
+        "hedge_rate": round(hedged / calls, 3) if calls else 0.0,
+        "hedge_wins": int(METRICS.counter("hedge_wins", upstream=upstream, winner="hedge")),
+        "saved_ms_mean": round(sum(saved) / len(saved), 1) if saved else None,
+        "saved_ms_total": round(sum(saved), 1),
+    }
+
+
+__all__ = [
+    "HedgeBudget",
+    "HEDGE_MIN_SAMPLES",
+    "HEDGE_WINDOW_S",
+    "hedge_delay",
+    "hedge_stats",
+    "hedged_call",
+]
@@ -0,0 +1,133 @@
+"""Pooled HTTP sessions for the upstream clients.
+
+Each upstream gets one ``requests.Session`` per process, so its calls reuse
+kept-alive connections instead of paying a DNS lookup and TLS handshake each
+time, and the startup warm-up (``services.warmup``) can open them before the
+first claim arrives. Each pool keeps up to ``HTTP_POOL_SIZE`` connections,
+enough for the fan-out threads. Sessions are re-created after a fork.
+
+Requests made inside ``ConnectionTracker.track()`` can be aborted from
+another thread (``services.hedging`` cancels a losing attempt this way): the
+pools report each connection they hand out to the calling thread's tracker.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..config import get_settings
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_pid = os.getpid()
+_sessions_lock = threading.Lock()
+_tracking = threading.local()
+
+
+class ConnectionTracker:
+    """Connections checked out by the requests of one thread, so they can be aborted."""
+
+    def __init__(self):
+        self._connections: set = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Track the connections this thread checks out until the block exits."""
+        _tracking.tracker = self
+        try:
+            yield
+        finally:
+            _tracking.tracker = None
+
+    def _add(self, conn) -> None:
+        with self._lock:
+            self._connections.add(conn)
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self._connections.discard(conn)
+
+    def abort(self) -> None:
+        """Abort the tracked requests still holding a connection."""
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            sock = getattr(conn, "sock", None)
+            if sock is None:
+                continue
+            try:
+                # shutdown() wakes a thread blocked in recv(); close() would not
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class _TrackingMixin:
+    """Connection pool that reports checked-out connections to the thread's tracker."""
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        tracker = getattr(_tracking, "tracker", None)
+        if tracker is not None:
+            tracker._add(conn)
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        tracker = getattr(_tracking, "tracker", None)
+        if tracker is not None:
+            tracker._discard(conn)
+        super()._put_conn(conn)
+
+
+class _TrackingHTTPConnectionPool(_TrackingMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackingHTTPSConnectionPool(_TrackingMixin, HTTPSConnectionPool):
+    pass
+
+
+def get_session(upstream: str) -> requests.Session:
+    """Return the process-wide session for ``upstream``."""
+    global _sessions_pid
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(upstream)
+        if session is None:
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=get_settings().http_pool_size)
+            adapter.poolmanager.pool_classes_by_scheme = {
+                "http": _TrackingHTTPConnectionPool,
+                "https": _TrackingHTTPSConnectionPool,
+            }
+            session = _sessions[upstream] = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        return session
+
+
+def idle_connections(upstream: str) -> int:
+    """Return how many kept-alive connections ``upstream``'s pools hold."""
+    with _sessions_lock:
+        session = _sessions.get(upstream)
+    if session is None:
+        return 0
+    pools = session.get_adapter("https://").poolmanager.pools
+    idle = 0
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is not None and pool.pool is not None:
+            idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+    return idle
+
+
+__all__ = ["ConnectionTracker", "get_session", "idle_connections"]
@@ -1,14 +1,159 @@
-"""Perplexity API client for AI-powered research."""
+"""Perplexity API client for AI-powered research.
 
-import os
+Research calls have a long latency tail. With ``PERPLEXITY_HEDGE=1`` a call
+still running after the ``PERPLEXITY_HEDGE_PERCENTILE`` of recent latencies is
+hedged with a second request (optionally to ``PERPLEXITY_HEDGE_MODEL``), capped
+at ``PERPLEXITY_HEDGE_MAX_RATE`` extra requests per call; see ``services.hedging``.
+
+Completions are streamed (``PERPLEXITY_STREAM``, on by default). Citations
+are collected as chunks arrive, the answer so far is published as progress
+(see ``progress``), and a call cut short by its timeout returns the partial
+answer, marked ``partial``, instead of failing.
+"""
+
+import json
+import time
+from functools import lru_cache
 
 import requests
-from dotenv import load_dotenv
+
+from ..config import get_settings
+from ..deadline import request_timeout
+from ..metrics import METRICS
+from ..progress import report_progress
+from ..storage.evidence_cache import cache_key, get_evidence_cache
+from ..storage.quota import get_quota_governor
+from .circuit_breaker import get_breaker
+from .hedging import HedgeBudget, hedge_delay, hedged_call
+from .http_session import get_session
 
 
-load_dotenv()
-PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY", "")
 PERPLEXITY_BASE_URL = "https://api.perplexity.ai"
+PERPLEXITY_TIMEOUT_S = 30.0
+
+# Research answers need a few seconds at least; below this the call is skipped
+MIN_RESEARCH_TIMEOUT_S = 5.0
+# Answer-text progress is published at most this often while streaming
+PROGRESS_INTERVAL_S = 1.0
+
+
+@lru_cache(maxsize=1)
+def _get_hedge_budget() -> HedgeBudget:
+    return HedgeBudget(get_settings().perplexity_hedge_max_rate)
+
+
+def _raise_for_status(response) -> None:
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        # Include response body in error for debugging
+        error_msg = str(e)
+        try:
+            error_detail = response.json()
+            error_msg = f"{e}. API Response: {error_detail}"
+        except:
+            pass
+        raise requests.HTTPError(error_msg) from e
+
+
+def _post_completion(http, headers: dict, payload: dict, timeout: float) -> dict:
+    """POST a chat completion with ``http`` (``requests`` or a session); return the JSON body."""
+    response = http.post(
+        f"{PERPLEXITY_BASE_URL}/chat/completions",
+        headers=headers,
+        json=payload,
+        timeout=timeout,
+    )
+    _raise_for_status(response)
+    return response.json()
+
+
+def _stream_completion(http, headers: dict, payload: dict, timeout: float) -> dict:
+    """Stream a chat completion; return a body shaped like ``_post_completion``'s.
+
+    The answer and citations so far are published with ``report_progress``
+    as they arrive. If the stream ends early (``timeout`` spent or the
+    connection lost) after some answer text, that text is returned with
+    ``partial`` set.
+
+    Raises:
+        requests.Timeout: If ``timeout`` passed before any answer text
+    """
+    started = time.monotonic()
+    model = payload["model"]
+    response = http.post(
+        f"{PERPLEXITY_BASE_URL}/chat/completions",
+        headers=headers,
+        json={**payload, "stream": True},
+        timeout=timeout,
+        stream=True,
+    )
+    _raise_for_status(response)
+
+    parts: list = []
+    citations: list = []
+    partial = False
+    last_report = 0.0
+    try:
+        # chunk_size=None hands over each chunk as it arrives instead of buffering
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if time.monotonic() - started > timeout:
+                partial = True
+                break
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            model = chunk.get("model") or model
+            new_citations = [url for url in chunk.get("citations") or () if url not in citations]
+            citations.extend(new_citations)
+            choice = (chunk.get("choices") or [{}])[0]
+            text = (choice.get("delta") or {}).get("content")
+            if text:
+                if not parts:
+                    METRICS.observe(
+                        "perplexity_first_token_ms", (time.monotonic() - started) * 1000
+                    )
+                parts.append(text)
+            now = time.monotonic()
+            if new_citations or (text and now - last_report >= PROGRESS_INTERVAL_S):
+                last_report = now
+                report_progress(
+                    "perplexity", model=model, answer="".join(parts), citations=list(citations)
+                )
+            if choice.get("finish_reason"):
+                break
+    except requests.RequestException:
+        if not parts:
+            raise
+        partial = True
+    finally:
+        response.close()
+
+    if partial and not parts:
+        raise requests.Timeout(f"Perplexity sent no answer within {timeout:.1f}s")
+    return {
+        "choices": [{"message": {"content": "".join(parts)}}],
+        "citations": citations,
+        "model": model,
+        "partial": partial,
+    }
+
+
+def _completion_result(data: dict, model: str) -> dict:
+    """Extract answer and citations from a chat completion."""
+    choices = data.get("choices", [])
+    answer = ""
+    if choices:
+        answer = choices[0].get("message", {}).get("content", "")
+    return {
+        "answer": answer,
+        "citations": data.get("citations", []),
+        "model": data.get("model") or model,
+        "partial": bool(data.get("partial")),
+    }
 
 
 def query_perplexity(prompt: str, model: str = "sonar") -> dict:
@@ -24,16 +169,30 @@ def query_perplexity(prompt: str, model: str = "sonar") -> dict:
             - answer: Perplexity's response text
             - citations: List of source URLs
             - model: Model used
+            - partial: True when the answer was cut short by the timeout
             
     Raises:
         ValueError: If API key is not configured
+        QuotaExceededError: If the shared Perplexity quota is exhausted
+        CircuitOpenError: If Perplexity is failing and its circuit breaker is open
+        DeadlineExceededError: If the request's latency budget is exhausted
         requests.HTTPError: If API request fails
     """
-    if not PERPLEXITY_API_KEY:
+    api_key = get_settings().perplexity_api_key
+    if not api_key:
         raise ValueError("PERPLEXITY_API_KEY environment variable not set")
     
+    cache = get_evidence_cache()
+    key = cache_key(prompt, model)
+    cached = cache.get("perplexity", key)
+    if cached is not None:
+        return cached
+    timeout = request_timeout(
+        PERPLEXITY_TIMEOUT_S, minimum=MIN_RESEARCH_TIMEOUT_S, step="Perplexity research"
+    )
+    
     headers = {
-        "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
+        "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
     }
     
@@ -47,39 +206,32 @@ def query_perplexity(prompt: str, model: str = "sonar") -> dict:
         ],
     }
     
-    try:
-        response = requests.post(
-            f"{PERPLEXITY_BASE_URL}/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=30,
-        )
-        response.raise_for_status()
-    except requests.HTTPError as e:
-        # Include response body in error for debugging
-        error_msg = str(e)
-        try:
-            error_detail = response.json()
-            error_msg = f"{e}. API Response: {error_detail}"
-        except:
-            pass
-        raise requests.HTTPError(error_msg) from e
-    
-    data = response.json()
-    
-    # Extract answer and citations
-    choices = data.get("choices", [])
-    answer = ""
-    if choices:
-        answer = choices[0].get("message", {}).get("content", "")
+    settings = get_settings()
+    complete = _stream_completion if settings.perplexity_stream else _post_completion
+    # The stream's own "no answer within timeout" counts like a read timeout
+    with get_breaker("perplexity").guard(shortened=timeout < PERPLEXITY_TIMEOUT_S):
+        get_quota_governor().acquire("perplexity")
+        if settings.perplexity_hedge_enabled:
+            delay = hedge_delay("perplexity", settings.perplexity_hedge_percentile)
+            hedge_payload = {**payload, "model": settings.perplexity_hedge_model or model}
+            hedge_timeout = max(MIN_RESEARCH_TIMEOUT_S, timeout - (delay or 0))
+            data = hedged_call(
+                "perplexity",
+                lambda session: complete(session, headers, payload, timeout),
+                lambda session: complete(session, headers, hedge_payload, hedge_timeout),
+                delay_s=delay,
+                budget=_get_hedge_budget(),
+                before_hedge=lambda: get_quota_governor().acquire("perplexity"),
+            )
+        else:
+            data = complete(get_session("perplexity"), headers, payload, timeout)
     
-    citations = data.get("citations", [])
-    
-    return {
-        "answer": answer,
-        "citations": citations,
-        "model": model,
-    }
+    result = _completion_result(data, model)
+    if result["partial"]:
+        METRICS.increment("perplexity_partial")
+    else:
+        cache.set("perplexity", key, result)
+    return result
 
 
 __all__ = ["query_perplexity"]
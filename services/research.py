@@ -0,0 +1,218 @@
+"""One Perplexity research call per input, shared by the news, fact and scam lanes.
+
+The three lanes' research tools used to send three different prompts about
+the same input. With ``RESEARCH_UNIFIED`` (the default) they share a single
+request whose answer has a ``## SCAM``, ``## NEWS`` and ``## FACT`` section,
+the most time-critical lane first; each tool reads its own section
+(``research_section``) and the citations that section refers to. Lanes that
+run at the same time in one process wait for the call already in flight
+instead of starting their own. Reverifying the same input later hits the
+Perplexity evidence cache, keyed by the prompt. A lane whose section is
+missing or empty (for example after a cut-short answer) sends its own lane
+prompt instead.
+
+With ``RESEARCH_UNIFIED=0`` each tool sends its own lane prompt as before.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from concurrent.futures import Future
+
+from ..config import get_settings
+from ..metrics import METRICS
+from .perplexity_client import query_perplexity
+
+RESEARCH_SECTIONS = ("news", "fact", "scam")
+
+_SECTION_PROMPTS = {
+    "news": """1. Whether the claim is supported by credible news sources
+2. Key facts and evidence
+3. Any contradictory information""",
+    "fact": """1. Verdict (true/false/partly true/misleading)
+2. Key evidence supporting or refuting the claim
+3. Context and nuance
+4. Authoritative sources (scientific journals, government data, expert statements)""",
+    "scam": """1. Is this a known scam pattern?
+2. Similar scam reports or warnings
+3. Legitimate context (if it's NOT a scam)
+4. Red flags or warning signs
+5. Sources (scam databases, consumer protection agencies, news reports)""",
+}
+
+# Standalone prompts, used when RESEARCH_UNIFIED is off
+_LANE_PROMPTS = {
+    "news": """Research this news claim and verify its accuracy:
+    
+Claim: {claim}
+
+Provide:
+1. Whether the claim is supported by credible news sources
+2. Key facts and evidence
+3. Any contradictory information
+4. Cite all sources""",
+    "fact": """Fact-check this claim with authoritative sources:
+    
+Claim: {claim}
+
+Provide:
+1. Verdict (true/false/partly true/misleading)
+2. Key evidence supporting or refuting the claim
+3. Context and nuance
+4. Cite all authoritative sources (scientific journals, government data, expert statements)""",
+    "scam": """Analyze this potential scam and search for related reports:
+    
+Content: {claim}
+
+Provide:
+1. Is this a known scam pattern?
+2. Similar scam reports or warnings
+3. Legitimate context (if it's NOT a scam)
+4. Red flags or warning signs
+5. Cite all sources (scam databases, consumer protection agencies, news reports)""",
+}
+
+_UNIFIED_PROMPT = """Research this input. It may be a news claim, a factual claim or a possibly fraudulent message.
+
+Input: {claim}
+
+Answer in exactly three sections, in this order, each starting with its heading on its own line. If a section does not apply to the input, write "Not applicable" under its heading.
+
+## SCAM
+{scam}
+
+## NEWS
+{news}
+
+## FACT
+{fact}
+
+Cite every source with [n] markers."""
+
+# "## NEWS", "### Fact", "**SCAM**", "## **Scam:**" ... alone on their line;
+# plain "News ..." lines and bold lead-ins ("**Scam pattern:** ...") are not
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?=#|\*\*)(?:#{1,4}[ \t]*)?(?:\*\*)?[ \t]*(NEWS|FACT|SCAM)[ \t]*:?[ \t]*(?:\*\*)?[ \t]*:?[ \t]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_NOT_APPLICABLE = "not applicable"
+_CITATION_RE = re.compile(r"\[(\d{1,3})\]")
+
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def lane_prompt(claim: str, section: str) -> str:
+    """Return the standalone research prompt for one lane."""
+    return _LANE_PROMPTS[section].format(claim=claim)
+
+
+def unified_prompt(claim: str) -> str:
+    """Return the prompt asking for all three lane sections at once."""
+    return _UNIFIED_PROMPT.format(claim=claim, **_SECTION_PROMPTS)
+
+
+def split_sections(answer: str) -> dict:
+    """Split a unified answer into ``{section: text}``.
+
+    Each section starts at the first heading line with its name; a repeated
+    heading is part of the text. An answer without any section headings is
+    given to every section; otherwise sections without a heading (e.g. cut
+    off) are left out.
+
+    >>> split_sections("## SCAM\\n**Scam pattern:** none [1]\\n## NEWS\\n"
+    ...                "**News coverage** wide\\n## FACT\\n**Fact:** true")
+    {'scam': '**Scam pattern:** none [1]', 'news': '**News coverage** wide', 'fact': '**Fact:** true'}
+    """
+    headings = {}
+    for match in _HEADING_RE.finditer(answer):
+        headings.setdefault(match.group(1).lower(), match)
+    if not headings:
+        return {section: answer.strip() for section in RESEARCH_SECTIONS}
+    ordered = sorted(headings.values(), key=lambda match: match.start())
+    sections = {}
+    for match, following in zip(ordered, ordered[1:] + [None]):
+        end = following.start() if following else len(answer)
+        sections[match.group(1).lower()] = answer[match.end():end].strip()
+    return sections
+
+
+def _section_citations(text: str, citations: list) -> list:
+    """Citations referenced by ``[n]`` markers in ``text``; all of them if it has none."""
+    if text.lower().startswith(_NOT_APPLICABLE):
+        return []
+    indexes = dict.fromkeys(int(number) - 1 for number in _CITATION_RE.findall(text))
+    referenced = [citations[index] for index in indexes if 0 <= index < len(citations)]
+    return referenced or list(citations)
+
+
+def research_claim(claim: str) -> dict:
+    """Run (or join) the unified research call for ``claim``.
+
+    Returns:
+        ``query_perplexity``'s result plus ``sections`` (``split_sections``)
+    """
+    key = " ".join(claim.split())
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        METRICS.increment("research_calls", shared="yes")
+        return future.result()
+
+    METRICS.increment("research_calls", shared="no")
+    try:
+        result = query_perplexity(unified_prompt(key))
+        result = {**result, "sections": split_sections(result.get("answer", ""))}
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def research_section(claim: str, section: str) -> dict:
+    """Research ``claim`` for one lane.
+
+    Args:
+        claim: The user's input
+        section: One of ``RESEARCH_SECTIONS``
+
+    Returns:
+        dict with answer, citations and partial, like ``query_perplexity``.
+        If the shared answer has no text for this section (e.g. it was cut
+        short before it), the result of the lane's own prompt instead
+
+    Raises:
+        Exception: Anything ``query_perplexity`` raises
+    """
+    if not get_settings().research_unified:
+        return query_perplexity(lane_prompt(claim, section))
+
+    result = research_claim(claim)
+    text = result["sections"].get(section)
+    if not text:
+        METRICS.increment("research_fallbacks", section=section)
+        return query_perplexity(lane_prompt(claim, section))
+    return {
+        "answer": text,
+        "citations": _section_citations(text, result.get("citations", [])),
+        "partial": result.get("partial", False),
+        "model": result.get("model"),
+    }
+
+
+__all__ = [
+    "RESEARCH_SECTIONS",
+    "lane_prompt",
+    "research_claim",
+    "research_section",
+    "split_sections",
+    "unified_prompt",
+]
@@ -1,15 +1,48 @@
 """VirusTotal API client for URL security scanning."""
 
-import os
 import time
 
-import requests
-from dotenv import load_dotenv
+from ..config import get_settings
+from ..deadline import MIN_CALL_TIMEOUT_S, note_skipped, remaining_budget, request_timeout
+from ..reputation.verdicts import get_verdict_log
+from ..storage.evidence_cache import cache_key, get_evidence_cache
+from ..storage.quota import get_quota_governor
+from ..text.urls import canonicalize_url, url_host
+from .circuit_breaker import get_breaker
+from .http_session import get_session
 
 
-load_dotenv()
-VIRUSTOTAL_API_KEY = os.getenv("VT_API_KEY", "")  # Match .env variable name
 VIRUSTOTAL_BASE_URL = "https://www.virustotal.com/api/v3"
+VIRUSTOTAL_TIMEOUT_S = 10.0
+
+# Analysis polling: up to MAX_POLLS checks, POLL_INTERVAL_S apart
+POLL_INTERVAL_S = 5
+MAX_POLLS = 6
+
+
+def _analysis_result(url: str, analysis_id: str, analysis_data: dict) -> dict:
+    """Summarize an analysis response into counts and an overall status."""
+    stats = analysis_data.get("data", {}).get("attributes", {}).get("stats", {})
+    malicious = stats.get("malicious", 0)
+    suspicious = stats.get("suspicious", 0)
+    total = sum(stats.values()) if stats else 1
+    
+    # Determine overall status
+    if malicious > 0:
+        verdict = "malicious"
+    elif suspicious > 0:
+        verdict = "suspicious"
+    else:
+        verdict = "clean"
+    
+    return {
+        "url": url,
+        "malicious_count": malicious,
+        "suspicious_count": suspicious,
+        "total_scanners": total,
+        "analysis_url": f"https://www.virustotal.com/gui/url/{analysis_id}",
+        "status": verdict,
+    }
 
 
 def scan_url(url: str, wait_for_result: bool = True) -> dict:
@@ -17,36 +50,54 @@ def scan_url(url: str, wait_for_result: bool = True) -> dict:
     Scan a URL using VirusTotal API.
     
     Args:
-        url: URL to scan
-        wait_for_result: If True, wait for scan completion (default)
+        url: URL to scan; submitted and cached in canonical form
+        wait_for_result: If True, wait for scan completion (default). Polling
+            stops early, returning a 'pending' result with a ``note``, when the
+            request's latency budget cannot cover another poll.
         
     Returns:
         dict with keys:
-            - url: Original URL
+            - url: Canonical URL that was scanned
             - malicious_count: Number of vendors flagging as malicious
             - total_scanners: Total number of vendors
             - analysis_url: VirusTotal analysis page URL
-            - status: 'malicious', 'suspicious', or 'clean'
+            - status: 'malicious', 'suspicious', 'clean' or 'pending'
             
     Raises:
-        ValueError: If API key is not configured
+        ValueError: If API key is not configured or the URL has no host
+        QuotaExceededError: If the shared VirusTotal quota is exhausted
+        CircuitOpenError: If VirusTotal is failing and its circuit breaker is open
+        DeadlineExceededError: If the request's latency budget is exhausted
         requests.HTTPError: If API request fails
     """
-    if not VIRUSTOTAL_API_KEY:
+    api_key = get_settings().virustotal_api_key
+    if not api_key:
         raise ValueError("VT_API_KEY environment variable not set")
     
+    url = canonicalize_url(url)
+    cache = get_evidence_cache()
+    key = cache_key(url)
+    cached = cache.get("virustotal", key)
+    if cached is not None:
+        return cached
+    timeout = request_timeout(VIRUSTOTAL_TIMEOUT_S, step="VirusTotal scan")
+    breaker = get_breaker("virustotal")
+    
     headers = {
-        "x-apikey": VIRUSTOTAL_API_KEY,
+        "x-apikey": api_key,
     }
     
     # Submit URL for scanning
-    response = requests.post(
-        f"{VIRUSTOTAL_BASE_URL}/urls",
-        headers=headers,
-        data={"url": url},
-        timeout=10,
-    )
-    response.raise_for_status()
+    with breaker.guard(shortened=timeout < VIRUSTOTAL_TIMEOUT_S):
+        # Quota counts URL submissions; polling reuses the submitted analysis
+        get_quota_governor().acquire("virustotal")
+        response = get_session("virustotal").post(
+            f"{VIRUSTOTAL_BASE_URL}/urls",
+            headers=headers,
+            data={"url": url},
+            timeout=timeout,
+        )
+        response.raise_for_status()
     
     scan_data = response.json()
     analysis_id = scan_data.get("data", {}).get("id", "")
@@ -58,16 +109,29 @@ def scan_url(url: str, wait_for_result: bool = True) -> dict:
             "analysis_id": analysis_id,
         }
     
-    # Wait for analysis to complete (max 30 seconds)
-    for _ in range(6):
-        time.sleep(5)
+    # Wait for analysis to complete (max 30 seconds, less under a deadline)
+    analysis_data = {}
+    status = ""
+    for _ in range(MAX_POLLS):
+        budget = remaining_budget()
+        if budget is not None and budget < POLL_INTERVAL_S + MIN_CALL_TIMEOUT_S:
+            return {
+                "url": url,
+                "status": "pending",
+                "analysis_id": analysis_id,
+                "analysis_url": f"https://www.virustotal.com/gui/url/{analysis_id}",
+                "note": note_skipped("VirusTotal polling"),
+            }
+        time.sleep(POLL_INTERVAL_S)
         
-        analysis_response = requests.get(
-            f"{VIRUSTOTAL_BASE_URL}/analyses/{analysis_id}",
-            headers=headers,
-            timeout=10,
-        )
-        analysis_response.raise_for_status()
+        timeout = request_timeout(VIRUSTOTAL_TIMEOUT_S, step="VirusTotal polling")
+        with breaker.guard(shortened=timeout < VIRUSTOTAL_TIMEOUT_S):
+            analysis_response = get_session("virustotal").get(
+                f"{VIRUSTOTAL_BASE_URL}/analyses/{analysis_id}",
+                headers=headers,
+                timeout=timeout,
+            )
+            analysis_response.raise_for_status()
         
         analysis_data = analysis_response.json()
         status = analysis_data.get("data", {}).get("attributes", {}).get("status", "")
@@ -75,28 +139,12 @@ def scan_url(url: str, wait_for_result: bool = True) -> dict:
         if status == "completed":
             break
     
-    # Get analysis results
-    stats = analysis_data.get("data", {}).get("attributes", {}).get("stats", {})
-    malicious = stats.get("malicious", 0)
-    suspicious = stats.get("suspicious", 0)
-    total = sum(stats.values()) if stats else 1
-    
-    # Determine overall status
-    if malicious > 0:
-        verdict = "malicious"
-    elif suspicious > 0:
-        verdict = "suspicious"
-    else:
-        verdict = "clean"
-    
-    return {
-        "url": url,
-        "malicious_count": malicious,
-        "suspicious_count": suspicious,
-        "total_scanners": total,
-        "analysis_url": f"https://www.virustotal.com/gui/url/{analysis_id}",
-        "status": verdict,
-    }
+    result = _analysis_result(url, analysis_id, analysis_data)
+    if status == "completed":
+        cache.set("virustotal", key, result)
+        # Feeds the local reputation index on its next rebuild
+        get_verdict_log().record(url, url_host(url), result["status"], result["malicious_count"])
+    return result
 
 
 __all__ = ["scan_url"]
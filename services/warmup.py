@@ -0,0 +1,140 @@
+"""Connection warm-up for the upstream HTTP clients.
+
+``warm_upstreams()`` opens pooled connections (see ``services.http_session``)
+to every upstream with an API key configured, so the first claims after a
+start or deploy do not pay the DNS lookup and TLS handshake. A connection is
+opened with a ``HEAD`` of the API base URL, which needs no key and costs no
+quota; any HTTP answer counts. With ``probe`` set, each upstream also gets a
+cheap authenticated request that checks the key, taken from its quota.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional
+
+import requests
+
+from ..config import get_settings
+from ..metrics import METRICS
+from ..storage.quota import QuotaExceededError, get_quota_governor
+from .factcheck_client import FACTCHECK_BASE_URL
+from .fanout import run_concurrently
+from .gnews_client import GNEWS_BASE_URL
+from .http_session import get_session, idle_connections
+from .perplexity_client import PERPLEXITY_BASE_URL
+from .virustotal_client import VIRUSTOTAL_BASE_URL
+
+# Upstream -> (API base URL, settings field holding its key)
+UPSTREAMS = {
+    "gnews": (GNEWS_BASE_URL, "gnews_api_key"),
+    "factcheck": (FACTCHECK_BASE_URL, "factcheck_api_key"),
+    "virustotal": (VIRUSTOTAL_BASE_URL, "virustotal_api_key"),
+    "perplexity": (PERPLEXITY_BASE_URL, "perplexity_api_key"),
+}
+
+
+def _probe_gnews(session: requests.Session, key: str, timeout: float) -> requests.Response:
+    return session.get(
+        f"{GNEWS_BASE_URL}/top-headlines", params={"max": 1, "apikey": key}, timeout=timeout
+    )
+
+
+def _probe_factcheck(session: requests.Session, key: str, timeout: float) -> requests.Response:
+    return session.get(
+        f"{FACTCHECK_BASE_URL}/claims:search",
+        params={"query": "news", "pageSize": 1, "key": key},
+        timeout=timeout,
+    )
+
+
+def _probe_virustotal(session: requests.Session, key: str, timeout: float) -> requests.Response:
+    return session.get(
+        f"{VIRUSTOTAL_BASE_URL}/domains/example.com", headers={"x-apikey": key}, timeout=timeout
+    )
+
+
+# Perplexity has no request cheaper than a completion, so it is not probed
+PROBES: dict[str, Callable] = {
+    "gnews": _probe_gnews,
+    "factcheck": _probe_factcheck,
+    "virustotal": _probe_virustotal,
+}
+
+
+def configured_upstreams() -> list[str]:
+    """Return the upstreams with an API key configured."""
+    settings = get_settings()
+    return [name for name, (_, field) in UPSTREAMS.items() if getattr(settings, field)]
+
+
+def warm_upstream(name: str, connections: int = 2, probe: bool = False, timeout: float = 10.0) -> dict:
+    """Open up to ``connections`` pooled connections to ``name``.
+
+    Returns:
+        dict with ``status`` (``ready`` or ``failed``), ``ms``, idle
+        ``connections`` in the pool, the probe's HTTP ``probe_status`` (None
+        when not probed) and ``error``
+    """
+    base_url, field = UPSTREAMS[name]
+    session = get_session(name)
+    start = time.perf_counter()
+    # Concurrent requests each check out a connection of their own
+    results = run_concurrently({
+        index: partial(session.head, base_url, timeout=timeout, allow_redirects=False)
+        for index in range(max(1, connections))
+    })
+    errors = [result for result in results.values() if isinstance(result, Exception)]
+    report = {
+        "status": "failed" if len(errors) == len(results) else "ready",
+        "probe_status": None,
+        "error": str(errors[0]) if errors else None,
+    }
+
+    probe_call: Optional[Callable] = PROBES.get(name) if probe else None
+    if probe_call is not None and report["status"] == "ready":
+        try:
+            get_quota_governor().acquire(name)
+            response = probe_call(session, getattr(get_settings(), field), timeout)
+            report["probe_status"] = response.status_code
+            if not response.ok:
+                report["status"] = "failed"
+                report["error"] = f"probe returned HTTP {response.status_code}"
+        except (QuotaExceededError, requests.RequestException) as e:
+            report["error"] = str(e)
+
+    report["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    report["connections"] = idle_connections(name)
+    METRICS.observe("warmup_ms", report["ms"], upstream=name)
+    METRICS.increment("warmups", upstream=name, status=report["status"])
+    return report
+
+
+def warm_upstreams(connections: int = 2, probe: bool = False, timeout: float = 10.0) -> dict:
+    """Warm every configured upstream concurrently; return ``{name: report}``."""
+    names = configured_upstreams()
+    if not names:
+        return {}
+    # Not on the fan-out pool: each warm-up waits on its own calls there
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="warmup") as executor:
+        futures = {
+            name: executor.submit(warm_upstream, name, connections, probe, timeout) for name in names
+        }
+    reports = {}
+    for name, future in futures.items():
+        try:
+            reports[name] = future.result()
+        except Exception as e:
+            reports[name] = {"status": "failed", "error": str(e)}
+    return reports
+
+
+__all__ = [
+    "PROBES",
+    "UPSTREAMS",
+    "configured_upstreams",
+    "warm_upstream",
+    "warm_upstreams",
+]
@@ -0,0 +1,243 @@
+"""Incremental re-verification of watched claims.
+
+A watched claim is not re-run through the whole news lane. Each poll asks
+GNews only for articles published after the newest one already seen, and
+the Fact Check API only for reviews from the days since the last poll. The
+results are diffed against the stored evidence:
+
+- a new article or fact-check that ranks among the claim's relevant
+  evidence (``rank_evidence``) is a material change
+- a known fact-check whose rating changed is a material change
+- anything else only moves the watermarks forward
+
+Only a material change reruns the news merger (see ``serving.watch``), on
+the stored evidence plus the new items. Web research is done on the first
+poll and reused; a failed or cut-short research call is retried on the next
+poll.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import time
+from functools import partial
+from typing import NamedTuple, Optional
+
+from ..config import STATE_KEYS, get_settings
+from ..metrics import METRICS
+from .fanout import run_concurrently
+
+# A due watch is leased for this long while it is polled
+WATCH_LEASE_S = 600.0
+
+
+class WatchPoll(NamedTuple):
+    """Outcome of one poll (see ``poll_watch``)."""
+
+    evidence: dict
+    news_since: Optional[str]
+    reviews_since: Optional[str]
+    changes: dict
+
+
+def is_material(changes: dict) -> bool:
+    """Whether a poll's changes call for a new merger report."""
+    return bool(
+        changes.get("baseline")
+        or changes.get("news_added")
+        or changes.get("reviews_added")
+        or changes.get("ratings_changed")
+    )
+
+
+def _fetch_articles(claim: str, since: Optional[str]) -> list:
+    from ..storage.news_archive import get_news_archive
+    from ..text.query_builder import build_news_query
+    from .gnews_client import news_queries, search_news
+
+    news_query = build_news_query(claim)
+    outcomes = run_concurrently({
+        lang: partial(
+            search_news,
+            query,
+            from_date=since or news_query.from_date,
+            to_date=news_query.to_date,
+            lang=lang,
+        )
+        for lang, query in news_queries(claim, news_query.query).items()
+    })
+    errors = [outcome for outcome in outcomes.values() if isinstance(outcome, Exception)]
+    if len(errors) == len(outcomes):
+        raise errors[0]
+    articles = []
+    for lang, outcome in outcomes.items():
+        if not isinstance(outcome, Exception):
+            articles.extend(outcome)
+            if get_settings().news_archive_enabled:
+                get_news_archive().append(outcome, lang)
+    return articles
+
+
+def _fetch_reviews(claim: str, last_polled: Optional[float]) -> list:
+    from .factcheck_client import search_fact_checks
+
+    max_age_days = None
+    if last_polled:
+        max_age_days = math.ceil((time.time() - last_polled) / 86400) + 1
+    return search_fact_checks(claim, max_age_days=max_age_days)
+
+
+def _research(claim: str) -> dict:
+    from .research import research_section
+
+    try:
+        return {"status": "success", **research_section(claim, "news")}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+def _current_research(claim: str, stored: Optional[dict]) -> dict:
+    """Reuse complete stored research; otherwise research again, keeping any partial answer."""
+    if stored and stored.get("status") == "success" and not stored.get("partial"):
+        return stored
+    research = _research(claim)
+    if research["status"] != "success" and stored and stored.get("status") == "success":
+        return stored
+    return research
+
+
+def poll_watch(watch: dict) -> WatchPoll:
+    """Fetch a watched claim's new evidence and diff it against what is stored.
+
+    Args:
+        watch: A watch from ``Watchlist.claim_due`` (with ``evidence``)
+
+    Returns:
+        ``WatchPoll`` with the evidence to store, the new watermarks and the
+        changes (``news_added``, ``reviews_added``, ``ratings_changed``;
+        ``baseline`` on the first poll)
+
+    Raises:
+        Exception: If both upstream searches fail
+    """
+    from ..text.ranking import FACT_CHECK_FIELDS, NEWS_FIELDS, rank_evidence
+
+    claim = watch["claim"]
+    stored = watch["evidence"] or {}
+    baseline = not stored
+    stored_articles = {article["url"]: article for article in stored.get("articles", [])}
+    stored_reviews = {review["url"]: review for review in stored.get("reviews", [])}
+
+    fetched = run_concurrently({
+        "news": partial(_fetch_articles, claim, watch["news_since"]),
+        "fact": partial(_fetch_reviews, claim, watch["last_polled"]),
+    })
+    errors = {
+        name: str(outcome) for name, outcome in fetched.items() if isinstance(outcome, Exception)
+    }
+    if len(errors) == len(fetched):
+        raise fetched["news"]
+    new_articles = [
+        article
+        for article in ([] if "news" in errors else fetched["news"])
+        if article["url"] not in stored_articles
+    ]
+    ratings_changed = []
+    new_reviews = []
+    for review in [] if "fact" in errors else fetched["fact"]:
+        known = stored_reviews.get(review["url"])
+        if known is None:
+            new_reviews.append(review)
+        elif known.get("rating") != review.get("rating"):
+            ratings_changed.append({
+                "url": review["url"],
+                "source": review.get("source"),
+                "from": known.get("rating"),
+                "to": review.get("rating"),
+            })
+            stored_reviews[review["url"]] = review
+
+    # Material: new items among the evidence the merger would be given
+    articles = list(stored_articles.values()) + new_articles
+    reviews = list(stored_reviews.values()) + new_reviews
+    relevant_articles = rank_evidence(claim, articles, NEWS_FIELDS, min_kept=0).items
+    relevant_reviews = rank_evidence(claim, reviews, FACT_CHECK_FIELDS, min_kept=0).items
+    new_urls = {article["url"] for article in new_articles} | {review["url"] for review in new_reviews}
+    changes = {
+        "news_added": [
+            {field: article.get(field) for field in ("title", "url", "source", "published_date")}
+            for article in relevant_articles
+            if article["url"] in new_urls
+        ],
+        "reviews_added": [
+            {field: review.get(field) for field in ("claim", "rating", "url", "source", "review_date")}
+            for review in relevant_reviews
+            if review["url"] in new_urls
+        ],
+        "ratings_changed": ratings_changed,
+    }
+    if baseline:
+        changes["baseline"] = True
+    if errors:
+        changes["errors"] = errors
+
+    # Keep the most relevant articles for the next poll's diff
+    kept = rank_evidence(
+        claim, articles, NEWS_FIELDS, top_k=get_settings().watch_max_articles, min_relevance=0.0
+    ).items
+    evidence = {
+        "articles": [
+            {key: value for key, value in article.items() if key != "relevance"} for article in kept
+        ],
+        "reviews": reviews,
+        "research": _current_research(claim, stored.get("research")),
+    }
+    news_since = max(
+        [article.get("published_date") or "" for article in new_articles] + [watch["news_since"] or ""]
+    ) or None
+    reviews_since = max(
+        [review.get("review_date") or "" for review in new_reviews] + [watch["reviews_since"] or ""]
+    ) or None
+    METRICS.increment(
+        "watch_polls", result="error" if errors else ("changed" if is_material(changes) else "unchanged")
+    )
+    return WatchPoll(evidence, news_since, reviews_since, changes)
+
+
+def merger_state(claim: str, evidence: dict, changes: dict) -> dict:
+    """Session state for rerunning the news merger on a watch's evidence.
+
+    The worker outputs take the form the lane's own workers produce, with
+    ``source: "watchlist"`` and the new items listed under ``new``.
+    """
+    from ..text.ranking import FACT_CHECK_FIELDS, NEWS_FIELDS, rank_evidence
+
+    articles = rank_evidence(claim, evidence.get("articles", []), NEWS_FIELDS)
+    reviews = rank_evidence(claim, evidence.get("reviews", []), FACT_CHECK_FIELDS)
+    news = {
+        "status": "success",
+        "articles": articles.items,
+        "dropped": articles.dropped,
+        "max_relevance": articles.max_relevance,
+        "source": "watchlist",
+        "new": changes.get("news_added", []),
+    }
+    fact = {
+        "status": "success",
+        "claims": reviews.items,
+        "dropped": reviews.dropped,
+        "max_relevance": reviews.max_relevance,
+        "source": "watchlist",
+        "new": changes.get("reviews_added", []),
+        "ratings_changed": changes.get("ratings_changed", []),
+    }
+    research = evidence.get("research") or {"status": "error", "error": "No web research"}
+    return {
+        STATE_KEYS.NEWS_API: json.dumps(news, ensure_ascii=False),
+        STATE_KEYS.NEWS_FACT: json.dumps(fact, ensure_ascii=False),
+        STATE_KEYS.NEWS_PERPLEXITY: json.dumps(research, ensure_ascii=False),
+    }
+
+
+__all__ = ["WATCH_LEASE_S", "WatchPoll", "is_material", "merger_state", "poll_watch"]
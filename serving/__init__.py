@@ -0,0 +1,15 @@
+"""HTTP serving entry points for the verification agent."""
+
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # FastAPI/ADK are only imported when the server is actually built.
+    if name == "create_app":
+        from .app import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["create_app"]
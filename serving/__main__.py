@@ -0,0 +1,39 @@
+"""Run the verification API server: ``python -m news_info_verification_v2.serving``."""
+
+from __future__ import annotations
+
+import argparse
+
+import uvicorn
+
+from .app import create_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the verification agent over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--session-uri",
+        default=None,
+        help="Session backend URI (default bounded://; bounded:///path.db enables spill)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Runner processes behind a sticky front end (ports PORT+1..PORT+N)",
+    )
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        from .multiproc import run_multiprocess
+
+        run_multiprocess(args.workers, args.host, args.port, session_uri=args.session_uri)
+        return
+
+    uvicorn.run(create_app(session_service_uri=args.session_uri), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""Priority admission control for agent runs.
+
+Every ``/run`` and ``/run_sse`` request is classified into a lane before it
+reaches the ``Runner``, using only local signals (no model or API calls):
+
+- ``scam``: a URL that is on a local block/suspicious list or imitates a top
+  site; at least ``SCAM_MIN_TACTICS`` manipulation tactics found by
+  ``analyze_scam_sentiment`` (one alone, such as a mention of a bank or the
+  government, is common in ordinary claims); or one tactic together with a
+  link to a site that is neither known nor a top site. An unknown link alone
+  is not enough: ordinary claims often carry a news link
+- ``news``: explicit dates or recency words ("breaking", "yesterday", ...)
+- ``fact``: everything else
+
+Runs are admitted up to a process-wide limit and a per-lane limit, so a flood
+of fact questions cannot take every slot. Requests that cannot start wait in
+a bounded queue ordered by lane priority (scam, news, fact), then arrival.
+When the queue is full a new request evicts the lowest-priority waiter, if
+there is one below it; otherwise it is rejected. Waiting is capped at
+``admission_max_wait_s``. Rejected requests get ``503`` with ``Retry-After``.
+
+Queue depth and running runs are exported as gauges
+(``admission_queue_depth{lane}``, ``admission_running{lane}``), queue wait as
+``admission_wait_ms{lane}`` and rejections as ``admission_shed{lane,reason}``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import re
+from bisect import insort
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+from urllib.parse import urlsplit
+
+from ..config import get_admission_lane_limit, get_settings
+from ..metrics import METRICS
+
+LANES = ("scam", "news", "fact")
+LANE_PRIORITY = {lane: priority for priority, lane in enumerate(LANES)}
+
+# Distinct manipulation tactics that make a claim without links a scam check
+SCAM_MIN_TACTICS = 2
+
+_NEWS_WORDS_RE = re.compile(
+    r"\b(?:breaking|just in|today|tonight|yesterday|this (?:morning|week)|last night|"
+    r"latest|reported(?:ly)?|announced|according to|news)\b",
+    re.IGNORECASE,
+)
+
+
+def classify_claim(text: str) -> str:
+    """Return the admission lane of a user input (``scam``, ``news`` or ``fact``)."""
+    from ..reputation import get_reputation_index, get_top_sites
+    from ..text.query_builder import find_date_cues
+    from ..text.urls import find_urls
+    from ..tools.scam_tools import analyze_scam_sentiment
+
+    tactics = len(analyze_scam_sentiment(text).get("tactics") or ())
+    if tactics >= SCAM_MIN_TACTICS:
+        return "scam"
+    urls = find_urls(text)
+    if urls:
+        index = get_reputation_index()
+        top_sites = get_top_sites()
+        unknown_link = False
+        for url in urls:
+            hit = index.lookup(url.canonical)
+            if hit is not None:
+                if hit.verdict != "allow":
+                    return "scam"
+                continue
+            if top_sites.match(url.host, urlsplit(url.canonical).path) is not None:
+                continue
+            if top_sites.lookalike(url.host) is not None:
+                return "scam"
+            unknown_link = True
+        if unknown_link and tactics:
+            return "scam"
+    if _NEWS_WORDS_RE.search(text) or find_date_cues(text):
+        return "news"
+    return "fact"
+
+
+class AdmissionRejected(Exception):
+    """A run was not admitted; ``reason`` is ``queue_full``, ``evicted`` or ``timeout``."""
+
+    def __init__(self, lane: str, reason: str):
+        super().__init__(f"{lane} run not admitted ({reason})")
+        self.lane = lane
+        self.reason = reason
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    lane: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    """Bounded priority queue in front of the agent runs of one process.
+
+    Must be used from a single event loop (the server's).
+    """
+
+    def __init__(
+        self,
+        max_running: int,
+        max_queue: int,
+        max_wait_s: float,
+        lane_limits: dict,
+    ):
+        self.max_running = max_running
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self.lane_limits = dict(lane_limits)
+        self._running = {lane: 0 for lane in self.lane_limits}
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._publish()
+
+    def _can_start(self, lane: str) -> bool:
+        return (
+            sum(self._running.values()) < self.max_running
+            and self._running[lane] < self.lane_limits[lane]
+        )
+
+    def _publish(self) -> None:
+        for lane in self.lane_limits:
+            METRICS.set_gauge("admission_running", self._running[lane], lane=lane)
+            METRICS.set_gauge(
+                "admission_queue_depth",
+                sum(1 for waiter in self._queue if waiter.lane == lane),
+                lane=lane,
+            )
+
+    def _shed(self, lane: str, reason: str) -> AdmissionRejected:
+        METRICS.increment("admission_shed", lane=lane, reason=reason)
+        return AdmissionRejected(lane, reason)
+
+    def _dispatch(self) -> None:
+        """Start waiters, highest priority first, while their lanes have room."""
+        for waiter in list(self._queue):
+            if self._can_start(waiter.lane):
+                self._queue.remove(waiter)
+                self._running[waiter.lane] += 1
+                waiter.future.set_result(None)
+
+    async def acquire(self, lane: str) -> None:
+        """Wait for a run slot in ``lane``.
+
+        Raises:
+            AdmissionRejected: If the queue is full, the request was evicted
+                by a higher-priority one, or it waited ``max_wait_s``
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if self._can_start(lane):
+            self._running[lane] += 1
+            self._publish()
+            METRICS.observe("admission_wait_ms", 0.0, lane=lane)
+            return
+
+        waiter = _Waiter(LANE_PRIORITY[lane], next(self._seq), lane, loop.create_future())
+        if len(self._queue) >= self.max_queue:
+            lowest = self._queue[-1]
+            if lowest.priority <= waiter.priority:
+                raise self._shed(lane, "queue_full")
+            self._queue.pop()
+            lowest.future.set_exception(self._shed(lowest.lane, "evicted"))
+        insort(self._queue, waiter)
+        self._publish()
+
+        try:
+            await asyncio.wait({waiter.future}, timeout=self.max_wait_s)
+        except asyncio.CancelledError:
+            # Client went away; give back a slot granted in the meantime
+            if waiter.future.done() and waiter.future.exception() is None:
+                self.release(lane)
+            elif waiter in self._queue:
+                self._queue.remove(waiter)
+                self._publish()
+            raise
+        if not waiter.future.done():
+            self._queue.remove(waiter)
+            self._publish()
+            raise self._shed(lane, "timeout")
+        waiter.future.result()  # raises AdmissionRejected when evicted
+        self._publish()
+        METRICS.observe("admission_wait_ms", (loop.time() - started) * 1000, lane=lane)
+
+    def release(self, lane: str) -> None:
+        """Free a slot taken by ``acquire`` and start whoever can use it."""
+        self._running[lane] -= 1
+        self._dispatch()
+        self._publish()
+
+    def stats(self) -> dict:
+        lanes = {}
+        for lane, limit in self.lane_limits.items():
+            waits = METRICS.samples("admission_wait_ms", window_s=300, lane=lane)
+            lanes[lane] = {
+                "limit": limit,
+                "running": self._running[lane],
+                "queued": sum(1 for waiter in self._queue if waiter.lane == lane),
+                "wait_ms_p50": METRICS.percentile("admission_wait_ms", 50, window_s=300, lane=lane)
+                if waits
+                else None,
+                "wait_ms_p95": METRICS.percentile("admission_wait_ms", 95, window_s=300, lane=lane)
+                if waits
+                else None,
+                "shed": {
+                    reason: METRICS.counter("admission_shed", lane=lane, reason=reason)
+                    for reason in ("queue_full", "evicted", "timeout")
+                },
+            }
+        return {
+            "max_running": self.max_running,
+            "max_queue": self.max_queue,
+            "max_wait_s": self.max_wait_s,
+            "running": sum(self._running.values()),
+            "queued": len(self._queue),
+            "lanes": lanes,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide controller built from settings."""
+    settings = get_settings()
+    return AdmissionController(
+        max_running=settings.admission_max_running,
+        max_queue=settings.admission_max_queue,
+        max_wait_s=settings.admission_max_wait_s,
+        lane_limits={lane: get_admission_lane_limit(lane) for lane in LANES},
+    )
+
+
+def request_text(body: bytes) -> str:
+    """Return the text parts of a ``/run`` request's new message."""
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return ""
+    if not isinstance(payload, dict):
+        return ""
+    message = payload.get("new_message") or payload.get("newMessage") or {}
+    parts = message.get("parts") if isinstance(message, dict) else None
+    return "\n".join(
+        part["text"] for part in parts or () if isinstance(part, dict) and isinstance(part.get("text"), str)
+    )
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting agent runs through the controller.
+
+    Added outside ``DeadlineMiddleware``, so time spent queued does not count
+    against the run's latency budget.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        paths: Iterable[str],
+        controller: Optional[AdmissionController] = None,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.controller = controller
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        settings = get_settings()
+        if scope["type"] != "http" or scope["path"] not in self.paths or not settings.admission_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        lane = classify_claim(request_text(body))
+        controller = self.controller or get_admission_controller()
+        admitted = asyncio.ensure_future(controller.acquire(lane))
+        disconnected = asyncio.ensure_future(receive())
+        await asyncio.wait({admitted, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+        if not admitted.done():
+            admitted.cancel()
+            await asyncio.gather(admitted, return_exceptions=True)
+            return
+        disconnected.cancel()
+        try:
+            admitted.result()
+        except AdmissionRejected as e:
+            await self._reject(send, e, settings.admission_retry_after_s)
+            return
+
+        replayed = False
+
+        async def replay() -> dict:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        try:
+            await self.app(scope, replay, send)
+        finally:
+            controller.release(lane)
+
+    @staticmethod
+    async def _reject(send: Any, rejection: AdmissionRejected, retry_after: int) -> None:
+        payload = json.dumps({
+            "error": "Server is busy verifying other claims, retry later",
+            "lane": rejection.lane,
+            "reason": rejection.reason,
+            "retry_after": retry_after,
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", str(retry_after).encode()),
+                (b"content-length", str(len(payload)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+
+__all__ = [
+    "LANES",
+    "SCAM_MIN_TACTICS",
+    "AdmissionController",
+    "AdmissionMiddleware",
+    "AdmissionRejected",
+    "classify_claim",
+    "get_admission_controller",
+    "request_text",
+]
@@ -0,0 +1,276 @@
+"""ADK API server wired to the bounded session store.
+
+``create_app()`` builds ADK's standard FastAPI app (``/run``, ``/run_sse``,
+``/apps/{app}/users/{user}/sessions/...``) with sessions held by
+``storage.session_store.BoundedSessionService`` instead of the unbounded
+in-memory service. Select it with a ``bounded://`` session URI; a path after
+the scheme (``bounded:///var/lib/verify/sessions.db``) enables SQLite spill.
+
+Agent runs are served under a per-request latency budget (see ``deadline``);
+clients may override the configured budget with an ``X-Verify-Deadline``
+header in seconds and, where ``VERIFY_PROFILE_HEADER`` allows it, ask for a
+profile of the run with ``X-Verify-Profile: sample|trace`` (see
+``profiling``). Before that, runs pass priority admission control (see
+``serving.admission``) and are rejected with ``503`` under overload.
+
+Claims can also be submitted as asynchronous jobs (``POST /jobs``, see
+``serving.jobs``) and polled or delivered by webhook, or watched for new
+evidence (``POST /watches``, see ``serving.watch``).
+
+At startup the upstream connections, model clients and local indexes are
+warmed up (see ``serving.warmup``); ``GET /ready`` answers ``503`` until then.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from google.adk.cli.fast_api import get_fast_api_app
+from google.adk.cli.service_registry import get_service_registry
+
+from ..config import get_settings
+from ..deadline import deadline_scope
+from ..memory import MemoryTracker, get_memory_tracker, memory_report
+from ..profiling import PROFILE_MODES, profile_scope
+from ..services.circuit_breaker import get_upstream_health
+from ..services.hedging import hedge_stats
+from ..storage.quota import get_quota_governor
+from ..storage.session_store import BoundedSessionService, create_session_service
+from .admission import AdmissionMiddleware, get_admission_controller
+from .jobs import JobWorker, WebhookDispatcher, add_job_routes
+from .warmup import Warmup
+from .watch import WatchWorker, add_watch_routes
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+AGENTS_DIR = str(PACKAGE_DIR.parent)
+APP_NAME = PACKAGE_DIR.name
+
+BOUNDED_SCHEME = "bounded"
+
+DEADLINE_HEADER = b"x-verify-deadline"
+PROFILE_HEADER = b"x-verify-profile"
+_AGENT_RUN_PATHS = frozenset({"/run", "/run_sse"})
+
+# Session services created through the registry, for admin/stats endpoints
+_session_services: list = []
+
+
+def _bounded_session_factory(uri: str, **kwargs: Any) -> BoundedSessionService:
+    path = urlparse(uri).path
+    service = create_session_service(spill_path=path or None)
+    _session_services.append(service)
+    return service
+
+
+class DeadlineMiddleware:
+    """ASGI middleware running each agent run inside a ``deadline_scope``.
+
+    The scope wraps the whole response, including an SSE stream, so tools
+    called while events are streamed see the same deadline.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] not in _AGENT_RUN_PATHS:
+            await self.app(scope, receive, send)
+            return
+        budget = None
+        for name, value in scope.get("headers", ()):
+            if name == DEADLINE_HEADER:
+                try:
+                    budget = float(value)
+                except ValueError:
+                    pass
+        with deadline_scope(budget):
+            await self.app(scope, receive, send)
+
+
+def _session_id(body: bytes) -> Optional[str]:
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    session_id = payload.get("session_id") or payload.get("sessionId")
+    return session_id if isinstance(session_id, str) else None
+
+
+class ProfileMiddleware:
+    """ASGI middleware running profiled agent runs inside a ``profile_scope``.
+
+    A run is profiled when its ``X-Verify-Profile`` header names a mode that
+    ``VERIFY_PROFILE_HEADER`` allows (off by default: ``trace`` profiles the
+    shared event loop) or when ``VERIFY_PROFILE`` picks it; only then is the
+    body read, to name the profile after the run's session.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] not in _AGENT_RUN_PATHS:
+            await self.app(scope, receive, send)
+            return
+        settings = get_settings()
+        mode = None
+        if settings.profile_header in PROFILE_MODES:
+            allowed = PROFILE_MODES[: PROFILE_MODES.index(settings.profile_header) + 1]
+            for name, value in scope.get("headers", ()):
+                if name == PROFILE_HEADER:
+                    requested = value.decode("latin-1").strip().lower()
+                    mode = requested if requested in allowed else None
+        if mode is None and not settings.profile_mode:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        replayed = False
+
+        async def replay() -> dict:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        with profile_scope(_session_id(body), mode):
+            await self.app(scope, replay, send)
+
+
+class MemoryMiddleware:
+    """ASGI middleware counting finished agent runs for the ``MemoryTracker``."""
+
+    def __init__(self, app: Any, tracker: MemoryTracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] not in _AGENT_RUN_PATHS:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await asyncio.to_thread(self.tracker.after_run)
+
+
+def _background_lifespan(services: list, inner: Any = None):
+    """Lifespan starting ``services`` (``start()``/``stop()``) around ``inner``."""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        for service in services:
+            service.start()
+        try:
+            if inner is None:
+                yield
+            else:
+                async with inner(app) as state:
+                    yield state
+        finally:
+            for service in reversed(services):
+                await service.stop()
+
+    return lifespan
+
+
+def register_services() -> None:
+    """Register the ``bounded://`` session scheme with ADK's service registry."""
+    get_service_registry().register_session_service(BOUNDED_SCHEME, _bounded_session_factory)
+
+
+def create_app(session_service_uri: Optional[str] = None, **kwargs: Any) -> FastAPI:
+    """Build the API server app.
+
+    Args:
+        session_service_uri: Session backend URI (default ``bounded://``)
+        **kwargs: Extra ``get_fast_api_app`` options (``allow_origins``, ...)
+
+    Returns:
+        FastAPI application serving this package as an ADK app.
+    """
+    register_services()
+    kwargs.setdefault("web", False)
+    settings = get_settings()
+    job_worker = JobWorker(APP_NAME) if settings.jobs_enabled else None
+    watch_worker = WatchWorker(APP_NAME) if settings.watchlist_enabled else None
+    warmup = Warmup() if settings.warmup_enabled else None
+    background = [worker for worker in (job_worker, watch_worker) if worker is not None]
+    if background:
+        background.append(WebhookDispatcher())
+    if warmup is not None:
+        background.insert(0, warmup)
+    if background:
+        kwargs["lifespan"] = _background_lifespan(background, kwargs.get("lifespan"))
+    app = get_fast_api_app(
+        agents_dir=AGENTS_DIR,
+        session_service_uri=session_service_uri or f"{BOUNDED_SCHEME}://",
+        **kwargs,
+    )
+    # Innermost, so the profile covers the run and not time spent queued
+    app.add_middleware(ProfileMiddleware)
+    app.add_middleware(DeadlineMiddleware)
+    tracker = get_memory_tracker()
+    if tracker is not None:
+        tracker.start()
+        app.add_middleware(MemoryMiddleware, tracker=tracker)
+    # Added last so it runs first: queueing happens before the deadline starts
+    app.add_middleware(AdmissionMiddleware, paths=_AGENT_RUN_PATHS)
+
+    @app.get("/ready")
+    async def readiness() -> JSONResponse:
+        if warmup is None:
+            return JSONResponse({"ready": True, "status": "disabled"})
+        report = warmup.report()
+        return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
+    @app.get("/admin/sessions/stats")
+    async def session_stats() -> dict:
+        return {"services": [service.stats() for service in _session_services]}
+
+    @app.get("/admin/quota")
+    async def quota_usage() -> dict:
+        return get_quota_governor().usage()
+
+    @app.get("/admin/upstreams")
+    async def upstream_health() -> dict:
+        return {
+            "upstreams": get_upstream_health(),
+            "hedging": {"perplexity": hedge_stats("perplexity")},
+        }
+
+    @app.get("/admin/memory")
+    async def memory_usage(sessions: int = 10) -> dict:
+        # Measured on the event loop, so sessions do not change underneath
+        return memory_report(_session_services, top=sessions)
+
+    @app.get("/admin/admission")
+    async def admission_stats() -> dict:
+        return get_admission_controller().stats()
+
+    if job_worker is not None:
+        add_job_routes(app, job_worker)
+    if watch_worker is not None:
+        add_watch_routes(app, watch_worker)
+
+    return app
+
+
+__all__ = ["create_app", "register_services", "APP_NAME", "AGENTS_DIR"]
@@ -0,0 +1,120 @@
+"""Sticky-routing front end for multi-process serving.
+
+A thin ASGI reverse proxy that pins every session to one worker process by
+hashing its session ID, so a session's in-memory state, event history and
+agent run always live in the same ``Runner`` process. Session creation
+without an ID gets one assigned here so it can be routed; listing sessions
+fans out to every worker and merges the results.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import re
+import uuid
+import zlib
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+_SESSIONS_PATH = re.compile(r"^apps/[^/]+/users/[^/]+/sessions(?:/([^/]+))?")
+_HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "transfer-encoding",
+    "content-length",
+    "host",
+    "upgrade",
+    "te",
+    "trailer",
+}
+
+
+def worker_for(session_id: str, worker_count: int) -> int:
+    """Return the index of the worker that owns ``session_id``."""
+    return zlib.crc32(session_id.encode("utf-8")) % worker_count
+
+
+def _forward_headers(headers) -> dict:
+    return {k: v for k, v in headers.items() if k.lower() not in _HOP_BY_HOP}
+
+
+def _json_body(body: bytes) -> dict:
+    try:
+        payload = json.loads(body) if body else {}
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def create_frontend_app(worker_urls: list) -> FastAPI:
+    """Build the proxy app routing to ``worker_urls`` (e.g. ``http://127.0.0.1:8101``)."""
+    client = httpx.AsyncClient(timeout=httpx.Timeout(None, connect=5.0))
+    round_robin = itertools.cycle(range(len(worker_urls)))
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        yield
+        await client.aclose()
+
+    app = FastAPI(lifespan=lifespan)
+
+    async def forward(index: int, request: Request, path: str, body: bytes):
+        upstream = client.build_request(
+            request.method,
+            f"{worker_urls[index]}/{path}",
+            params=request.query_params,
+            headers=_forward_headers(request.headers),
+            content=body,
+        )
+        response = await client.send(upstream, stream=True)
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers=_forward_headers(response.headers),
+            background=BackgroundTask(response.aclose),
+        )
+
+    @app.get("/admin/workers")
+    async def workers() -> dict:
+        return {"workers": worker_urls}
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    async def proxy(path: str, request: Request):
+        body = await request.body()
+        match = _SESSIONS_PATH.match(path)
+
+        if match and match.group(1):
+            index = worker_for(match.group(1), len(worker_urls))
+        elif match and request.method == "POST":
+            # Assign the session ID here so the session can be routed sticky
+            payload = _json_body(body)
+            session_id = payload.pop("sessionId", None) or payload.get("session_id")
+            payload["session_id"] = session_id or str(uuid.uuid4())
+            body = json.dumps(payload).encode("utf-8")
+            index = worker_for(payload["session_id"], len(worker_urls))
+        elif match and request.method == "GET":
+            sessions = []
+            for url in worker_urls:
+                response = await client.get(f"{url}/{path}", params=request.query_params)
+                if response.status_code == 200:
+                    sessions.extend(response.json())
+            sessions.sort(key=lambda s: s.get("lastUpdateTime", s.get("last_update_time", 0)))
+            return JSONResponse(sessions)
+        elif path in ("run", "run_sse"):
+            payload = _json_body(body)
+            session_id = payload.get("session_id") or payload.get("sessionId") or ""
+            index = worker_for(session_id, len(worker_urls))
+        else:
+            index = next(round_robin)
+
+        return await forward(index, request, path, body)
+
+    return app
+
+
+__all__ = ["create_frontend_app", "worker_for"]
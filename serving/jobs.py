@@ -0,0 +1,382 @@
+"""Asynchronous verification jobs: submit, poll, or receive a webhook.
+
+``POST /jobs`` stores the claim (``storage.jobs``) and returns a job ID at
+once instead of holding the connection open for the whole agent run. Each
+server process runs ``jobs_concurrency`` job workers that claim queued jobs
+from the shared store, pass admission control like ``/run`` requests (but
+wait instead of being shed), run the agent and store the final report with
+a structured verdict parsed from it.
+
+Clients poll ``GET /jobs/{id}`` (status and verdict only) and fetch the
+report from ``GET /jobs/{id}/result``, or give a ``webhook_url``: finished
+jobs are POSTed there in batches, ``{"jobs": [...]}`` (plus
+``"watch_updates"`` for watchlist updates), retried with exponential
+backoff. With ``WEBHOOK_SECRET`` set, each batch carries an
+``X-Verify-Signature: sha256=<hex HMAC of the body>`` header.
+
+A webhook host must resolve to public addresses only, so a client cannot
+make the server POST to loopback, private, link-local or metadata
+addresses; hosts in ``WEBHOOK_ALLOWED_HOSTS`` are exempt, and when it is set
+no other host is accepted. The check runs on submission and again before
+each delivery, and the delivery connects to the address that was checked
+(with the original ``Host`` header and TLS server name), so a host that
+resolves differently on the second lookup cannot redirect it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import socket
+from collections import defaultdict
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+from ..config import STATE_KEYS, get_settings
+from ..deadline import deadline_scope
+from ..memory import get_memory_tracker
+from ..metrics import METRICS
+from ..profiling import profile_scope
+from ..storage.jobs import JobStore, get_job_store
+from .admission import AdmissionRejected, classify_claim, get_admission_controller
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Verify-Signature"
+
+
+class JobRequest(BaseModel):
+    """Body of ``POST /jobs``."""
+
+    claim: str = Field(min_length=1)
+    user_id: str = "jobs"
+    webhook_url: Optional[str] = None
+
+
+def sign(body: bytes, secret: str) -> str:
+    """Return the ``X-Verify-Signature`` value for a webhook body."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def check_webhook_url(webhook_url: str) -> Optional[str]:
+    """Check that the server may POST to ``webhook_url``.
+
+    Blocks on a DNS lookup; call it off the event loop.
+
+    Returns:
+        The checked address to connect to, or None for a host in
+        ``WEBHOOK_ALLOWED_HOSTS``
+
+    Raises:
+        ValueError: If it is not an http(s) URL, its host is not in
+            ``WEBHOOK_ALLOWED_HOSTS`` when that is set, or (for hosts not
+            listed) it does not resolve or resolves to a non-public address
+    """
+    url = urlparse(webhook_url)
+    if url.scheme not in ("http", "https") or not url.hostname:
+        raise ValueError("webhook_url must be an http(s) URL")
+    host = url.hostname.rstrip(".").lower()
+    allowed = {
+        name.strip().rstrip(".").lower()
+        for name in get_settings().webhook_allowed_hosts.split(",")
+        if name.strip()
+    }
+    if host in allowed:
+        return None
+    if allowed:
+        raise ValueError(f"webhook_url host {host} is not in WEBHOOK_ALLOWED_HOSTS")
+    try:
+        port = url.port or (443 if url.scheme == "https" else 80)
+        infos = socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, ValueError) as e:
+        raise ValueError(f"webhook_url host {host} does not resolve: {e}") from e
+    addresses = [ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos]
+    for address in addresses:
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"webhook_url host {host} resolves to non-public address {address}")
+    return str(addresses[0])
+
+
+class JobWorker:
+    """Runs queued jobs through the agent in this process."""
+
+    def __init__(self, app_name: str, store: Optional[JobStore] = None):
+        self.app_name = app_name
+        self.store = store or get_job_store()
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._runner = None
+
+    def start(self) -> None:
+        settings = get_settings()
+        self._tasks = [
+            asyncio.create_task(self._loop(), name=f"job-worker-{i}")
+            for i in range(settings.jobs_concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers after a submission in this process."""
+        self._wakeup.set()
+
+    def _get_runner(self):
+        if self._runner is None:
+            from google.adk.runners import Runner
+
+            from ..agent import get_root_agent
+            from ..storage.session_store import create_session_service
+
+            self._runner = Runner(
+                app_name=self.app_name,
+                agent=get_root_agent(),
+                session_service=create_session_service(),
+            )
+        return self._runner
+
+    async def _loop(self) -> None:
+        settings = get_settings()
+        while True:
+            job = await asyncio.to_thread(
+                self.store.claim_next, settings.jobs_lease_s, settings.jobs_max_attempts
+            )
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.jobs_poll_s)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            lease = asyncio.create_task(self._keep_lease(job), name=f"job-lease-{job['id']}")
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                await asyncio.to_thread(self.store.requeue, job["id"], job["attempts"])
+                raise
+            finally:
+                lease.cancel()
+
+    async def _keep_lease(self, job: dict) -> None:
+        """Renew ``job``'s lease while it waits for admission and runs."""
+        settings = get_settings()
+        while True:
+            await asyncio.sleep(settings.jobs_lease_s / 3)
+            renewed = await asyncio.to_thread(
+                self.store.renew, job["id"], job["attempts"], settings.jobs_lease_s
+            )
+            if not renewed:
+                # Its result will not be stored; the new claim's will
+                logger.warning("Job %s was claimed again after its lease expired", job["id"])
+                return
+
+    async def _admit(self, lane: str) -> None:
+        """Wait for an admission slot; jobs retry instead of being shed."""
+        settings = get_settings()
+        while True:
+            try:
+                await get_admission_controller().acquire(lane)
+                return
+            except AdmissionRejected:
+                await asyncio.sleep(settings.admission_retry_after_s)
+
+    async def _run(self, job: dict) -> None:
+        from ..reporting import parse_verdict
+
+        settings = get_settings()
+        lane = classify_claim(job["claim"])
+        admitted = settings.admission_enabled
+        if admitted:
+            await self._admit(lane)
+        started = asyncio.get_running_loop().time()
+        try:
+            report = await self._verify(job["claim"], job["user_id"])
+        except Exception as e:
+            logger.exception("Job %s failed", job["id"])
+            await asyncio.to_thread(self.store.fail, job["id"], job["attempts"], str(e))
+            return
+        finally:
+            if admitted:
+                get_admission_controller().release(lane)
+            METRICS.observe(
+                "job_run_ms", (asyncio.get_running_loop().time() - started) * 1000, lane=lane
+            )
+            tracker = get_memory_tracker()
+            if tracker is not None:
+                await asyncio.to_thread(tracker.after_run)
+        if not report:
+            await asyncio.to_thread(
+                self.store.fail, job["id"], job["attempts"], "Agent produced no report"
+            )
+            return
+        await asyncio.to_thread(
+            self.store.complete, job["id"], job["attempts"], report, parse_verdict(report)
+        )
+
+    async def _verify(self, claim: str, user_id: str) -> str:
+        """Run the agent on ``claim`` in a throwaway session; return the final report."""
+        from google.genai import types
+
+        runner = self._get_runner()
+        sessions = runner.session_service
+        session_id = (await sessions.create_session(app_name=self.app_name, user_id=user_id)).id
+        message = types.Content(role="user", parts=[types.Part(text=claim)])
+        final_text = ""
+        try:
+            with deadline_scope(), profile_scope(session_id):
+                async for event in runner.run_async(
+                    user_id=user_id, session_id=session_id, new_message=message
+                ):
+                    if event.is_final_response() and event.content and event.content.parts:
+                        final_text = "".join(part.text or "" for part in event.content.parts)
+            session = await sessions.get_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+            report = session.state.get(STATE_KEYS.FINAL_REPORT) if session else None
+            return report if isinstance(report, str) and report else final_text
+        finally:
+            await sessions.delete_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+
+
+class WebhookDispatcher:
+    """Delivers finished jobs to their webhooks in batches."""
+
+    def __init__(self, store: Optional[JobStore] = None):
+        self.store = store or get_job_store()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop(), name="webhook-dispatcher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        import httpx
+
+        settings = get_settings()
+        async with httpx.AsyncClient(timeout=settings.webhook_timeout_s) as client:
+            while True:
+                try:
+                    await self.deliver_due(client)
+                except Exception:
+                    logger.exception("Webhook delivery pass failed")
+                await asyncio.sleep(settings.webhook_interval_s)
+
+    async def deliver_due(self, client: Any) -> int:
+        """POST every due delivery, one batch per URL; return how many were sent."""
+        settings = get_settings()
+        deliveries = await asyncio.to_thread(
+            self.store.claim_deliveries,
+            settings.webhook_batch_size,
+            settings.webhook_timeout_s * 2,
+        )
+        batches: dict = defaultdict(list)
+        for delivery in deliveries:
+            batches[delivery["url"]].append(delivery)
+        await asyncio.gather(
+            *(self._post(client, url, batch) for url, batch in batches.items())
+        )
+        return len(deliveries)
+
+    async def _post(self, client: Any, url: str, batch: list) -> None:
+        import httpx
+
+        settings = get_settings()
+        ids = [delivery["id"] for delivery in batch]
+        events: dict = defaultdict(list)
+        for delivery in batch:
+            payload = delivery["payload"]
+            events["watch_updates" if "watch_id" in payload else "jobs"].append(payload)
+        body = json.dumps(events).encode()
+        headers = {"Content-Type": "application/json"}
+        if settings.webhook_secret:
+            headers[SIGNATURE_HEADER] = sign(body, settings.webhook_secret)
+        try:
+            # The host may resolve elsewhere by now; connect to what was checked
+            address = await asyncio.to_thread(check_webhook_url, url)
+            extensions = {}
+            target: Any = url
+            if address is not None:
+                target = httpx.URL(url)
+                headers["Host"] = target.netloc.decode("ascii")
+                if target.scheme == "https":
+                    extensions["sni_hostname"] = target.host
+                target = target.copy_with(host=address)
+            response = await client.post(
+                target, content=body, headers=headers, extensions=extensions
+            )
+            error = None if response.is_success else f"HTTP {response.status_code}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        if error is None:
+            await asyncio.to_thread(self.store.delivered, ids)
+        else:
+            await asyncio.to_thread(
+                self.store.delivery_failed,
+                ids,
+                error,
+                settings.webhook_backoff_s,
+                settings.webhook_max_attempts,
+            )
+
+
+def add_job_routes(app: FastAPI, worker: Optional[JobWorker] = None) -> None:
+    """Add ``/jobs`` endpoints to ``app``; ``worker`` is woken on submission."""
+
+    @app.post("/jobs", status_code=202)
+    async def submit_job(request: JobRequest) -> dict:
+        if request.webhook_url:
+            try:
+                await asyncio.to_thread(check_webhook_url, request.webhook_url)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+        job = await asyncio.to_thread(
+            get_job_store().submit, request.claim, request.user_id, request.webhook_url
+        )
+        if worker is not None:
+            worker.notify()
+        return job
+
+    @app.get("/jobs/{job_id}")
+    async def job_status(job_id: str) -> dict:
+        job = await asyncio.to_thread(get_job_store().get, job_id, False)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown job")
+        return job
+
+    @app.get("/jobs/{job_id}/result")
+    async def job_result(job_id: str) -> dict:
+        job = await asyncio.to_thread(get_job_store().get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Unknown job")
+        return job
+
+    @app.get("/admin/jobs")
+    async def job_stats() -> dict:
+        return await asyncio.to_thread(get_job_store().stats)
+
+
+__all__ = [
+    "JobRequest",
+    "JobWorker",
+    "WebhookDispatcher",
+    "add_job_routes",
+    "check_webhook_url",
+    "sign",
+]
@@ -0,0 +1,82 @@
+"""Multi-worker serving: several ``Runner`` processes behind one front end.
+
+Each worker is a full API server (``serving.app.create_app``) bound to a
+loopback port. Workers share the evidence cache, quota governor and session
+spill file through SQLite files in ``VERIFY_DATA_DIR``; the front end
+(``serving.frontend``) keeps each session on one worker.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+
+import httpx
+
+from ..config import get_settings
+
+WORKER_HOST = "127.0.0.1"
+
+
+def _run_worker(port: int, session_uri: str) -> None:
+    import uvicorn
+
+    from .app import create_app
+
+    uvicorn.run(create_app(session_service_uri=session_uri), host=WORKER_HOST, port=port, log_level="warning")
+
+
+def _wait_until_ready(urls: list, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    pending = list(urls)
+    while pending and time.monotonic() < deadline:
+        for url in list(pending):
+            try:
+                if httpx.get(f"{url}/list-apps", timeout=1.0).status_code == 200:
+                    pending.remove(url)
+            except httpx.HTTPError:
+                pass
+        if pending:
+            time.sleep(0.2)
+    if pending:
+        raise RuntimeError(f"Workers did not become ready: {pending}")
+
+
+def default_session_uri() -> str:
+    """Session URI whose spill file lives in the shared data directory."""
+    directory = get_settings().data_dir
+    os.makedirs(directory, exist_ok=True)
+    return f"bounded://{os.path.join(directory, 'sessions.db')}"
+
+
+def run_multiprocess(workers: int, host: str, port: int, session_uri: str | None = None) -> None:
+    """Start ``workers`` API server processes and the sticky front end.
+
+    Worker ``i`` listens on ``port + 1 + i`` on the loopback interface. Blocks
+    until the front end exits, then terminates the workers.
+    """
+    import uvicorn
+
+    from .frontend import create_frontend_app
+
+    session_uri = session_uri or default_session_uri()
+    context = multiprocessing.get_context("spawn")
+    ports = [port + 1 + i for i in range(workers)]
+    processes = [
+        context.Process(target=_run_worker, args=(p, session_uri), daemon=True) for p in ports
+    ]
+    for process in processes:
+        process.start()
+    urls = [f"http://{WORKER_HOST}:{p}" for p in ports]
+    try:
+        _wait_until_ready(urls)
+        uvicorn.run(create_frontend_app(urls), host=host, port=port)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(timeout=10)
+
+
+__all__ = ["run_multiprocess", "default_session_uri"]
@@ -0,0 +1,189 @@
+"""Startup warm-up and readiness of the API server.
+
+When the server starts, ``Warmup`` builds everything the first claim would
+otherwise build while it waits, and ``GET /ready`` answers ``503`` until
+that has finished:
+
+- the agent graph and its model clients. Agents share one model instance per
+  model (see ``model_tiers.get_model``), and each instance's API client is
+  created on the serving event loop and opens its connection with a model
+  lookup, which costs no tokens
+- pooled connections to GNews, Fact Check, VirusTotal and Perplexity, for
+  the upstreams with a key configured (see ``services.warmup``)
+- the local indexes: URL reputation, top sites, public suffixes, and the
+  evidence cache and quota databases
+
+The server reports ready once warm-up has finished or ``WARMUP_TIMEOUT_S``
+has passed, so a slow or unreachable upstream delays readiness but does not
+keep the instance out of rotation. Each upstream, model and local index is
+reported as it finishes; failures are listed in the report, and parts still
+running at the timeout as ``timed_out``. The clients then open their
+connections on first use, as without warm-up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from ..config import get_settings
+from ..metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+def _local_loaders() -> dict:
+    from ..reputation import get_reputation_index
+    from ..reputation.allowlist import get_top_sites
+    from ..reputation.suffix import get_public_suffixes
+    from ..storage.evidence_cache import get_evidence_cache
+    from ..storage.quota import get_quota_governor
+
+    return {
+        "reputation_index": get_reputation_index,
+        "top_sites": get_top_sites,
+        "public_suffixes": get_public_suffixes,
+        "evidence_cache": get_evidence_cache,
+        "quota": get_quota_governor,
+    }
+
+
+def _warm_local(load) -> dict:
+    start = time.perf_counter()
+    try:
+        load()
+        report = {"status": "ready"}
+    except Exception as e:
+        report = {"status": "failed", "error": str(e)}
+    report["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return report
+
+
+def _vertex_enabled() -> bool:
+    return os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "").lower() in ("1", "true", "yes")
+
+
+def _models(root) -> dict:
+    """Return ``{model name: model instance}`` for the agents under ``root``."""
+    from google.adk.models import Gemini
+
+    models = {}
+    pending = [root]
+    while pending:
+        agent = pending.pop()
+        pending.extend(getattr(agent, "sub_agents", None) or ())
+        model = getattr(agent, "canonical_model", None)
+        if isinstance(model, Gemini):
+            models.setdefault(model.model, model)
+    return models
+
+
+class Warmup:
+    """Runs the warm-up in the background and tracks readiness."""
+
+    def __init__(self):
+        self.status = "pending"
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.upstreams: dict = {}
+        self.models: dict = {}
+        self.local: dict = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("ready", "timed_out")
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="warmup")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        from ..services.warmup import configured_upstreams, warm_upstream
+
+        settings = get_settings()
+        self.status = "warming"
+        self.started = time.time()
+        timeout = settings.warmup_timeout_s
+        # One task per upstream and index, so a slow one is reported by name
+        parts = {
+            ("upstreams", name): asyncio.create_task(asyncio.to_thread(
+                warm_upstream, name, settings.warmup_connections, settings.warmup_probe, timeout
+            ))
+            for name in configured_upstreams()
+        }
+        parts.update({
+            ("local", name): asyncio.create_task(asyncio.to_thread(_warm_local, load))
+            for name, load in _local_loaders().items()
+        })
+        tasks = [*parts.values(), asyncio.create_task(self._warm_models(timeout))]
+        pending: set = set()
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+        finally:
+            # Also on stop(): collect the cancelled tasks so none is left unretrieved
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for (part, name), task in parts.items():
+            report = getattr(self, part)
+            if task in pending:
+                report[name] = {"status": "timed_out"}
+            elif task.exception() is not None:
+                report[name] = {"status": "failed", "error": str(task.exception())}
+            else:
+                report[name] = task.result()
+        for report in self.models.values():
+            if report["status"] == "warming":
+                report["status"] = "timed_out"
+        if pending:
+            self.status = "timed_out"
+            logger.warning("Warm-up did not finish within %.0fs; reporting ready", timeout)
+        else:
+            self.status = "ready"
+        self.finished = time.time()
+        METRICS.observe("warmup_total_ms", (self.finished - self.started) * 1000)
+        logger.info("Warm-up %s in %.0f ms", self.status, (self.finished - self.started) * 1000)
+
+    async def _warm_models(self, timeout: float) -> None:
+        from ..agent import get_root_agent
+
+        # Builds the agent graph, importing ADK and the tools
+        root = await asyncio.to_thread(get_root_agent)
+        for name, model in _models(root).items():
+            start = time.perf_counter()
+            self.models[name] = {"status": "warming"}
+            if not (os.getenv("GOOGLE_API_KEY") or _vertex_enabled()):
+                self.models[name]["status"] = "skipped"
+                continue
+            try:
+                # The client is cached per event loop: create it on this one
+                client = model.api_client
+                await asyncio.wait_for(client.aio.models.get(model=name), timeout)
+                self.models[name]["status"] = "ready"
+            except Exception as e:
+                self.models[name].update(status="failed", error=str(e))
+            self.models[name]["ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "status": self.status,
+            "seconds": round((self.finished or time.time()) - self.started, 3)
+            if self.started is not None
+            else None,
+            "upstreams": self.upstreams,
+            "models": self.models,
+            "local": self.local,
+        }
+
+
+__all__ = ["Warmup"]
@@ -0,0 +1,203 @@
+"""Claim watchlist endpoints and the worker that polls watched claims.
+
+``POST /watches`` starts watching a claim. The watch worker polls due
+watches (``services.watch.poll_watch``) and, only when the poll found a
+material change, reruns the news merger alone on the updated evidence. The
+new report is stored as an update event: clients read
+``GET /watches/{id}/updates?since=<version>``, and watches with a
+``webhook_url`` are also delivered through the job webhook outbox.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+from ..config import STATE_KEYS, get_settings
+from ..metrics import METRICS
+from ..services.watch import WATCH_LEASE_S, is_material, merger_state, poll_watch
+from ..storage.jobs import get_job_store
+from ..storage.watchlist import Watchlist, get_watchlist
+from .jobs import check_webhook_url
+
+logger = logging.getLogger(__name__)
+
+# How often an idle worker looks for due watches added by other processes
+DUE_CHECK_S = 10.0
+
+
+class WatchRequest(BaseModel):
+    """Body of ``POST /watches``."""
+
+    claim: str = Field(min_length=1)
+    user_id: str = "watchlist"
+    interval_s: Optional[float] = None
+    webhook_url: Optional[str] = None
+
+
+class WatchWorker:
+    """Polls due watches in this process and reruns the news merger on changes."""
+
+    def __init__(self, app_name: str, store: Optional[Watchlist] = None):
+        self.app_name = app_name
+        self.store = store or get_watchlist()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._runner = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop(), name="watch-worker")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def notify(self) -> None:
+        """Poll a newly added watch without waiting for the next check."""
+        self._wakeup.set()
+
+    def _get_runner(self):
+        if self._runner is None:
+            from google.adk.runners import Runner
+
+            from ..lanes.news_lane import create_news_merger
+            from ..storage.session_store import create_session_service
+
+            self._runner = Runner(
+                app_name=self.app_name,
+                agent=create_news_merger(),
+                session_service=create_session_service(),
+            )
+        return self._runner
+
+    async def _loop(self) -> None:
+        while True:
+            watch = await asyncio.to_thread(self.store.claim_due, WATCH_LEASE_S)
+            if watch is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), DUE_CHECK_S)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.poll(watch)
+            except Exception as e:
+                logger.exception("Polling watch %s failed", watch["id"])
+                await asyncio.to_thread(self.store.poll_failed, watch["id"], str(e))
+
+    async def poll(self, watch: dict) -> Optional[int]:
+        """Poll one watch; return the new update's version, or None if nothing changed."""
+        result = await asyncio.to_thread(poll_watch, watch)
+        version = None
+        if is_material(result.changes):
+            summary = await self._rerun_merger(watch, result.evidence, result.changes)
+            version = await asyncio.to_thread(
+                self.store.add_update, watch["id"], result.changes, summary
+            )
+            METRICS.increment("watch_updates")
+            if watch["webhook_url"]:
+                await asyncio.to_thread(
+                    get_job_store().enqueue_webhook,
+                    f"watch:{watch['id']}",
+                    watch["webhook_url"],
+                    {
+                        "watch_id": watch["id"],
+                        "version": version,
+                        "claim": watch["claim"],
+                        "changes": result.changes,
+                        "summary": summary,
+                    },
+                )
+        await asyncio.to_thread(
+            self.store.save_poll,
+            watch["id"],
+            result.evidence,
+            result.news_since,
+            result.reviews_since,
+            "; ".join(f"{name}: {error}" for name, error in result.changes.get("errors", {}).items())
+            or None,
+        )
+        return version
+
+    async def _rerun_merger(self, watch: dict, evidence: dict, changes: dict) -> Optional[str]:
+        """Run only the news merger on the watch's evidence; return its report."""
+        from google.genai import types
+
+        runner = self._get_runner()
+        sessions = runner.session_service
+        user_id = watch["user_id"]
+        session_id = (
+            await sessions.create_session(
+                app_name=self.app_name,
+                user_id=user_id,
+                state=merger_state(watch["claim"], evidence, changes),
+            )
+        ).id
+        message = types.Content(role="user", parts=[types.Part(text=watch["claim"])])
+        try:
+            async for _event in runner.run_async(
+                user_id=user_id, session_id=session_id, new_message=message
+            ):
+                pass
+            session = await sessions.get_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+            return session.state.get(STATE_KEYS.NEWS_SUMMARY) if session else None
+        finally:
+            await sessions.delete_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+
+
+def add_watch_routes(app: FastAPI, worker: Optional[WatchWorker] = None) -> None:
+    """Add ``/watches`` endpoints to ``app``; ``worker`` is woken on new watches."""
+
+    @app.post("/watches", status_code=201)
+    async def add_watch(request: WatchRequest) -> dict:
+        settings = get_settings()
+        if request.webhook_url:
+            try:
+                await asyncio.to_thread(check_webhook_url, request.webhook_url)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+        interval_s = max(request.interval_s or settings.watch_interval_s, settings.watch_min_interval_s)
+        watch = await asyncio.to_thread(
+            get_watchlist().add, request.claim, request.user_id, interval_s, request.webhook_url
+        )
+        if worker is not None:
+            worker.notify()
+        return watch
+
+    @app.get("/watches")
+    async def list_watches(user_id: Optional[str] = None) -> list:
+        return await asyncio.to_thread(get_watchlist().watches, user_id)
+
+    @app.get("/watches/{watch_id}")
+    async def get_watch(watch_id: str) -> dict:
+        watch = await asyncio.to_thread(get_watchlist().get, watch_id)
+        if watch is None:
+            raise HTTPException(status_code=404, detail="Unknown watch")
+        return watch
+
+    @app.get("/watches/{watch_id}/updates")
+    async def watch_updates(watch_id: str, since: int = 0) -> dict:
+        watchlist = get_watchlist()
+        if await asyncio.to_thread(watchlist.get, watch_id) is None:
+            raise HTTPException(status_code=404, detail="Unknown watch")
+        return {"updates": await asyncio.to_thread(watchlist.updates, watch_id, since)}
+
+    @app.delete("/watches/{watch_id}")
+    async def remove_watch(watch_id: str) -> dict:
+        if not await asyncio.to_thread(get_watchlist().remove, watch_id):
+            raise HTTPException(status_code=404, detail="Unknown or inactive watch")
+        return {"id": watch_id, "active": False}
+
+
+__all__ = ["WatchRequest", "WatchWorker", "add_watch_routes"]
@@ -0,0 +1,18 @@
+"""Local storage backends (sessions, caches, indexes).
+
+Modules that depend on ADK are exposed lazily so that tools and services can
+import the lightweight stores without pulling in ``google.adk``.
+"""
+
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("BoundedSessionService", "create_session_service"):
+        from . import session_store
+
+        return getattr(session_store, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["BoundedSessionService", "create_session_service"]
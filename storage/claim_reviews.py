@@ -0,0 +1,343 @@
+"""Local mirror of published fact-checks (ClaimReview) with full-text search.
+
+Every review returned by the Fact Check Tools API is written through to a
+SQLite table, and ClaimReview dump files can be bulk-loaded alongside. An
+external-content FTS5 index over the claim text and review title (Porter
+stemming; Indic vowel signs kept as token characters), kept in step by
+triggers, answers "has this been fact-checked?" locally in well under a
+millisecond, so ``check_factcheck_api`` only calls the API when the mirror
+holds no recent review of the same claim.
+
+Dump files may hold:
+
+- schema.org ``ClaimReview`` JSON-LD, alone, in lists, or in data feeds
+  (``dataFeedElement``/``@graph``)
+- raw Fact Check API responses (``{"claims": [...]}``)
+- normalized reviews as returned by ``search_fact_checks``
+
+They can be ``.json``, ``.jsonl``/``.ndjson``, optionally gzipped. Sync is
+incremental: unchanged files are skipped, and growing JSONL files resume
+from the last ingested byte offset.
+
+Usage:
+    python -m news_info_verification_v2.storage.claim_reviews sync [DIR]
+    python -m news_info_verification_v2.storage.claim_reviews ingest FILE...
+    python -m news_info_verification_v2.storage.claim_reviews search "claim text"
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ..config import get_settings
+from ..metrics import METRICS
+from .sqlite import SqliteStore, data_path
+
+_FIELDS = ("url", "claim", "claimant", "rating", "source", "title", "language", "review_date")
+_DUMP_SUFFIXES = (".json", ".jsonl", ".ndjson")
+# Containers that hold ClaimReview items in feeds and API responses
+_CONTAINER_KEYS = ("claims", "dataFeedElement", "item", "@graph", "itemListElement")
+# FTS5 OR-query size cap; long claims keep their first terms
+MAX_MATCH_TERMS = 32
+
+
+def _name(value) -> str:
+    if isinstance(value, dict):
+        return value.get("name", "") or ""
+    if isinstance(value, list) and value:
+        return _name(value[0])
+    return value if isinstance(value, str) else ""
+
+
+def _from_schema_org(item: dict) -> dict:
+    rating = item.get("reviewRating") or {}
+    if isinstance(rating, list):
+        rating = rating[0] if rating else {}
+    reviewed = item.get("itemReviewed") or {}
+    return {
+        "url": item.get("url", ""),
+        "claim": item.get("claimReviewed", ""),
+        "claimant": _name(reviewed.get("author")) if isinstance(reviewed, dict) else "",
+        "rating": rating.get("alternateName") or _name(rating) or "",
+        "source": _name(item.get("author")) or _name(item.get("publisher")),
+        "title": item.get("name") or item.get("headline") or "",
+        "language": _name(item.get("inLanguage")) or item.get("inLanguage", "") or "",
+        "review_date": item.get("datePublished", "") or "",
+    }
+
+
+def iter_claim_reviews(data) -> Iterator[dict]:
+    """Yield normalized reviews from any supported JSON structure."""
+    if isinstance(data, list):
+        for item in data:
+            yield from iter_claim_reviews(item)
+        return
+    if not isinstance(data, dict):
+        return
+    if "claimReview" in data:  # Fact Check API claim
+        for review in data["claimReview"]:
+            yield {
+                "url": review.get("url", ""),
+                "claim": data.get("text", ""),
+                "claimant": data.get("claimant", ""),
+                "rating": review.get("textualRating", ""),
+                "source": _name(review.get("publisher")),
+                "title": review.get("title", ""),
+                "language": review.get("languageCode", ""),
+                "review_date": review.get("reviewDate", ""),
+            }
+    elif data.get("@type") == "ClaimReview" or "claimReviewed" in data:
+        yield _from_schema_org(data)
+    elif "claim" in data and "rating" in data and "url" in data:  # already normalized
+        yield {field: data.get(field) or "" for field in _FIELDS}
+    else:
+        for key in _CONTAINER_KEYS:
+            if key in data:
+                yield from iter_claim_reviews(data[key])
+
+
+def _open_text(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+class ClaimReviewMirror(SqliteStore):
+    """SQLite table of fact-check reviews keyed by review URL, with an FTS5 index."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS claim_reviews (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            claim TEXT NOT NULL,
+            claimant TEXT,
+            rating TEXT,
+            source TEXT,
+            title TEXT,
+            language TEXT,
+            review_date TEXT,
+            updated_at REAL NOT NULL
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS claim_reviews_fts USING fts5(
+            claim, title,
+            content='claim_reviews', content_rowid='id',
+            tokenize="porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+        );
+        CREATE TRIGGER IF NOT EXISTS claim_reviews_ai AFTER INSERT ON claim_reviews BEGIN
+            INSERT INTO claim_reviews_fts (rowid, claim, title) VALUES (new.id, new.claim, new.title);
+        END;
+        CREATE TRIGGER IF NOT EXISTS claim_reviews_ad AFTER DELETE ON claim_reviews BEGIN
+            INSERT INTO claim_reviews_fts (claim_reviews_fts, rowid, claim, title)
+            VALUES ('delete', old.id, old.claim, old.title);
+        END;
+        CREATE TRIGGER IF NOT EXISTS claim_reviews_au AFTER UPDATE ON claim_reviews BEGIN
+            INSERT INTO claim_reviews_fts (claim_reviews_fts, rowid, claim, title)
+            VALUES ('delete', old.id, old.claim, old.title);
+            INSERT INTO claim_reviews_fts (rowid, claim, title) VALUES (new.id, new.claim, new.title);
+        END;
+        CREATE TABLE IF NOT EXISTS claim_lookups (
+            claim_key TEXT PRIMARY KEY,
+            checked_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS claim_review_sync (
+            source TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            records INTEGER NOT NULL,
+            synced_at REAL NOT NULL
+        );
+    """
+
+    def upsert(self, reviews: Iterable[dict]) -> int:
+        """Insert or refresh reviews (matched by URL); return how many were written."""
+        now = time.time()
+        rows = [
+            tuple(review.get(field) or "" for field in _FIELDS) + (now,)
+            for review in reviews
+            if review.get("url") and review.get("claim")
+        ]
+        if not rows:
+            return 0
+        # Unchanged reviews are left alone so the FTS index is not rewritten
+        self.executemany(
+            f"INSERT INTO claim_reviews ({', '.join(_FIELDS)}, updated_at) "
+            f"VALUES ({', '.join('?' * (len(_FIELDS) + 1))}) "
+            "ON CONFLICT(url) DO UPDATE SET "
+            + ", ".join(f"{field}=excluded.{field}" for field in _FIELDS[1:])
+            + ", updated_at=excluded.updated_at WHERE "
+            + " OR ".join(f"{field} IS NOT excluded.{field}" for field in _FIELDS[1:]),
+            rows,
+        )
+        return len(rows)
+
+    def search(self, text: str, limit: int = 30, language: Optional[str] = None) -> list:
+        """Return reviews matching any term of ``text``, best BM25 match first."""
+        from ..text.ranking import terms
+
+        words = list(dict.fromkeys(terms(text, stem=False)))[:MAX_MATCH_TERMS]
+        if not words:
+            return []
+        query = " OR ".join(f'"{word}"' for word in words)
+        sql = (
+            f"SELECT {', '.join('r.' + field for field in _FIELDS)} "
+            "FROM claim_reviews_fts JOIN claim_reviews r ON r.id = claim_reviews_fts.rowid "
+            "WHERE claim_reviews_fts MATCH ?"
+        )
+        params: tuple = (query,)
+        if language:
+            sql += " AND r.language = ?"
+            params += (language,)
+        sql += " ORDER BY bm25(claim_reviews_fts, 2.0, 1.0) LIMIT ?"
+        rows = self.execute(sql, params + (limit,))
+        return [dict(zip(_FIELDS, row)) for row in rows]
+
+    def record_lookup(self, text: str) -> None:
+        """Note that the Fact Check API was just searched for the claim ``text``."""
+        from ..text.ranking import claim_key
+
+        self.execute(
+            "INSERT INTO claim_lookups VALUES (?, ?) "
+            "ON CONFLICT(claim_key) DO UPDATE SET checked_at=excluded.checked_at",
+            (claim_key(text), time.time()),
+        )
+
+    def last_checked(self, text: str, urls: Iterable[str] = ()) -> Optional[float]:
+        """Return when the claim ``text`` or the reviews at ``urls`` were last fetched.
+
+        That is the later of the last API search for the same claim (see
+        ``record_lookup``) and the last time one of the reviews was written;
+        None when neither happened.
+        """
+        from ..text.ranking import claim_key
+
+        urls = list(urls)
+        times = [
+            row[0]
+            for row in self.execute(
+                "SELECT checked_at FROM claim_lookups WHERE claim_key = ?", (claim_key(text),)
+            )
+        ]
+        if urls:
+            times += [
+                row[0]
+                for row in self.execute(
+                    f"SELECT MAX(updated_at) FROM claim_reviews WHERE url IN ({', '.join('?' * len(urls))})",
+                    tuple(urls),
+                )
+                if row[0] is not None
+            ]
+        return max(times) if times else None
+
+    def ingest_file(self, path: str, force: bool = False) -> int:
+        """Load a dump file if it changed since the last sync; return reviews written."""
+        stat = os.stat(path)
+        fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
+        source = os.path.abspath(path)
+        rows = self.execute(
+            "SELECT fingerprint, offset, records FROM claim_review_sync WHERE source=?", (source,)
+        )
+        previous = rows[0] if rows and not force else None
+        if previous is not None and previous[0] == fingerprint:
+            return 0
+
+        name = path.removesuffix(".gz")
+        written = 0
+        offset = resume = 0
+        if name.endswith((".jsonl", ".ndjson")):
+            # Append-only feeds resume where the last sync stopped
+            if previous and not path.endswith(".gz") and previous[1] <= stat.st_size:
+                resume = previous[1]
+            with _open_text(path) as handle:
+                if resume:
+                    handle.seek(resume)
+                batch = []
+                while True:
+                    line = handle.readline()
+                    if not line:
+                        break
+                    if line.strip():
+                        batch.extend(iter_claim_reviews(json.loads(line)))
+                    if len(batch) >= 1000:
+                        written += self.upsert(batch)
+                        batch = []
+                written += self.upsert(batch)
+                offset = handle.tell() if not path.endswith(".gz") else 0
+        else:
+            with _open_text(path) as handle:
+                written = self.upsert(iter_claim_reviews(json.load(handle)))
+
+        records = written + (previous[2] if resume else 0)
+        self.execute(
+            "INSERT OR REPLACE INTO claim_review_sync VALUES (?, ?, ?, ?, ?)",
+            (source, fingerprint, offset, records, time.time()),
+        )
+        METRICS.increment("claim_review_ingested", written)
+        return written
+
+    def sync_dir(self, directory: str) -> dict:
+        """Ingest every changed dump file in ``directory``; return per-file counts."""
+        counts = {}
+        if not os.path.isdir(directory):
+            return counts
+        for path in sorted(Path(directory).iterdir()):
+            if path.is_file() and path.name.removesuffix(".gz").endswith(_DUMP_SUFFIXES):
+                counts[path.name] = self.ingest_file(str(path))
+        return counts
+
+    def count(self) -> int:
+        return self.execute("SELECT COUNT(*) FROM claim_reviews")[0][0]
+
+
+def default_dumps_dir() -> str:
+    return get_settings().claim_review_dumps_dir or data_path("claim_review_dumps")
+
+
+@lru_cache(maxsize=1)
+def get_claim_review_mirror() -> ClaimReviewMirror:
+    """Return the process-wide mirror (``<data_dir>/claim_reviews.db``)."""
+    return ClaimReviewMirror(data_path("claim_reviews.db"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the local fact-check mirror")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sync = commands.add_parser("sync", help="Ingest changed dump files from a directory")
+    sync.add_argument("directory", nargs="?", default=None)
+    ingest = commands.add_parser("ingest", help="Ingest dump files")
+    ingest.add_argument("files", nargs="+")
+    ingest.add_argument("--force", action="store_true", help="Re-read unchanged files")
+    search = commands.add_parser("search", help="Search the mirror")
+    search.add_argument("text")
+    search.add_argument("--limit", type=int, default=10)
+    commands.add_parser("stats", help="Show the number of mirrored reviews")
+    args = parser.parse_args()
+
+    mirror = get_claim_review_mirror()
+    if args.command == "sync":
+        print(json.dumps(mirror.sync_dir(args.directory or default_dumps_dir()), indent=2))
+    elif args.command == "ingest":
+        for path in args.files:
+            print(f"{path}\t{mirror.ingest_file(path, force=args.force)}")
+    elif args.command == "search":
+        started = time.perf_counter()
+        results = mirror.search(args.text, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for review in results:
+            print(f"{review['rating']}\t{review['source']}\t{review['claim'][:80]}\t{review['url']}")
+        print(f"{len(results)} result(s) in {elapsed_ms:.2f} ms")
+    else:
+        print(json.dumps({"reviews": mirror.count(), "path": mirror.path}, indent=2))
+
+
+__all__ = ["ClaimReviewMirror", "get_claim_review_mirror", "iter_claim_reviews"]
+
+
+if __name__ == "__main__":
+    main()
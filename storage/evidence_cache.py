@@ -0,0 +1,92 @@
+"""Shared evidence cache for upstream API results.
+
+Results from GNews, Fact Check Tools, VirusTotal and Perplexity are cached in a
+SQLite file under the shared data directory, so every worker process on a host
+reuses the same answers. Entries expire per namespace (see ``DEFAULT_TTLS``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from functools import lru_cache
+from typing import Any, Final, Optional
+
+from ..config import get_settings
+from ..metrics import METRICS
+from .sqlite import SqliteStore, data_path
+
+# Seconds an entry stays valid, by namespace
+DEFAULT_TTLS: Final[dict[str, int]] = {
+    "gnews": 30 * 60,
+    "factcheck": 6 * 3600,
+    "virustotal": 24 * 3600,
+    "perplexity": 60 * 60,
+}
+
+
+def cache_key(*parts: Any) -> str:
+    """Build a compact, stable key from request parameters."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class EvidenceCache(SqliteStore):
+    """Namespaced key/value cache with per-entry expiry."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS evidence (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (namespace, key)
+        );
+        CREATE INDEX IF NOT EXISTS evidence_expiry ON evidence (expires_at);
+    """
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired."""
+        rows = self.execute(
+            "SELECT value FROM evidence WHERE namespace=? AND key=? AND expires_at>?",
+            (namespace, key, time.time()),
+        )
+        METRICS.increment("evidence_cache", namespace=namespace, result="hit" if rows else "miss")
+        return json.loads(rows[0][0]) if rows else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value."""
+        ttl = DEFAULT_TTLS.get(namespace, 3600) if ttl is None else ttl
+        self.execute(
+            "INSERT OR REPLACE INTO evidence VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), time.time() + ttl),
+        )
+
+    def purge_expired(self) -> int:
+        """Delete expired entries; return how many were removed."""
+        rows = self.execute(
+            "DELETE FROM evidence WHERE expires_at<=? RETURNING 1", (time.time(),)
+        )
+        return len(rows)
+
+
+class _NullCache:
+    """Stand-in used when the evidence cache is disabled."""
+
+    def get(self, namespace: str, key: str) -> None:
+        return None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_evidence_cache() -> EvidenceCache:
+    """Return the process-wide evidence cache (a no-op when EVIDENCE_CACHE=0)."""
+    if not get_settings().evidence_cache_enabled:
+        return _NullCache()
+    return EvidenceCache(data_path("evidence_cache.db"))
+
+
+__all__ = ["EvidenceCache", "DEFAULT_TTLS", "cache_key", "get_evidence_cache"]
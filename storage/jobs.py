@@ -0,0 +1,317 @@
+"""Persistent verification jobs and their pending webhook deliveries.
+
+Jobs submitted through ``POST /jobs`` (see ``serving.jobs``) are rows in a
+SQLite table shared by every server process on the host, so a job survives
+a restart and any worker process can pick it up. A worker claims the oldest
+queued job with a lease and renews it while the job waits and runs; if the
+process dies mid-run, the lease expires and the job is claimed again, up to
+``jobs_max_attempts`` times. Each claim is identified by the job's attempt
+number, and only the current claim can renew, finish or requeue the job, so
+a run that lost its lease cannot finish the job a second time.
+
+When a job with a webhook finishes, the delivery is queued in the same
+transaction; watch updates (``services.watch``) use the same outbox.
+Deliveries are handed out in batches and retried with exponential backoff
+until ``webhook_max_attempts``.
+
+Usage:
+    python -m news_info_verification_v2.storage.jobs stats
+    python -m news_info_verification_v2.storage.jobs show JOB_ID
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from functools import lru_cache
+from typing import Optional
+
+from ..metrics import METRICS
+from .sqlite import SqliteStore, data_path
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+_JOB_FIELDS = (
+    "id",
+    "status",
+    "claim",
+    "user_id",
+    "webhook_url",
+    "attempts",
+    "created_at",
+    "started_at",
+    "finished_at",
+    "verdict",
+    "report",
+    "error",
+)
+
+
+def _job(row: tuple, include_report: bool = True) -> dict:
+    job = dict(zip(_JOB_FIELDS, row))
+    job["verdict"] = json.loads(job["verdict"]) if job["verdict"] else None
+    if not include_report:
+        job.pop("report")
+    return job
+
+
+def _enqueue(conn, ref_id: str, url: str, payload: dict) -> None:
+    conn.execute(
+        "INSERT INTO webhook_deliveries (job_id, url, payload, next_attempt) VALUES (?, ?, ?, ?)",
+        (ref_id, url, json.dumps(payload), time.time()),
+    )
+
+
+class JobStore(SqliteStore):
+    """Job queue with leases, results and a webhook outbox."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            claim TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            webhook_url TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            verdict TEXT,
+            report TEXT,
+            error TEXT,
+            lease_until REAL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, created_at);
+        CREATE TABLE IF NOT EXISTS webhook_deliveries (
+            id INTEGER PRIMARY KEY,
+            job_id TEXT NOT NULL,
+            url TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL,
+            last_error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS webhook_deliveries_due
+            ON webhook_deliveries (status, next_attempt);
+    """
+
+    def submit(self, claim: str, user_id: str, webhook_url: Optional[str] = None) -> dict:
+        """Queue a claim for verification and return the new job."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self.execute(
+            "INSERT INTO jobs (id, status, claim, user_id, webhook_url, created_at) "
+            "VALUES (?, 'queued', ?, ?, ?, ?)",
+            (job_id, claim, user_id, webhook_url or None, now),
+        )
+        METRICS.increment("jobs_submitted")
+        return self.get(job_id, include_report=False)
+
+    def get(self, job_id: str, include_report: bool = True) -> Optional[dict]:
+        rows = self.execute(f"SELECT {', '.join(_JOB_FIELDS)} FROM jobs WHERE id=?", (job_id,))
+        return _job(rows[0], include_report) if rows else None
+
+    def claim_next(self, lease_s: float, max_attempts: int) -> Optional[dict]:
+        """Lease the oldest runnable job: queued, or running with an expired lease.
+
+        Jobs whose lease expired after ``max_attempts`` runs are failed instead.
+
+        Returns:
+            The claimed job, or None if there is nothing to run
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            exhausted = conn.execute(
+                "SELECT id, attempts FROM jobs "
+                "WHERE status='running' AND lease_until < ? AND attempts >= ?",
+                (now, max_attempts),
+            ).fetchall()
+            for job_id, attempt in exhausted:
+                self._finish(
+                    conn, job_id, "failed", attempt, error="Job did not complete (worker lost)"
+                )
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status='queued' OR (status='running' AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status='running', attempts=attempts+1, started_at=?, lease_until=? "
+                "WHERE id=?",
+                (now, now + lease_s, row[0]),
+            )
+            job = conn.execute(
+                f"SELECT {', '.join(_JOB_FIELDS)} FROM jobs WHERE id=?", (row[0],)
+            ).fetchone()
+        return _job(job)
+
+    def renew(self, job_id: str, attempt: int, lease_s: float) -> bool:
+        """Extend the lease of claim ``attempt``; False if the job is no longer its own."""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until=? WHERE id=? AND status='running' AND attempts=?",
+                (time.time() + lease_s, job_id, attempt),
+            )
+        return cursor.rowcount > 0
+
+    def _finish(
+        self,
+        conn,
+        job_id: str,
+        status: str,
+        attempt: int,
+        report: Optional[str] = None,
+        verdict: Optional[dict] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        now = time.time()
+        cursor = conn.execute(
+            "UPDATE jobs SET status=?, finished_at=?, report=?, verdict=?, error=?, lease_until=NULL "
+            "WHERE id=? AND status='running' AND attempts=?",
+            (status, now, report, json.dumps(verdict) if verdict else None, error, job_id, attempt),
+        )
+        if cursor.rowcount == 0:
+            METRICS.increment("jobs_finish_stale")
+            return False
+        row = conn.execute(
+            f"SELECT {', '.join(_JOB_FIELDS)} FROM jobs WHERE id=?", (job_id,)
+        ).fetchone()
+        job = _job(row)
+        if job["webhook_url"]:
+            payload = {
+                "job_id": job_id,
+                "status": status,
+                "claim": job["claim"],
+                "verdict": verdict,
+                "report": report,
+                "error": error,
+                "finished_at": now,
+            }
+            _enqueue(conn, job_id, job["webhook_url"], payload)
+        METRICS.increment("jobs_finished", status=status)
+        return True
+
+    def complete(self, job_id: str, attempt: int, report: str, verdict: dict) -> bool:
+        """Store a job's final report and verdict and queue its webhook.
+
+        Returns:
+            False if claim ``attempt`` no longer holds the job (nothing is stored)
+        """
+        with self.transaction() as conn:
+            return self._finish(conn, job_id, "succeeded", attempt, report=report, verdict=verdict)
+
+    def fail(self, job_id: str, attempt: int, error: str) -> bool:
+        """Mark a job failed and queue its webhook; False like ``complete``."""
+        with self.transaction() as conn:
+            return self._finish(conn, job_id, "failed", attempt, error=error)
+
+    def enqueue_webhook(self, ref_id: str, url: str, payload: dict) -> None:
+        """Queue a webhook delivery for another event source (e.g. a watch update)."""
+        with self.transaction() as conn:
+            _enqueue(conn, ref_id, url, payload)
+
+    def requeue(self, job_id: str, attempt: int) -> None:
+        """Return a job claimed as ``attempt`` to the queue (e.g. on shutdown)."""
+        self.execute(
+            "UPDATE jobs SET status='queued', lease_until=NULL "
+            "WHERE id=? AND status='running' AND attempts=?",
+            (job_id, attempt),
+        )
+
+    def claim_deliveries(self, limit: int, lease_s: float) -> list:
+        """Lease up to ``limit`` due webhook deliveries.
+
+        Returns:
+            Dicts with id, url, payload (decoded) and attempts, oldest first
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, url, payload, attempts FROM webhook_deliveries "
+                "WHERE status='pending' AND next_attempt <= ? ORDER BY next_attempt LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE webhook_deliveries SET next_attempt=? WHERE id=?",
+                [(now + lease_s, row[0]) for row in rows],
+            )
+        return [
+            {"id": row[0], "url": row[1], "payload": json.loads(row[2]), "attempts": row[3]}
+            for row in rows
+        ]
+
+    def delivered(self, delivery_ids: list) -> None:
+        self.executemany(
+            "UPDATE webhook_deliveries SET status='delivered', attempts=attempts+1, last_error=NULL "
+            "WHERE id=?",
+            [(delivery_id,) for delivery_id in delivery_ids],
+        )
+        METRICS.increment("webhook_deliveries", len(delivery_ids), result="delivered")
+
+    def delivery_failed(
+        self, delivery_ids: list, error: str, backoff_s: float, max_attempts: int
+    ) -> None:
+        """Schedule a retry after ``backoff_s * 2 ** attempts``, or give up."""
+        now = time.time()
+        with self.transaction() as conn:
+            for delivery_id in delivery_ids:
+                (attempts,) = conn.execute(
+                    "SELECT attempts + 1 FROM webhook_deliveries WHERE id=?", (delivery_id,)
+                ).fetchone()
+                conn.execute(
+                    "UPDATE webhook_deliveries SET status=?, attempts=?, next_attempt=?, last_error=? "
+                    "WHERE id=?",
+                    (
+                        "failed" if attempts >= max_attempts else "pending",
+                        attempts,
+                        now + backoff_s * 2 ** (attempts - 1),
+                        error,
+                        delivery_id,
+                    ),
+                )
+        METRICS.increment("webhook_deliveries", len(delivery_ids), result="failed")
+
+    def stats(self) -> dict:
+        jobs = dict(self.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        deliveries = dict(
+            self.execute("SELECT status, COUNT(*) FROM webhook_deliveries GROUP BY status")
+        )
+        return {
+            "jobs": {status: jobs.get(status, 0) for status in JOB_STATUSES},
+            "webhooks": {
+                status: deliveries.get(status, 0) for status in ("pending", "delivered", "failed")
+            },
+        }
+
+
+@lru_cache(maxsize=1)
+def get_job_store() -> JobStore:
+    """Return the process-wide job store (``<data_dir>/jobs.db``)."""
+    return JobStore(data_path("jobs.db"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect verification jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Count jobs and webhook deliveries by status")
+    show = commands.add_parser("show", help="Print one job")
+    show.add_argument("job_id")
+    args = parser.parse_args()
+
+    store = get_job_store()
+    if args.command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+    else:
+        print(json.dumps(store.get(args.job_id), indent=2))
+
+
+__all__ = ["JOB_STATUSES", "JobStore", "get_job_store"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""Append-only local archive of news articles returned by GNews.
+
+Every article ``fetch_news_evidence`` retrieves is appended to a SQLite table
+with an FTS5 index over title and description and an index on publication
+time, and every GNews search is recorded with its fetch time. Before
+calling GNews the news tool asks the archive what it already holds for the
+claim (``coverage``):
+
+- the same searches (normalized query per language, same date window) ran
+  recently (or after a past date window closed), and enough relevant
+  articles are archived: GNews is not called at all
+- the same searches ran earlier: GNews is asked only for articles published
+  after the newest relevant archived one
+- otherwise the full upstream search runs as before, so a new claim is never
+  answered from articles fetched for other claims that share a few words
+
+During an ongoing news event most claims about it are answered locally, so
+GNews calls and quota are spent only on new topics and new time ranges.
+
+Usage:
+    python -m news_info_verification_v2.storage.news_archive search "claim text"
+    python -m news_info_verification_v2.storage.news_archive stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional
+
+from ..config import get_settings
+from ..metrics import METRICS
+from .claim_reviews import MAX_MATCH_TERMS
+from .sqlite import SqliteStore, data_path
+
+_FIELDS = ("url", "title", "description", "source", "published_date")
+# Articles indexed late still count toward a past window for a day after it
+WINDOW_SETTLE_S = 24 * 3600
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Return the epoch seconds of an ISO-8601 date (GNews ``publishedAt``)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _query_key(query: str) -> str:
+    from ..text.ranking import claim_key
+
+    return claim_key(query)
+
+
+def _window(from_date: Optional[str], to_date: Optional[str]) -> str:
+    return f"{from_date or ''}/{to_date or ''}"
+
+
+def _published_date(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class ArchiveCoverage(NamedTuple):
+    """What the archive holds for a claim (see ``NewsArchive.coverage``)."""
+
+    articles: list
+    complete: bool
+    from_date: Optional[str]
+
+
+class NewsArchive(SqliteStore):
+    """Articles keyed by URL; rows are never rewritten, only their fetch time."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS news_articles (
+            id INTEGER PRIMARY KEY,
+            url TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            description TEXT,
+            source TEXT,
+            published_date TEXT,
+            published_ts REAL,
+            language TEXT,
+            first_fetched REAL NOT NULL,
+            last_fetched REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS news_articles_published ON news_articles (published_ts);
+        CREATE VIRTUAL TABLE IF NOT EXISTS news_articles_fts USING fts5(
+            title, description,
+            content='news_articles', content_rowid='id',
+            tokenize="porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+        );
+        CREATE TRIGGER IF NOT EXISTS news_articles_ai AFTER INSERT ON news_articles BEGIN
+            INSERT INTO news_articles_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END;
+        CREATE TABLE IF NOT EXISTS news_searches (
+            language TEXT NOT NULL,
+            query_key TEXT NOT NULL,
+            date_window TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            PRIMARY KEY (language, query_key, date_window)
+        );
+    """
+
+    def append(self, articles: Iterable[dict], language: Optional[str] = None) -> int:
+        """Archive new articles and refresh the fetch time of known ones.
+
+        Returns:
+            Number of articles written or refreshed
+        """
+        now = time.time()
+        rows = [
+            tuple(article.get(field) or "" for field in _FIELDS)
+            + (parse_timestamp(article.get("published_date")), language or "", now, now)
+            for article in articles
+            if article.get("url") and article.get("title")
+        ]
+        if not rows:
+            return 0
+        self.executemany(
+            f"INSERT INTO news_articles ({', '.join(_FIELDS)}, published_ts, language, "
+            "first_fetched, last_fetched) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET last_fetched=excluded.last_fetched",
+            rows,
+        )
+        METRICS.increment("news_archive_appended", len(rows))
+        return len(rows)
+
+    def record_search(
+        self,
+        query: str,
+        language: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+    ) -> None:
+        """Note that GNews was just searched for ``query`` in the claim's date window."""
+        self.execute(
+            "INSERT INTO news_searches VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(language, query_key, date_window) DO UPDATE SET fetched_at=excluded.fetched_at",
+            (language or "", _query_key(query), _window(from_date, to_date), time.time()),
+        )
+
+    def last_searched(
+        self,
+        queries: dict,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+    ) -> Optional[float]:
+        """Return when all of ``{language: query}`` were last searched, or None.
+
+        That is the oldest of the latest searches, since each must be covered.
+        """
+        window = _window(from_date, to_date)
+        times = []
+        for language, query in queries.items():
+            rows = self.execute(
+                "SELECT fetched_at FROM news_searches WHERE language=? AND query_key=? AND date_window=?",
+                (language or "", _query_key(query), window),
+            )
+            if not rows:
+                return None
+            times.append(rows[0][0])
+        return min(times) if times else None
+
+    def search(
+        self,
+        text: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+    ) -> list:
+        """Return articles matching any term of ``text``, best BM25 match first.
+
+        Args:
+            text: Claim or query text
+            since: Earliest publication time (epoch seconds)
+            until: Latest publication time (epoch seconds)
+            limit: Maximum articles returned
+
+        Returns:
+            Article dicts (the ``search_news`` keys) plus ``last_fetched``
+        """
+        from ..text.ranking import terms
+
+        words = list(dict.fromkeys(terms(text, stem=False)))[:MAX_MATCH_TERMS]
+        if not words:
+            return []
+        sql = (
+            f"SELECT {', '.join('a.' + field for field in _FIELDS)}, a.last_fetched "
+            "FROM news_articles_fts JOIN news_articles a ON a.id = news_articles_fts.rowid "
+            "WHERE news_articles_fts MATCH ?"
+        )
+        params: tuple = (" OR ".join(f'"{word}"' for word in words),)
+        if since is not None:
+            sql += " AND a.published_ts >= ?"
+            params += (since,)
+        if until is not None:
+            sql += " AND a.published_ts <= ?"
+            params += (until,)
+        sql += " ORDER BY bm25(news_articles_fts, 2.0, 1.0) LIMIT ?"
+        rows = self.execute(sql, params + (limit,))
+        return [dict(zip(_FIELDS + ("last_fetched",), row)) for row in rows]
+
+    def coverage(
+        self,
+        claim: str,
+        queries: dict,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+    ) -> ArchiveCoverage:
+        """Decide how much of a claim's news search the archive can answer.
+
+        Args:
+            claim: The user's claim
+            queries: ``{language: query}`` the claim would be searched with
+            from_date: Start of the publication window (ISO-8601), if any
+            to_date: End of the publication window (ISO-8601), if any
+
+        Returns:
+            ``ArchiveCoverage`` with the relevant archived articles, whether
+            they make an upstream call unnecessary, and otherwise the
+            ``from_date`` to send upstream (later than requested when only
+            newer coverage is missing)
+        """
+        from ..text.ranking import terms
+
+        settings = get_settings()
+        since, until = parse_timestamp(from_date), parse_timestamp(to_date)
+        claim_terms = set(terms(claim))
+        if not claim_terms:
+            return ArchiveCoverage([], False, from_date)
+        # Share of claim terms an article mentions; unlike normalized BM25 it
+        # does not shift as the archive grows
+        relevant = [
+            article
+            for article in self.search(claim, since=since, until=until)
+            if len(claim_terms.intersection(terms(f"{article['title']} {article['description']}")))
+            >= settings.news_archive_min_overlap * len(claim_terms)
+        ]
+        articles = [{field: article[field] for field in _FIELDS} for article in relevant]
+        # Only the claim's own searches say the archive holds what GNews has
+        searched = self.last_searched(queries, from_date, to_date)
+        if searched is None or not relevant:
+            METRICS.increment("news_archive", result="miss")
+            return ArchiveCoverage(articles, False, from_date)
+
+        window_closed = until is not None and searched > until + WINDOW_SETTLE_S
+        fresh = window_closed or time.time() - searched <= settings.news_archive_fresh_s
+        if fresh and len(relevant) >= settings.news_archive_min_hits:
+            METRICS.increment("news_archive", result="hit")
+            return ArchiveCoverage(articles, True, from_date)
+
+        # Stale coverage: only ask upstream for what was published since
+        published = [parse_timestamp(article["published_date"]) for article in relevant]
+        newest = max((ts for ts in published if ts is not None), default=None)
+        METRICS.increment("news_archive", result="partial")
+        if newest is None or (since is not None and newest <= since):
+            return ArchiveCoverage(articles, False, from_date)
+        return ArchiveCoverage(articles, False, _published_date(newest))
+
+    def count(self) -> int:
+        return self.execute("SELECT COUNT(*) FROM news_articles")[0][0]
+
+
+@lru_cache(maxsize=1)
+def get_news_archive() -> NewsArchive:
+    """Return the process-wide archive (``<data_dir>/news_archive.db``)."""
+    return NewsArchive(data_path("news_archive.db"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect the local news archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="Search archived articles")
+    search.add_argument("text")
+    search.add_argument("--limit", type=int, default=10)
+    commands.add_parser("stats", help="Show the number of archived articles")
+    args = parser.parse_args()
+
+    archive = get_news_archive()
+    if args.command == "search":
+        started = time.perf_counter()
+        results = archive.search(args.text, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for article in results:
+            print(f"{article['published_date']}\t{article['source']}\t{article['title'][:80]}\t{article['url']}")
+        print(f"{len(results)} result(s) in {elapsed_ms:.2f} ms")
+    else:
+        print(json.dumps({"articles": archive.count(), "path": archive.path}, indent=2))
+
+
+__all__ = ["ArchiveCoverage", "NewsArchive", "get_news_archive", "parse_timestamp"]
+
+
+if __name__ == "__main__":
+    main()
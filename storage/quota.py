@@ -0,0 +1,89 @@
+"""Cross-process quota governor for upstream APIs.
+
+Counts requests per upstream in fixed windows stored in a shared SQLite file,
+so the limits in ``config.UPSTREAM_QUOTAS`` hold for the whole host rather
+than per worker process. ``acquire`` raises ``QuotaExceededError`` instead of
+letting a request run into the upstream's own rate limit.
+"""
+
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+
+from ..config import get_upstream_quota
+from ..metrics import METRICS
+from .sqlite import SqliteStore, data_path
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when an upstream's request quota is exhausted for the current window."""
+
+
+class QuotaGovernor(SqliteStore):
+    """Fixed-window request counters shared by all processes on a host."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS quota (
+            upstream TEXT NOT NULL,
+            window_s INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            used INTEGER NOT NULL,
+            PRIMARY KEY (upstream, window_s, bucket)
+        );
+    """
+
+    def acquire(self, upstream: str, cost: int = 1) -> None:
+        """Reserve ``cost`` requests against every configured window.
+
+        Raises:
+            QuotaExceededError: If any window would exceed its limit
+        """
+        limits = get_upstream_quota(upstream)
+        if not limits:
+            return
+        now = time.time()
+        with self.transaction() as conn:
+            for limit, window in limits:
+                bucket = int(now // window)
+                row = conn.execute(
+                    "SELECT used FROM quota WHERE upstream=? AND window_s=? AND bucket=?",
+                    (upstream, window, bucket),
+                ).fetchone()
+                used = row[0] if row else 0
+                if used + cost > limit:
+                    METRICS.increment("quota_rejections", upstream=upstream)
+                    retry_in = int((bucket + 1) * window - now) + 1
+                    raise QuotaExceededError(
+                        f"{upstream} quota exhausted ({limit} requests per {window}s); "
+                        f"retry in {retry_in}s"
+                    )
+            for limit, window in limits:
+                conn.execute(
+                    "INSERT INTO quota VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(upstream, window_s, bucket) DO UPDATE SET used = used + ?",
+                    (upstream, window, int(now // window), cost, cost),
+                )
+            conn.execute("DELETE FROM quota WHERE bucket < ? / window_s - 1", (now,))
+
+    def usage(self) -> dict:
+        """Return current-window usage and limits per upstream."""
+        now = time.time()
+        report = {}
+        for upstream, window, bucket, used in self.execute("SELECT * FROM quota"):
+            if bucket != int(now // window):
+                continue
+            limit = dict((w, l) for l, w in get_upstream_quota(upstream)).get(window)
+            report.setdefault(upstream, []).append(
+                {"window_s": window, "used": used, "limit": limit}
+            )
+        return report
+
+
+@lru_cache(maxsize=1)
+def get_quota_governor() -> QuotaGovernor:
+    """Return the process-wide quota governor."""
+    return QuotaGovernor(data_path("quota.db"))
+
+
+__all__ = ["QuotaExceededError", "QuotaGovernor", "get_quota_governor"]
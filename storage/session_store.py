@@ -0,0 +1,343 @@
+"""Bounded ADK session service with LRU/TTL eviction and optional SQLite spill.
+
+``InMemorySessionService`` keeps every session (and every state key written by
+the workers, mergers and final report) for the life of the process. This
+service keeps only the most recently used sessions in memory, bounded by count
+and by an estimate of their serialized size, and evicts idle sessions after a
+TTL. When a spill path is configured, evicted sessions are written to a local
+SQLite file and transparently reloaded on the next read, so older sessions stay
+readable through the sessions endpoint while resident memory stays flat. A
+reloaded session is removed from the file, so the file never holds a stale
+copy of a resident session; it is written again if evicted again.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events.event import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+from ..config import get_settings
+from ..metrics import METRICS
+from .sqlite import SqliteStore
+
+SessionKey = tuple[str, str, str]
+
+# Spilled sessions untouched for this long are purged from the SQLite file
+DEFAULT_SPILL_TTL_SECONDS = 7 * 24 * 3600
+
+
+def estimate_bytes(value: Any) -> int:
+    """Approximate the serialized size of a session, event or state value."""
+    if hasattr(value, "model_dump_json"):
+        return len(value.model_dump_json(exclude_none=True))
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+@dataclass
+class _Entry:
+    """Accounting record for one resident session."""
+
+    size: int
+    last_access: float
+
+
+class SessionSpillStore(SqliteStore):
+    """SQLite file holding sessions evicted from memory.
+
+    Several worker processes may share one spill file; rows are keyed by
+    (app, user, session) so a session spilled by one worker can be reloaded
+    by another.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            app_name TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            last_update_time REAL NOT NULL,
+            spilled_at REAL NOT NULL,
+            payload TEXT NOT NULL,
+            PRIMARY KEY (app_name, user_id, session_id)
+        );
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = DEFAULT_SPILL_TTL_SECONDS):
+        super().__init__(path)
+        self.ttl_seconds = ttl_seconds
+
+    def put(self, session: Session) -> None:
+        """Write (or overwrite) a session."""
+        self.execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                session.app_name,
+                session.user_id,
+                session.id,
+                session.last_update_time,
+                time.time(),
+                session.model_dump_json(exclude_none=True),
+            ),
+        )
+
+    def take(self, key: SessionKey) -> Optional[Session]:
+        """Remove and return a spilled session, or None if it is not stored."""
+        rows = self.execute(
+            "DELETE FROM sessions WHERE app_name=? AND user_id=? AND session_id=? RETURNING payload",
+            key,
+        )
+        return Session.model_validate_json(rows[0][0]) if rows else None
+
+    def contains(self, key: SessionKey) -> bool:
+        rows = self.execute(
+            "SELECT 1 FROM sessions WHERE app_name=? AND user_id=? AND session_id=?",
+            key,
+        )
+        return bool(rows)
+
+    def list(self, app_name: str, user_id: Optional[str] = None) -> list:
+        """Return spilled sessions for an app (optionally one user), without events."""
+        query = "SELECT payload FROM sessions WHERE app_name=?"
+        params: tuple = (app_name,)
+        if user_id is not None:
+            query += " AND user_id=?"
+            params += (user_id,)
+        sessions = []
+        for (payload,) in self.execute(query, params):
+            data = json.loads(payload)
+            data["events"] = []
+            sessions.append(Session.model_validate(data))
+        return sessions
+
+    def delete(self, key: SessionKey) -> None:
+        self.execute(
+            "DELETE FROM sessions WHERE app_name=? AND user_id=? AND session_id=?",
+            key,
+        )
+
+    def purge_expired(self) -> int:
+        """Drop spilled sessions older than the spill TTL; return how many."""
+        cutoff = time.time() - self.ttl_seconds
+        return len(self.execute("DELETE FROM sessions WHERE spilled_at < ? RETURNING 1", (cutoff,)))
+
+    def count(self) -> int:
+        return self.execute("SELECT COUNT(*) FROM sessions")[0][0]
+
+
+class BoundedSessionService(InMemorySessionService):
+    """In-memory session service with LRU, TTL and byte-size bounds.
+
+    Args:
+        max_sessions: Maximum number of sessions kept in memory
+        max_bytes: Maximum estimated serialized size of resident sessions
+        ttl_seconds: Idle time after which a session is evicted from memory
+        spill_path: Optional SQLite file receiving evicted sessions
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = 1000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: int = 3600,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill = SessionSpillStore(spill_path) if spill_path else None
+        self._lock = threading.RLock()
+        self._lru: OrderedDict[SessionKey, _Entry] = OrderedDict()
+        self._resident_bytes = 0
+
+    # -- accounting -------------------------------------------------------
+
+    def _touch(self, key: SessionKey, added_bytes: int = 0, size: Optional[int] = None) -> None:
+        with self._lock:
+            entry = self._lru.pop(key, None)
+            if entry is None:
+                entry = _Entry(size=0, last_access=0.0)
+            new_size = size if size is not None else entry.size + added_bytes
+            self._resident_bytes += new_size - entry.size
+            entry.size = new_size
+            entry.last_access = time.monotonic()
+            self._lru[key] = entry
+
+    def _evict(self, key: SessionKey, reason: str) -> None:
+        app_name, user_id, session_id = key
+        with self._lock:
+            entry = self._lru.pop(key, None)
+            if entry is not None:
+                self._resident_bytes -= entry.size
+            session = self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+        if session is not None and self.spill is not None:
+            self.spill.put(session)
+            METRICS.increment("session_spills")
+        METRICS.increment("session_evictions", reason=reason)
+
+    def _enforce_limits(self, keep: Optional[SessionKey] = None) -> None:
+        # The LRU is ordered by last access, so expired and over-budget
+        # sessions are always found at the front.
+        now = time.monotonic()
+        victims = []
+        with self._lock:
+            resident = len(self._lru)
+            resident_bytes = self._resident_bytes
+            for key, entry in self._lru.items():
+                if key == keep:
+                    continue
+                if now - entry.last_access > self.ttl_seconds:
+                    reason = "ttl"
+                elif resident > self.max_sessions:
+                    reason = "count"
+                elif resident_bytes > self.max_bytes:
+                    reason = "bytes"
+                else:
+                    break
+                victims.append((key, reason))
+                resident -= 1
+                resident_bytes -= entry.size
+        for key, reason in victims:
+            self._evict(key, reason)
+        METRICS.set_gauge("session_resident_count", len(self._lru))
+        METRICS.set_gauge("session_resident_bytes", self._resident_bytes)
+
+    def _ensure_resident(self, app_name: str, user_id: str, session_id: str) -> bool:
+        """Reload a spilled session into memory; return True if it is resident."""
+        if session_id in self.sessions.get(app_name, {}).get(user_id, {}):
+            return True
+        if self.spill is None:
+            return False
+        key = (app_name, user_id, session_id)
+        session = self.spill.take(key)
+        if session is None:
+            return False
+        with self._lock:
+            self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session_id] = session
+        self._touch(key, size=estimate_bytes(session))
+        METRICS.increment("session_reloads")
+        return True
+
+    # -- BaseSessionService ----------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id else None
+        if session_id and self.spill is not None and self.spill.contains((app_name, user_id, session_id)):
+            raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        key = (app_name, user_id, session.id)
+        self._touch(key, size=estimate_bytes(session))
+        self._enforce_limits(keep=key)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session_id = session_id.strip() if session_id else session_id
+        if not self._ensure_resident(app_name, user_id, session_id):
+            return None
+        key = (app_name, user_id, session_id)
+        self._touch(key)
+        self._enforce_limits(keep=key)
+        return await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        response = await super().list_sessions(app_name=app_name, user_id=user_id)
+        if self.spill is None:
+            return response
+        resident = {(s.user_id, s.id) for s in response.sessions}
+        for session in self.spill.list(app_name, user_id):
+            if (session.user_id, session.id) not in resident:
+                response.sessions.append(self._merge_state(app_name, session.user_id, session))
+        response.sessions.sort(key=lambda s: (s.last_update_time, s.user_id, s.id))
+        return response
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        session_id = session_id.strip() if session_id else session_id
+        key = (app_name, user_id, session_id)
+        await super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        with self._lock:
+            entry = self._lru.pop(key, None)
+            if entry is not None:
+                self._resident_bytes -= entry.size
+        if self.spill is not None:
+            self.spill.delete(key)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        self._ensure_resident(session.app_name, session.user_id, session.id)
+        event = await super().append_event(session=session, event=event)
+        key = (session.app_name, session.user_id, session.id)
+        self._touch(key, added_bytes=estimate_bytes(event))
+        self._enforce_limits(keep=key)
+        return event
+
+    # -- introspection ----------------------------------------------------
+
+    def stats(self) -> dict:
+        """Return resident/spilled counts, byte accounting and configured bounds."""
+        with self._lock:
+            resident = len(self._lru)
+            resident_bytes = self._resident_bytes
+        return {
+            "resident_sessions": resident,
+            "resident_bytes": resident_bytes,
+            "spilled_sessions": self.spill.count() if self.spill is not None else 0,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "spill_path": self.spill.path if self.spill is not None else None,
+        }
+
+
+def create_session_service(spill_path: Optional[str] = None) -> BoundedSessionService:
+    """Build a ``BoundedSessionService`` from settings (``SESSION_*`` variables)."""
+    settings = get_settings()
+    service = BoundedSessionService(
+        max_sessions=settings.session_max_count,
+        max_bytes=settings.session_max_bytes,
+        ttl_seconds=settings.session_ttl_seconds,
+        spill_path=spill_path or settings.session_spill_path or None,
+    )
+    if service.spill is not None:
+        service.spill.purge_expired()
+    return service
+
+
+__all__ = [
+    "BoundedSessionService",
+    "SessionSpillStore",
+    "create_session_service",
+    "estimate_bytes",
+]
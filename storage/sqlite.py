@@ -0,0 +1,96 @@
+"""Process-safe SQLite helpers shared by the local stores.
+
+Every store opens its file in WAL mode with a busy timeout so several worker
+processes on one host can read and write the same database concurrently.
+Connections are created lazily and re-created after a fork.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+
+from ..config import get_settings
+
+
+def data_path(filename: str) -> str:
+    """Return ``filename`` inside the shared data directory, creating it if needed."""
+    directory = get_settings().data_dir
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a SQLite connection configured for multi-process access."""
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=10000")
+    return conn
+
+
+class SqliteStore:
+    """Base class owning one lazily opened, fork-aware SQLite connection.
+
+    Subclasses set ``SCHEMA`` (executed once per connection) and use
+    ``self.execute``/``self.transaction`` while holding no other locks.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = connect(self.path)
+            self._pid = os.getpid()
+            if self.SCHEMA:
+                self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def execute(self, sql: str, params: tuple = ()) -> list:
+        """Run one statement and return all rows."""
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    def executemany(self, sql: str, rows: list) -> None:
+        """Run one statement for many parameter rows inside a transaction."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(sql, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def transaction(self):
+        """Return a context manager running an IMMEDIATE (write-locked) transaction."""
+        return _Transaction(self)
+
+
+class _Transaction:
+    def __init__(self, store: SqliteStore):
+        self._store = store
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._store._lock.acquire()
+        conn = self._store._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        conn = self._store._conn
+        try:
+            conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._store._lock.release()
+
+
+__all__ = ["SqliteStore", "connect", "data_path"]
@@ -0,0 +1,222 @@
+"""Watched claims, their evidence and the updates found by re-polling them.
+
+Each watch stores the claim's news articles and fact-checks, the newest
+publication and review dates seen (the watermarks the next poll starts
+from), the last news merger report and a version that increases with every
+update. Updates are kept as rows so clients can ask for everything after the
+version they last saw. Due watches are leased like jobs, so several server
+processes can poll the same table without polling a watch twice.
+
+Usage:
+    python -m news_info_verification_v2.storage.watchlist list
+    python -m news_info_verification_v2.storage.watchlist updates WATCH_ID
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from functools import lru_cache
+from typing import Optional
+
+from .sqlite import SqliteStore, data_path
+
+_WATCH_FIELDS = (
+    "id",
+    "claim",
+    "user_id",
+    "webhook_url",
+    "interval_s",
+    "active",
+    "created_at",
+    "last_polled",
+    "next_poll",
+    "news_since",
+    "reviews_since",
+    "version",
+    "summary",
+    "last_error",
+    "evidence",
+)
+
+
+def _watch(row: tuple, include_evidence: bool = False) -> dict:
+    watch = dict(zip(_WATCH_FIELDS, row))
+    watch["active"] = bool(watch["active"])
+    if include_evidence:
+        watch["evidence"] = json.loads(watch["evidence"]) if watch["evidence"] else {}
+    else:
+        watch.pop("evidence")
+    return watch
+
+
+class Watchlist(SqliteStore):
+    """Watched claims with their evidence, watermarks and update history."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS watches (
+            id TEXT PRIMARY KEY,
+            claim TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            webhook_url TEXT,
+            interval_s REAL NOT NULL,
+            active INTEGER NOT NULL DEFAULT 1,
+            created_at REAL NOT NULL,
+            last_polled REAL,
+            next_poll REAL NOT NULL,
+            news_since TEXT,
+            reviews_since TEXT,
+            version INTEGER NOT NULL DEFAULT 0,
+            summary TEXT,
+            last_error TEXT,
+            evidence TEXT
+        );
+        CREATE INDEX IF NOT EXISTS watches_due ON watches (active, next_poll);
+        CREATE TABLE IF NOT EXISTS watch_updates (
+            id INTEGER PRIMARY KEY,
+            watch_id TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            changes TEXT NOT NULL,
+            summary TEXT,
+            UNIQUE (watch_id, version)
+        );
+    """
+
+    def add(
+        self,
+        claim: str,
+        user_id: str,
+        interval_s: float,
+        webhook_url: Optional[str] = None,
+    ) -> dict:
+        """Start watching a claim; the first poll is due at once."""
+        watch_id = uuid.uuid4().hex
+        now = time.time()
+        self.execute(
+            "INSERT INTO watches (id, claim, user_id, webhook_url, interval_s, created_at, next_poll) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (watch_id, claim, user_id, webhook_url or None, interval_s, now, now),
+        )
+        return self.get(watch_id)
+
+    def get(self, watch_id: str, include_evidence: bool = False) -> Optional[dict]:
+        rows = self.execute(
+            f"SELECT {', '.join(_WATCH_FIELDS)} FROM watches WHERE id=?", (watch_id,)
+        )
+        return _watch(rows[0], include_evidence) if rows else None
+
+    def watches(self, user_id: Optional[str] = None) -> list:
+        sql = f"SELECT {', '.join(_WATCH_FIELDS)} FROM watches WHERE active=1"
+        params: tuple = ()
+        if user_id is not None:
+            sql += " AND user_id=?"
+            params = (user_id,)
+        return [_watch(row) for row in self.execute(sql + " ORDER BY created_at", params)]
+
+    def remove(self, watch_id: str) -> bool:
+        """Stop watching; the watch and its updates stay readable."""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE watches SET active=0 WHERE id=? AND active=1", (watch_id,)
+            )
+        return cursor.rowcount > 0
+
+    def claim_due(self, lease_s: float) -> Optional[dict]:
+        """Lease the most overdue active watch, with its evidence, or return None."""
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(_WATCH_FIELDS)} FROM watches "
+                "WHERE active=1 AND next_poll <= ? ORDER BY next_poll LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE watches SET next_poll=? WHERE id=?", (now + lease_s, row[0]))
+        return _watch(row, include_evidence=True)
+
+    def save_poll(
+        self,
+        watch_id: str,
+        evidence: dict,
+        news_since: Optional[str],
+        reviews_since: Optional[str],
+        error: Optional[str] = None,
+    ) -> None:
+        """Store a poll's evidence and watermarks and schedule the next poll."""
+        now = time.time()
+        self.execute(
+            "UPDATE watches SET evidence=?, news_since=?, reviews_since=?, last_polled=?, "
+            "last_error=?, next_poll=? + interval_s WHERE id=?",
+            (json.dumps(evidence), news_since, reviews_since, now, error, now, watch_id),
+        )
+
+    def poll_failed(self, watch_id: str, error: str) -> None:
+        """Record a failed poll; the watch is retried at its next interval."""
+        now = time.time()
+        self.execute(
+            "UPDATE watches SET last_error=?, next_poll=? + interval_s WHERE id=?",
+            (error, now, watch_id),
+        )
+
+    def add_update(self, watch_id: str, changes: dict, summary: Optional[str]) -> int:
+        """Record an update and the merger's new report; return its version."""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE watches SET version=version+1, summary=COALESCE(?, summary) WHERE id=?",
+                (summary, watch_id),
+            )
+            (version,) = conn.execute(
+                "SELECT version FROM watches WHERE id=?", (watch_id,)
+            ).fetchone()
+            conn.execute(
+                "INSERT INTO watch_updates (watch_id, version, created_at, changes, summary) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (watch_id, version, time.time(), json.dumps(changes), summary),
+            )
+        return version
+
+    def updates(self, watch_id: str, since_version: int = 0) -> list:
+        """Return the updates after ``since_version``, oldest first."""
+        rows = self.execute(
+            "SELECT version, created_at, changes, summary FROM watch_updates "
+            "WHERE watch_id=? AND version > ? ORDER BY version",
+            (watch_id, since_version),
+        )
+        return [
+            {"version": version, "created_at": created, "changes": json.loads(changes), "summary": summary}
+            for version, created, changes, summary in rows
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_watchlist() -> Watchlist:
+    """Return the process-wide watchlist (``<data_dir>/watchlist.db``)."""
+    return Watchlist(data_path("watchlist.db"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect the claim watchlist")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List active watches")
+    updates = commands.add_parser("updates", help="Print a watch's updates")
+    updates.add_argument("watch_id")
+    updates.add_argument("--since", type=int, default=0)
+    args = parser.parse_args()
+
+    watchlist = get_watchlist()
+    if args.command == "list":
+        for watch in watchlist.watches():
+            print(f"{watch['id']}\tv{watch['version']}\t{watch['news_since'] or '-'}\t{watch['claim'][:80]}")
+    else:
+        print(json.dumps(watchlist.updates(args.watch_id, args.since), indent=2))
+
+
+__all__ = ["Watchlist", "get_watchlist"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Local text processing helpers (URL extraction, ...) used by tools."""
+
+from .urls import canonicalize_url, extract_urls, find_urls, refang, url_host
+
+__all__ = ["canonicalize_url", "extract_urls", "find_urls", "refang", "url_host"]
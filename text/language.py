@@ -0,0 +1,100 @@
+"""Script-based language detection for claims.
+
+Most regional-language claims we see are written in their native script, so
+counting letters per Unicode block identifies the language without a model:
+Devanagari is Hindi (or Marathi when Marathi function words dominate),
+Bengali script is Bengali, Tamil script is Tamil, and so on. Latin-script
+text is treated as English; romanized regional text is not distinguished.
+
+Python's ``\\w`` does not match Indic vowel signs and viramas, so regexes
+that tokenize claim text should add ``WORD_MARKS`` to their word class.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+
+# Combining diacritics plus the Indic blocks (Devanagari .. Malayalam), which
+# hold the vowel signs and viramas; the dandas (sentence ends) are left out
+WORD_MARKS = "\u0300-\u036f\u0900-\u0963\u0966-\u0d7f"
+SENTENCE_MARKS = "\u0964\u0965"
+
+# (first code point, last code point, language) per script block
+_SCRIPT_BLOCKS = (
+    (0x0600, 0x06FF, "ur"),  # Arabic script; Urdu in our traffic
+    (0x0900, 0x097F, "hi"),  # Devanagari
+    (0x0980, 0x09FF, "bn"),
+    (0x0A00, 0x0A7F, "pa"),  # Gurmukhi
+    (0x0A80, 0x0AFF, "gu"),
+    (0x0B00, 0x0B7F, "or"),
+    (0x0B80, 0x0BFF, "ta"),
+    (0x0C00, 0x0C7F, "te"),
+    (0x0C80, 0x0CFF, "kn"),
+    (0x0D00, 0x0D7F, "ml"),
+)
+_BLOCK_STARTS = [block[0] for block in _SCRIPT_BLOCKS]
+
+DEFAULT_LANGUAGE = "en"
+
+# Function words that tell Marathi from Hindi (both Devanagari)
+_MARATHI_MARKERS = frozenset("आहे आहेत आणि नाही होते झाले केले मध्ये आता हे ते".split())
+_HINDI_MARKERS = frozenset("है हैं और नहीं था थे में का की के को से ने".split())
+
+# Stopwords for the regional languages we see most; the scripts do not
+# overlap with English, so tokenizers can use them alongside English ones
+REGIONAL_STOPWORDS: frozenset = frozenset("""
+है हैं था थे थी और या में का की के को से ने पर यह वह ये वो इस उस एक भी तो ही कि जो
+जब तक लिए नहीं हो रहा रही रहे गया गई गए किया कर करने कहा बताया साथ बाद अब सभी कुछ
+आहे आहेत आणि नाही होते झाले केले मध्ये हे ते या ची चा चे ला ने त
+এবং এই ওই যে কি না হয় ছিল করে থেকে জন্য সঙ্গে একটি তার এর
+""".split())
+
+
+def _script_language(char: str) -> str:
+    code = ord(char)
+    index = bisect_right(_BLOCK_STARTS, code) - 1
+    if index >= 0 and code <= _SCRIPT_BLOCKS[index][1]:
+        return _SCRIPT_BLOCKS[index][2]
+    return ""
+
+
+def detect_language(text: str) -> str:
+    """Return the ISO 639-1 code of the dominant script's language.
+
+    Latin-script and empty text return ``DEFAULT_LANGUAGE``.
+    """
+    counts: dict = {}
+    latin = 0
+    for char in text:
+        if char.isascii():
+            latin += char.isalpha()
+        elif char.isalpha() or "\u0900" <= char <= "\u0d7f":
+            language = _script_language(char)
+            if language:
+                counts[language] = counts.get(language, 0) + 1
+    if not counts:
+        return DEFAULT_LANGUAGE
+    language, count = max(counts.items(), key=lambda item: item[1])
+    if count < latin:
+        return DEFAULT_LANGUAGE
+    if language == "hi":
+        words = text.split()
+        marathi = sum(word in _MARATHI_MARKERS for word in words)
+        if marathi > sum(word in _HINDI_MARKERS for word in words):
+            return "mr"
+    return language
+
+
+def latin_text(text: str) -> str:
+    """Keep only Latin-script words (names, places, English phrases) of a mixed claim."""
+    return " ".join(word if word.isascii() else "." for word in text.split())
+
+
+__all__ = [
+    "DEFAULT_LANGUAGE",
+    "REGIONAL_STOPWORDS",
+    "SENTENCE_MARKS",
+    "WORD_MARKS",
+    "detect_language",
+    "latin_text",
+]
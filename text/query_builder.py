@@ -0,0 +1,389 @@
+"""Deterministic search-query extraction for news lookups.
+
+``build_news_query`` turns a free-text claim into a short keyword query for
+GNews without a model call:
+
+1. Tokenize, dropping URLs, mentions and punctuation (``#hashtags`` keep their
+   word).
+2. Detect named entities: runs of capitalized words (``Andhra Pradesh``,
+   ``Reserve Bank of India``) and acronyms (``ISRO``). Places are tagged from
+   a small gazetteer.
+3. Detect date cues (``12 March 2024``, ``March 2024``, ``2024-03-12``). An
+   explicit date becomes a ``from``/``to`` publication window instead of
+   query terms.
+4. Score candidate keyphrases RAKE-style. Phrases are maximal runs of
+   non-stopwords, each word scores degree/frequency, and a phrase scores the
+   sum of its words. Entities, places, numbers and words that are rare in
+   news copy get a TF-IDF-like boost.
+5. Keep the best phrases up to ``max_terms`` words, in claim order, and
+   sanitize them for GNews syntax.
+
+The whole pass is a handful of precompiled regexes and dict lookups, so the
+news API call can start as soon as a claim arrives.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import re
+from typing import NamedTuple, Optional
+
+from .language import REGIONAL_STOPWORDS, SENTENCE_MARKS, WORD_MARKS
+
+STOPWORDS: frozenset = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been
+before being below between both but by can can't cannot could couldn't did didn't do does
+doesn't doing don't down during each even ever every few for from further get gets got had
+hadn't has hasn't have haven't having he he'd he'll he's her here here's hers herself him
+himself his how how's however i i'd i'll i'm i've if in into is isn't it it's its itself
+just let's like many may me might more most much must mustn't my myself no nor not now of
+off on once one only or other ought our ours ourselves out over own per same shan't she
+she'd she'll she's should shouldn't since so some still such than that that's the their
+theirs them themselves then there there's these they they'd they'll they're they've this
+those though through to too under until up upon us very via was wasn't we we'd we'll we're
+we've were weren't what what's when when's where where's whether which while who who's whom
+why why's will with within without won't would wouldn't yet you you'd you'll you're you've
+your yours yourself yourselves
+""".split())
+
+# Reporting and claim framing that carries no search signal
+FILLER_WORDS: frozenset = frozenset("""
+according actually allegedly apparently breaking claim claimed claiming claims fact fake
+forward forwarded going hoax just know latest message news post posted posts real really
+reportedly reports rumor rumour said saying say says see share shared shares sharing shows
+social source sources statement story tell tells told true truth update verify viral video
+whatsapp yesterday today tomorrow tonight recently week month year ago last next
+monday tuesday wednesday thursday friday saturday sunday
+""".split())
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+            ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+            ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"),
+            ("december", "dec"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+# Countries, Indian states/UTs and large cities; multi-word names use spaces
+PLACES: frozenset = frozenset(
+    name.replace("_", " ")
+    for name in """
+india pakistan bangladesh nepal sri_lanka bhutan myanmar china japan korea
+north_korea south_korea russia ukraine israel palestine gaza iran iraq syria
+afghanistan turkey saudi_arabia uae qatar egypt nigeria kenya south_africa
+usa america united_states canada mexico brazil argentina uk britain
+united_kingdom england france germany italy spain netherlands australia
+new_zealand singapore malaysia indonesia thailand vietnam philippines
+andhra_pradesh arunachal_pradesh assam bihar chhattisgarh goa gujarat haryana
+himachal_pradesh jharkhand karnataka kerala madhya_pradesh maharashtra manipur
+meghalaya mizoram nagaland odisha punjab rajasthan sikkim tamil_nadu telangana
+tripura uttar_pradesh uttarakhand west_bengal delhi jammu kashmir ladakh
+puducherry chandigarh lakshadweep andaman
+mumbai kolkata chennai bengaluru bangalore hyderabad ahmedabad pune surat
+jaipur lucknow kanpur nagpur indore bhopal patna vadodara ludhiana agra nashik
+visakhapatnam vijayawada kochi thiruvananthapuram coimbatore madurai guwahati
+bhubaneswar ranchi srinagar amritsar varanasi noida gurugram gurgaon
+london paris berlin moscow beijing tokyo washington new_york los_angeles
+dubai karachi lahore islamabad dhaka kathmandu colombo kabul tehran jerusalem
+""".split()
+)
+_MAX_PLACE_WORDS = max(len(place.split()) for place in PLACES)
+
+# Frequent in news copy, so weaker evidence than their RAKE score suggests
+_COMMON_NEWS_WORDS = frozenset("""
+people government police official officials country state city minister president
+world time first two three day days government's people's public report leader leaders
+party says state's national local death died killed dead incident
+""".split())
+
+_URL_OR_MENTION_RE = re.compile(r"(?:https?://|www\.)\S+|@\w+", re.IGNORECASE)
+# Words (with internal apostrophes, hyphens, dots and ampersands), numbers, or
+# punctuation that breaks a phrase
+_TOKEN_RE = re.compile(
+    rf"\d+(?:[.,:]\d+)*%?|[^\W\d_](?:[\w{WORD_MARKS}'&.-]*[\w{WORD_MARKS}])?"
+    rf"|[.!?;:,()\[\]\"|/{SENTENCE_MARKS}]"
+)
+_PHRASE_BREAK = frozenset(".!?;:,()[]\"|/" + SENTENCE_MARKS)
+_SENTENCE_END = frozenset(".!?" + SENTENCE_MARKS)
+_ACRONYM_RE = re.compile(r"^[A-Z][A-Z0-9&]{1,6}$")
+_ISO_DATE_RE = re.compile(r"\b(20\d\d|19\d\d)-(\d{1,2})-(\d{1,2})\b")
+_DAY_MONTH_YEAR_RE = re.compile(
+    r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?([A-Za-z]{3,9})\.?,?\s+((?:19|20)\d\d)\b"
+)
+_MONTH_DAY_YEAR_RE = re.compile(
+    r"\b([A-Za-z]{3,9})\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+((?:19|20)\d\d)\b"
+)
+_MONTH_YEAR_RE = re.compile(r"\b([A-Za-z]{3,9})\.?,?\s+((?:19|20)\d\d)\b")
+# Characters GNews accepts in a plain keyword query
+_UNSAFE_QUERY_RE = re.compile(rf"[^\w\s{WORD_MARKS}]")
+_GNEWS_OPERATORS = frozenset({"and", "or", "not"})
+
+# Publication window around an explicit date cue (days before, days after)
+DATE_WINDOW_DAYS = (2, 7)
+MAX_QUERY_CHARS = 200
+
+
+class NewsQuery(NamedTuple):
+    """Result of ``build_news_query``."""
+
+    query: str
+    keyphrases: list
+    entities: list
+    places: list
+    dates: list
+    from_date: Optional[str] = None
+    to_date: Optional[str] = None
+
+
+def _parse_date(year: str, month: str, day: Optional[str] = None) -> Optional[tuple]:
+    """Return (start, end) dates for a cue; a month without a day spans the month."""
+    month_number = int(month) if month.isdigit() else _MONTHS.get(month.lower())
+    if not month_number:
+        return None
+    try:
+        if day is not None:
+            date = dt.date(int(year), month_number, int(day))
+            return date, date
+        start = dt.date(int(year), month_number, 1)
+    except ValueError:
+        return None
+    end = (start.replace(day=28) + dt.timedelta(days=4)).replace(day=1) - dt.timedelta(days=1)
+    return start, end
+
+
+def find_date_cues(text: str) -> list:
+    """Return ``(matched text, start date, end date)`` for explicit dates in ``text``."""
+    cues = []
+    covered: list = []
+    patterns = (
+        (_ISO_DATE_RE, lambda m: (m.group(1), m.group(2), m.group(3))),
+        (_DAY_MONTH_YEAR_RE, lambda m: (m.group(3), m.group(2), m.group(1))),
+        (_MONTH_DAY_YEAR_RE, lambda m: (m.group(3), m.group(1), m.group(2))),
+        (_MONTH_YEAR_RE, lambda m: (m.group(2), m.group(1), None)),
+    )
+    for pattern, fields in patterns:
+        for match in pattern.finditer(text):
+            if any(start <= match.start() < end for start, end in covered):
+                continue
+            span = _parse_date(*fields(match))
+            if span is not None:
+                covered.append(match.span())
+                cues.append((match.group(0), *span))
+    return cues
+
+
+def sanitize_query(query: str, max_chars: int = MAX_QUERY_CHARS) -> str:
+    """Make a keyword query safe for GNews (no operators or special characters)."""
+    words = [
+        word
+        for word in _UNSAFE_QUERY_RE.sub(" ", query).split()
+        if word.lower() not in _GNEWS_OPERATORS
+    ]
+    query = ""
+    for word in words:
+        candidate = f"{query} {word}" if query else word
+        if len(candidate) > max_chars:
+            break
+        query = candidate
+    return query
+
+
+def _is_stop(word: str) -> bool:
+    lower = word.lower()
+    return lower in STOPWORDS or lower in FILLER_WORDS or lower in REGIONAL_STOPWORDS
+
+
+def _tokens(text: str) -> list:
+    text = _URL_OR_MENTION_RE.sub(" . ", text).replace("#", " ")
+    return _TOKEN_RE.findall(text)
+
+
+def _entities(tokens: list) -> list:
+    """Return (start, end) token spans of proper-noun runs and acronyms."""
+    spans = []
+    index = 0
+    sentence_start = True
+    while index < len(tokens):
+        token = tokens[index]
+        if token in _PHRASE_BREAK:
+            sentence_start = token in _SENTENCE_END
+            index += 1
+            continue
+        if token[0].isupper() and not _is_stop(token):
+            end = index + 1
+            # "Reserve Bank of India": lower-case connectors inside a name
+            while end < len(tokens):
+                if tokens[end][0].isupper() and tokens[end] not in _PHRASE_BREAK:
+                    end += 1
+                elif (
+                    tokens[end] in ("of", "de", "for")
+                    and end + 1 < len(tokens)
+                    and tokens[end + 1][0].isupper()
+                ):
+                    end += 2
+                else:
+                    break
+            # A lone capitalized word opening a sentence is usually not a name
+            if not (sentence_start and end == index + 1 and not _ACRONYM_RE.match(token)):
+                spans.append((index, end))
+            index = end
+        else:
+            index += 1
+        sentence_start = False
+    return spans
+
+
+def _places(words: list) -> list:
+    places = []
+    index = 0
+    while index < len(words):
+        for size in range(min(_MAX_PLACE_WORDS, len(words) - index), 0, -1):
+            candidate = " ".join(words[index:index + size])
+            if candidate in PLACES:
+                places.append((index, index + size))
+                index += size
+                break
+        else:
+            index += 1
+    return places
+
+
+def _candidate_phrases(tokens: list, protected: set) -> list:
+    """Split tokens into (start, end) runs of content words (RAKE candidates).
+
+    Tokens in ``protected`` (connectors inside a multi-word entity, as in
+    "Reserve Bank of India") never break a phrase.
+    """
+    phrases = []
+    start = None
+    for index, token in enumerate(tokens + ["."]):
+        breaks = token in _PHRASE_BREAK or _is_stop(token) or (len(token) < 2 and not token.isdigit())
+        if breaks and index not in protected:
+            if start is not None:
+                phrases.append((start, index))
+                start = None
+        elif start is None:
+            start = index
+    return phrases
+
+
+def build_news_query(
+    text: str,
+    max_terms: int = 10,
+    max_chars: int = MAX_QUERY_CHARS,
+    today: Optional[dt.date] = None,
+) -> NewsQuery:
+    """Build a GNews keyword query from a claim.
+
+    Args:
+        text: Claim or message text
+        max_terms: Maximum number of words in the query
+        max_chars: Maximum query length (GNews rejects long queries)
+        today: Reference date for clamping the publication window (default today)
+
+    Returns:
+        ``NewsQuery`` with the query, ranked keyphrases, entities, places,
+        date cues and an optional ISO-8601 ``from_date``/``to_date`` window.
+    """
+    dates = find_date_cues(text)
+    for matched, _start, _end in dates:
+        text = text.replace(matched, " . ")
+
+    tokens = _tokens(text)
+    lower = [token.lower() for token in tokens]
+    entity_spans = _entities(tokens)
+    place_spans = _places(lower)
+    boosted: dict = {}
+    for start, end in entity_spans:
+        for index in range(start, end):
+            boosted[index] = 2.0
+    for start, end in place_spans:
+        for index in range(start, end):
+            boosted[index] = max(boosted.get(index, 1.0), 1.5)
+
+    protected = {index for start, end in entity_spans for index in range(start + 1, end - 1)}
+    phrases = _candidate_phrases(tokens, protected)
+
+    # RAKE word scores: degree (co-occurring words in phrases) / frequency
+    frequency: dict = {}
+    degree: dict = {}
+    for start, end in phrases:
+        words = [lower[i] for i in range(start, end) if not _is_stop(lower[i])]
+        for word in words:
+            frequency[word] = frequency.get(word, 0) + 1
+            degree[word] = degree.get(word, 0) + len(words)
+
+    scored = []
+    for start, end in phrases:
+        score = 0.0
+        for index in range(start, end):
+            word = lower[index]
+            if word not in frequency:
+                continue
+            weight = boosted.get(index, 1.0)
+            if word in _COMMON_NEWS_WORDS:
+                weight *= 0.5
+            elif word[0].isdigit():
+                weight *= 1.2
+            score += weight * degree[word] / frequency[word]
+        if score:
+            scored.append((score, start, end))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+
+    chosen = []
+    seen: set = set()
+    used = 0
+    for _score, start, end in scored:
+        words = [
+            tokens[i] for i in range(start, end)
+            if lower[i] not in _GNEWS_OPERATORS and lower[i] not in seen
+        ]
+        if not words:
+            continue
+        if used + len(words) > max_terms:
+            if used:
+                continue
+            words = words[:max_terms]
+        seen.update(word.lower() for word in words)
+        chosen.append((start, words))
+        used += len(words)
+        if used >= max_terms:
+            break
+    chosen.sort()
+
+    from_date = to_date = None
+    if dates:
+        before, after = DATE_WINDOW_DAYS
+        start = min(cue[1] for cue in dates) - dt.timedelta(days=before)
+        end = max(cue[2] for cue in dates) + dt.timedelta(days=after)
+        end = min(end, today or dt.date.today())
+        if start <= end:
+            from_date = f"{start.isoformat()}T00:00:00Z"
+            to_date = f"{end.isoformat()}T23:59:59Z"
+
+    return NewsQuery(
+        query=sanitize_query(" ".join(word for _start, words in chosen for word in words), max_chars),
+        keyphrases=[" ".join(tokens[start:end]) for _score, start, end in scored],
+        entities=[" ".join(tokens[start:end]) for start, end in entity_spans],
+        places=[" ".join(tokens[start:end]) for start, end in place_spans],
+        dates=[cue[0] for cue in dates],
+        from_date=from_date,
+        to_date=to_date,
+    )
+
+
+__all__ = [
+    "FILLER_WORDS",
+    "NewsQuery",
+    "PLACES",
+    "STOPWORDS",
+    "build_news_query",
+    "find_date_cues",
+    "sanitize_query",
+]
@@ -4,9 +4,12 @@ All tool functions follow ADK best practices:
 - Single str parameter named 'request'
 - Return dict with status and data fields
 - No complex type annotations (ToolContext removed)
+
+The ``*_TOOL`` FunctionTool wrappers are built on first attribute access so
+that importing the plain tool functions does not pull in ``google.adk``.
 """
 
-from google.adk.tools import FunctionTool
+from typing import Any
 
 from .news_tools import (
     fetch_news_evidence,
@@ -23,18 +26,29 @@ from .scam_tools import (
 )
 
 
-# News verification tools
-NEWS_API_TOOL = FunctionTool(fetch_news_evidence)
-NEWS_PERPLEXITY_TOOL = FunctionTool(research_news_with_perplexity)
+# Tool constant name -> wrapped tool function
+_TOOL_FUNCTIONS = {
+    # News verification tools
+    "NEWS_API_TOOL": fetch_news_evidence,
+    "NEWS_PERPLEXITY_TOOL": research_news_with_perplexity,
+    # Fact-checking tools
+    "FACT_CHECK_TOOL": check_factcheck_api,
+    "FACT_PERPLEXITY_TOOL": research_fact_with_perplexity,
+    # Scam detection tools
+    "VIRUSTOTAL_TOOL": scan_urls_with_virustotal,
+    "SCAM_PERPLEXITY_TOOL": research_scam_with_perplexity,
+    "SCAM_SENTIMENT_TOOL": analyze_scam_sentiment,
+}
+
 
-# Fact-checking tools
-FACT_CHECK_TOOL = FunctionTool(check_factcheck_api)
-FACT_PERPLEXITY_TOOL = FunctionTool(research_fact_with_perplexity)
+def __getattr__(name: str) -> Any:
+    if name in _TOOL_FUNCTIONS:
+        from google.adk.tools import FunctionTool
 
-# Scam detection tools
-VIRUSTOTAL_TOOL = FunctionTool(scan_urls_with_virustotal)
-SCAM_PERPLEXITY_TOOL = FunctionTool(research_scam_with_perplexity)
-SCAM_SENTIMENT_TOOL = FunctionTool(analyze_scam_sentiment)
+        tool = FunctionTool(_TOOL_FUNCTIONS[name])
+        globals()[name] = tool  # cache for subsequent lookups
+        return tool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
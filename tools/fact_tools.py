@@ -1,9 +1,20 @@
 """Fact checking tool functions."""
 
+import time
+
 
 def check_factcheck_api(request: str) -> dict:
     """
-    Look up fact-checks from Google Fact Check Tools API.
+    Look up fact-checks, from the local mirror first and then the Google Fact Check Tools API.
+    
+    The local ClaimReview mirror is searched first; if its best review is
+    relevant enough (``FACTCHECK_MIRROR_MIN_RELEVANCE``), a relevant review
+    is of the same claim (``FACTCHECK_MIRROR_MIN_OVERLAP``) and the mirror
+    fetched it or searched the API for the claim within
+    ``FACTCHECK_MIRROR_FRESH_S``, the API is not called. Otherwise API
+    results are merged with the local matches. Reviews
+    are ranked against the claim with BM25 and only the top relevant ones
+    are returned.
     
     Args:
         request: The claim to fact-check
@@ -11,16 +22,53 @@ def check_factcheck_api(request: str) -> dict:
     Returns:
         dict with:
             - status: 'success' or 'error'
-            - claims: List of {claim, claimant, rating, url, source} dicts
+            - claims: List of {claim, claimant, rating, url, source, relevance} dicts
+            - dropped: Number of retrieved reviews pruned as irrelevant
+            - max_relevance: Best relevance score (0-1) among retrieved reviews
+            - source: 'local_mirror' or 'factcheck_api'
             - error: Error message if status='error'
     """
+    from ..config import get_settings
+    from ..metrics import METRICS
     from ..services.factcheck_client import search_fact_checks
+    from ..storage.claim_reviews import get_claim_review_mirror
+    from ..text.ranking import FACT_CHECK_FIELDS, rank_evidence, term_overlap
     
     try:
+        settings = get_settings()
+        mirror = get_claim_review_mirror()
+        local = mirror.search(request)
+        ranked = rank_evidence(request, local, FACT_CHECK_FIELDS)
+        same_claim = [
+            review["url"]
+            for review in ranked.items
+            if review["relevance"] >= settings.factcheck_mirror_min_relevance
+            and term_overlap(request, review["claim"]) >= settings.factcheck_mirror_min_overlap
+        ]
+        checked = mirror.last_checked(request, same_claim) if same_claim else None
+        if checked is not None and time.time() - checked <= settings.factcheck_mirror_fresh_s:
+            METRICS.increment("factcheck_mirror", result="hit")
+            return {
+                "status": "success",
+                "claims": ranked.items,
+                "dropped": ranked.dropped,
+                "max_relevance": ranked.max_relevance,
+                "source": "local_mirror",
+                "query": request,
+            }
+        METRICS.increment("factcheck_mirror", result="miss")
+        
         claims = search_fact_checks(request)
+        mirror.record_lookup(request)
+        seen = {claim["url"] for claim in claims}
+        claims += [review for review in local if review["url"] not in seen]
+        ranked = rank_evidence(request, claims, FACT_CHECK_FIELDS)
         return {
             "status": "success",
-            "claims": claims,
+            "claims": ranked.items,
+            "dropped": ranked.dropped,
+            "max_relevance": ranked.max_relevance,
+            "source": "factcheck_api",
             "query": request,
         }
     except Exception as e:
@@ -35,6 +83,9 @@ def research_fact_with_perplexity(request: str) -> dict:
     """
     Research factual claims using Perplexity AI's deep research.
     
+    Reads the fact section of the research call shared by all lanes
+    (see ``services.research``), so an input costs one Perplexity call.
+    
     Args:
         request: The factual claim to verify
         
@@ -43,26 +94,18 @@ def research_fact_with_perplexity(request: str) -> dict:
             - status: 'success' or 'error'
             - answer: Perplexity's researched answer
             - citations: List of source URLs
+            - partial: True when the answer was cut short by the time budget
             - error: Error message if status='error'
     """
-    from ..services.perplexity_client import query_perplexity
-    
-    prompt = f"""Fact-check this claim with authoritative sources:
-    
-Claim: {request}
-
-Provide:
-1. Verdict (true/false/partly true/misleading)
-2. Key evidence supporting or refuting the claim
-3. Context and nuance
-4. Cite all authoritative sources (scientific journals, government data, expert statements)"""
+    from ..services.research import research_section
     
     try:
-        result = query_perplexity(prompt)
+        result = research_section(request, "fact")
         return {
             "status": "success",
             "answer": result.get("answer", ""),
             "citations": result.get("citations", []),
+            "partial": result.get("partial", False),
             "query": request,
         }
     except Exception as e:
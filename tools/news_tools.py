@@ -1,33 +1,116 @@
 """News verification tool functions."""
 
+from functools import partial
+
 
 def fetch_news_evidence(request: str) -> dict:
     """
     Fetch licensed news articles related to a claim using GNews API.
     
+    The local news archive is consulted first: when it already holds enough
+    recently fetched, relevant articles, GNews is not called; when its
+    coverage is stale, GNews is asked only for articles published since.
+    The search query is built locally from the claim (keyphrases, named
+    entities and places); an explicit date in the claim limits results to
+    articles published around it. A regional-language claim is searched in
+    its own language and, concurrently, in the fallback language using its
+    Latin-script words (names, places). Fetched articles are archived,
+    merged with archived ones by URL, ranked against the claim with BM25,
+    and only the top relevant ones are returned.
+    
     Args:
         request: The news claim or topic to search for
         
     Returns:
         dict with:
             - status: 'success' or 'error'
-            - articles: List of {title, url, source, published_date} dicts
+            - articles: List of {title, url, source, published_date, relevance} dicts
+            - dropped: Number of retrieved articles pruned as irrelevant
+            - max_relevance: Best relevance score (0-1) among retrieved articles
+            - query: The keyword query sent to GNews
+            - source: 'local_archive' (GNews not called) or 'gnews'
+            - archived: Number of relevant articles taken from the local archive
+            - languages: Languages searched ('any' = unrestricted)
+            - published_window: [from, to] when the claim names a date
+            - language_errors: Per-language errors when only some searches failed
             - error: Error message if status='error'
     """
-    from ..services.gnews_client import search_news
+    from ..config import get_settings
+    from ..services.fanout import run_concurrently
+    from ..services.gnews_client import news_queries, search_news
+    from ..storage.news_archive import ArchiveCoverage, get_news_archive
+    from ..text.query_builder import build_news_query
+    from ..text.ranking import NEWS_FIELDS, rank_evidence
     
+    news_query = build_news_query(request)
+    queries = news_queries(request, news_query.query)
     try:
-        articles = search_news(request)
-        return {
+        if get_settings().news_archive_enabled:
+            archive = get_news_archive()
+            coverage = archive.coverage(
+                request, queries, news_query.from_date, news_query.to_date
+            )
+        else:
+            archive = None
+            coverage = ArchiveCoverage([], False, news_query.from_date)
+        
+        errors = {}
+        articles = []
+        if not coverage.complete:
+            outcomes = run_concurrently({
+                lang: partial(
+                    search_news,
+                    query,
+                    from_date=coverage.from_date,
+                    to_date=news_query.to_date,
+                    lang=lang,
+                )
+                for lang, query in queries.items()
+            })
+            errors = {
+                lang or "any": outcome
+                for lang, outcome in outcomes.items()
+                if isinstance(outcome, Exception)
+            }
+            if len(errors) == len(outcomes) and not coverage.articles:
+                raise next(iter(errors.values()))
+            for lang, outcome in outcomes.items():
+                if not isinstance(outcome, Exception):
+                    articles.extend(outcome)
+                    if archive is not None:
+                        archive.append(outcome, lang)
+                        archive.record_search(
+                            queries[lang], lang, news_query.from_date, news_query.to_date
+                        )
+        
+        merged = []
+        seen = set()
+        for article in articles + coverage.articles:
+            if article["url"] not in seen:
+                seen.add(article["url"])
+                merged.append(article)
+        
+        ranked = rank_evidence(request, merged, NEWS_FIELDS)
+        result = {
             "status": "success",
-            "articles": articles,
-            "query": request,
+            "articles": ranked.items,
+            "dropped": ranked.dropped,
+            "max_relevance": ranked.max_relevance,
+            "query": news_query.query,
+            "source": "local_archive" if coverage.complete else "gnews",
+            "archived": len(coverage.articles),
+            "languages": [lang or "any" for lang in queries],
         }
+        if news_query.from_date:
+            result["published_window"] = [news_query.from_date, news_query.to_date]
+        if errors:
+            result["language_errors"] = {lang: str(e) for lang, e in errors.items()}
+        return result
     except Exception as e:
         return {
             "status": "error",
             "error": str(e),
-            "query": request,
+            "query": news_query.query or request,
         }
 
 
@@ -35,6 +118,9 @@ def research_news_with_perplexity(request: str) -> dict:
     """
     Research news claims using Perplexity AI's web search capabilities.
     
+    Reads the news section of the research call shared by all lanes
+    (see ``services.research``), so an input costs one Perplexity call.
+    
     Args:
         request: The news claim to research
         
@@ -43,26 +129,18 @@ def research_news_with_perplexity(request: str) -> dict:
             - status: 'success' or 'error'
             - answer: Perplexity's researched answer
             - citations: List of source URLs
+            - partial: True when the answer was cut short by the time budget
             - error: Error message if status='error'
     """
-    from ..services.perplexity_client import query_perplexity
-    
-    prompt = f"""Research this news claim and verify its accuracy:
-    
-Claim: {request}
-
-Provide:
-1. Whether the claim is supported by credible news sources
-2. Key facts and evidence
-3. Any contradictory information
-4. Cite all sources"""
+    from ..services.research import research_section
     
     try:
-        result = query_perplexity(prompt)
+        result = research_section(request, "news")
         return {
             "status": "success",
             "answer": result.get("answer", ""),
             "citations": result.get("citations", []),
+            "partial": result.get("partial", False),
             "query": request,
         }
     except Exception as e:
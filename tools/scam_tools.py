@@ -1,26 +1,89 @@
 """Scam detection tool functions."""
 
 import re
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# Local reputation verdicts reported in the same terms as VirusTotal results
+_LOCAL_VERDICT_STATUS = {"block": "malicious", "suspicious": "suspicious", "allow": "clean"}
+
+# Manipulation tactics and the phrases that signal them, in report order
+SCAM_PHRASE_TABLES = (
+    ("Artificial Urgency", (
+        "act now", "limited time", "expires soon", "urgent",
+        "immediate action", "don't wait", "hurry", "right now",
+        "within 24 hours", "before it's too late",
+    )),
+    ("Authority Impersonation", (
+        "irs", "government", "bank", "official notice",
+        "legal action", "warrant", "suspend your account",
+        "verify your identity", "security alert",
+    )),
+    ("Financial Manipulation", (
+        "send money", "wire transfer", "gift card", "bitcoin",
+        "confirm payment", "refund", "tax refund", "prize",
+        "won the lottery", "inheritance", "investment opportunity",
+    )),
+    ("Threatening Language", (
+        "arrest", "jail", "lawsuit", "legal consequences",
+        "suspended", "terminated", "penalty", "fine",
+    )),
+    ("Too Good To Be True", (
+        "guaranteed", "risk-free", "100% profit", "make money fast",
+        "work from home", "easy money", "no experience needed",
+    )),
+)
+
+
+@lru_cache(maxsize=4)
+def _phrase_patterns(tables: tuple) -> tuple:
+    """Compile one whole-word alternation per tactic, longest phrase first."""
+    return tuple(
+        (
+            tactic,
+            re.compile(
+                r"(?<!\w)(?:"
+                + "|".join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True))
+                + r")(?!\w)"
+            ),
+        )
+        for tactic, phrases in tables
+    )
 
 
 def scan_urls_with_virustotal(request: str) -> dict:
     """
     Scan URLs for malicious content using VirusTotal API.
     
+    URLs are extracted with ``text.urls`` (bare domains and defanged links
+    included) and scanned once per canonical form. URLs already known to the
+    local reputation index (blocklist feeds, allowlists, past VirusTotal
+    verdicts) or on a top site's own domain are answered locally; only unknown
+    URLs are sent to VirusTotal. Unknown domains imitating a top site are reported
+    in ``lookalikes``.
+    
     Args:
         request: Text containing URLs to scan
         
     Returns:
         dict with:
             - status: 'success' or 'error'
-            - results: List of {url, malicious_count, total_scanners, analysis_url} dicts
+            - results: List of {url, malicious_count, total_scanners, analysis_url} dicts;
+              local matches have source 'local_reputation' or 'top_sites' (status 'low_risk')
+              and the matched entry
+            - local_matches: Number of URLs answered without VirusTotal
+            - lookalikes: List of {url, domain, imitates, kind} for typosquat-style domains
+            - skipped: Note on URLs left unscanned when the latency budget ran out
             - error: Error message if status='error'
     """
+    from ..deadline import DeadlineExceededError
+    from ..metrics import METRICS
+    from ..reputation import get_reputation_index, get_top_sites
     from ..services.virustotal_client import scan_url
+    from ..text.urls import extract_urls, url_host
     
-    # Extract URLs from request
-    url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-    urls = re.findall(url_pattern, request)
+    # Extract canonical, deduplicated URLs from request
+    urls = extract_urls(request)
     
     if not urls:
         return {
@@ -31,14 +94,69 @@ def scan_urls_with_virustotal(request: str) -> dict:
     
     try:
         results = []
+        unknown = []
+        lookalikes = []
+        index = get_reputation_index()
+        top_sites = get_top_sites()
         for url in urls:
-            scan_result = scan_url(url)
+            hit = index.lookup(url)
+            if hit is not None:
+                METRICS.increment("virustotal_skips", reason="local_reputation")
+                results.append({
+                    "url": url,
+                    "status": _LOCAL_VERDICT_STATUS[hit.verdict],
+                    "source": "local_reputation",
+                    "matched": hit.matched,
+                })
+                continue
+            host = url_host(url)
+            site = top_sites.match(host, urlsplit(url).path)
+            if site is not None:
+                METRICS.increment("virustotal_skips", reason="top_site")
+                results.append({
+                    "url": url,
+                    "status": "low_risk",
+                    "source": "top_sites",
+                    "matched": site.domain,
+                    "rank": site.rank,
+                })
+                continue
+            lookalike = top_sites.lookalike(host)
+            if lookalike is not None:
+                METRICS.increment("lookalike_domains", kind=lookalike.kind)
+                lookalikes.append({
+                    "url": url,
+                    "domain": lookalike.domain,
+                    "imitates": lookalike.target,
+                    "kind": lookalike.kind,
+                })
+            unknown.append(url)
+        local_matches = len(results)
+        
+        for position, url in enumerate(unknown):
+            try:
+                scan_result = scan_url(url)
+            except DeadlineExceededError as e:
+                if not results:
+                    raise
+                # Report what was scanned rather than dropping it
+                return {
+                    "status": "success",
+                    "results": results,
+                    "scanned_count": len(results),
+                    "local_matches": local_matches,
+                    "lookalikes": lookalikes,
+                    "skipped": f"{e} ({len(unknown) - position} URL(s) not scanned)",
+                    "urls_skipped": unknown[position:],
+                }
             results.append(scan_result)
         
         return {
             "status": "success",
             "results": results,
             "scanned_count": len(results),
+            "local_matches": local_matches,
+            "lookalikes": lookalikes,
         }
     except Exception as e:
         return {
@@ -52,6 +170,9 @@ def research_scam_with_perplexity(request: str) -> dict:
     """
     Research potential scams using Perplexity AI's web search.
     
+    Reads the scam section of the research call shared by all lanes
+    (see ``services.research``), so an input costs one Perplexity call.
+    
     Args:
         request: Description of potential scam
         
@@ -60,27 +181,18 @@ def research_scam_with_perplexity(request: str) -> dict:
             - status: 'success' or 'error'
             - answer: Perplexity's research findings
             - citations: List of source URLs
+            - partial: True when the answer was cut short by the time budget
             - error: Error message if status='error'
     """
-    from ..services.perplexity_client import query_perplexity
-    
-    prompt = f"""Analyze this potential scam and search for related reports:
-    
-Content: {request}
-
-Provide:
-1. Is this a known scam pattern?
-2. Similar scam reports or warnings
-3. Legitimate context (if it's NOT a scam)
-4. Red flags or warning signs
-5. Cite all sources (scam databases, consumer protection agencies, news reports)"""
+    from ..services.research import research_section
     
     try:
-        result = query_perplexity(prompt)
+        result = research_section(request, "scam")
         return {
             "status": "success",
             "answer": result.get("answer", ""),
             "citations": result.get("citations", []),
+            "partial": result.get("partial", False),
             "query": request,
         }
     except Exception as e:
@@ -114,55 +226,15 @@ def analyze_scam_sentiment(request: str) -> dict:
         
         text_lower = request.lower()
         
-        # Urgency tactics
-        urgency_phrases = [
-            "act now", "limited time", "expires soon", "urgent",
-            "immediate action", "don't wait", "hurry", "right now",
-            "within 24 hours", "before it's too late",
-        ]
-        urgency_count = sum(1 for phrase in urgency_phrases if phrase in text_lower)
-        if urgency_count > 0:
-            tactics.append("Artificial Urgency")
-            urgency_score = min(1.0, urgency_count * 0.25)
-            red_flags.extend([p for p in urgency_phrases if p in text_lower])
-        
-        # Authority impersonation
-        authority_phrases = [
-            "irs", "government", "bank", "official notice",
-            "legal action", "warrant", "suspend your account",
-            "verify your identity", "security alert",
-        ]
-        if any(phrase in text_lower for phrase in authority_phrases):
-            tactics.append("Authority Impersonation")
-            red_flags.extend([p for p in authority_phrases if p in text_lower])
-        
-        # Financial pressure
-        financial_phrases = [
-            "send money", "wire transfer", "gift card", "bitcoin",
-            "confirm payment", "refund", "tax refund", "prize",
-            "won the lottery", "inheritance", "investment opportunity",
-        ]
-        if any(phrase in text_lower for phrase in financial_phrases):
-            tactics.append("Financial Manipulation")
-            red_flags.extend([p for p in financial_phrases if p in text_lower])
-        
-        # Threatening language
-        threat_phrases = [
-            "arrest", "jail", "lawsuit", "legal consequences",
-            "suspended", "terminated", "penalty", "fine",
-        ]
-        if any(phrase in text_lower for phrase in threat_phrases):
-            tactics.append("Threatening Language")
-            red_flags.extend([p for p in threat_phrases if p in text_lower])
-        
-        # Too good to be true
-        too_good_phrases = [
-            "guaranteed", "risk-free", "100% profit", "make money fast",
-            "work from home", "easy money", "no experience needed",
-        ]
-        if any(phrase in text_lower for phrase in too_good_phrases):
-            tactics.append("Too Good To Be True")
-            red_flags.extend([p for p in too_good_phrases if p in text_lower])
+        # Whole words only: "irs" must not match inside "first"
+        for tactic, pattern in _phrase_patterns(SCAM_PHRASE_TABLES):
+            matched = list(dict.fromkeys(pattern.findall(text_lower)))
+            if not matched:
+                continue
+            tactics.append(tactic)
+            red_flags.extend(matched)
+            if tactic == "Artificial Urgency":
+                urgency_score = min(1.0, len(matched) * 0.25)
         
         return {
             "status": "success",
@@ -180,6 +252,7 @@ def analyze_scam_sentiment(request: str) -> dict:
 
 
 __all__ = [
+    "SCAM_PHRASE_TABLES",
     "scan_urls_with_virustotal",
     "research_scam_with_perplexity",
     "analyze_scam_sentiment",